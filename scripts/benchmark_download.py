@@ -0,0 +1,73 @@
+"""
+Ticker Download Benchmark
+
+Compares the serial download loop with concurrent downloads against a fake
+price source that simulates network latency and occasional failures.
+
+Usage:
+    python -m scripts.benchmark_download --tickers 200 --latency 0.1 --workers 1 8 32
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.technical_analysis import download_stock_data_report
+
+
+class FakePriceSource:
+    """Deterministic OHLCV source with fixed latency and periodic transient errors."""
+
+    def __init__(self, latency: float, failure_every: int = 0):
+        self.latency = latency
+        self.failure_every = failure_every
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, start_date, end_date) -> pd.DataFrame:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.latency)
+        if self.failure_every and call % self.failure_every == 0:
+            raise ConnectionError(f"simulated failure on call {call}")
+
+        dates = pd.bdate_range(start_date, end_date, inclusive='left')
+        close = 100 + np.cumsum(np.random.default_rng(abs(hash(ticker)) % 2**32).normal(size=len(dates)))
+        return pd.DataFrame({'date': dates, 'open': close, 'high': close + 1,
+                             'low': close - 1, 'close': close, 'volume': 1e6})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per request')
+    parser.add_argument('--failure-every', type=int, default=10, help='Fail every n-th request')
+    parser.add_argument('--rate', type=float, default=None, help='Requests per second limit')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    baseline = None
+
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'requests':>9} {'failed':>7}")
+    for n_workers in args.workers:
+        source = FakePriceSource(args.latency, args.failure_every)
+        start = time.perf_counter()
+        _, failures = download_stock_data_report(
+            tickers, '2024-01-01', '2024-12-31', fetcher=source,
+            max_workers=n_workers, requests_per_second=args.rate,
+            max_retries=3, backoff=args.latency
+        )
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = elapsed
+        print(f"{n_workers:>8} {elapsed:>9.2f} {baseline / elapsed:>8.2f} {source.calls:>9} {len(failures):>7}")
+
+
+if __name__ == '__main__':
+    main()
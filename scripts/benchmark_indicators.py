@@ -0,0 +1,67 @@
+"""
+Indicator Panel Benchmark
+
+Times `calculate_technical_indicators_panel` on a synthetic OHLCV panel for
+an increasing number of worker processes, against the per-ticker loop over
+`calculate_technical_indicators` used in the notebooks.
+
+Usage:
+    python -m scripts.benchmark_indicators --tickers 500 --days 2520 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.technical_analysis import calculate_technical_indicators, calculate_technical_indicators_panel
+
+
+def make_ohlcv_panel(n_tickers: int, n_days: int, seed: int = 0) -> dict:
+    """Build a dictionary of random-walk OHLCV frames."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2010-01-01', periods=n_days)
+    panel = {}
+    for i in range(n_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_days)))
+        spread = np.abs(rng.normal(0, 0.005, n_days)) * close
+        panel[f"T{i:04d}"] = pd.DataFrame({
+            'date': dates,
+            'open': close + rng.normal(0, 0.2, n_days),
+            'high': close + spread,
+            'low': close - spread,
+            'close': close,
+            'volume': rng.integers(100000, 1000000, n_days).astype(float),
+        })
+    return panel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--days', type=int, default=1260)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    panel = make_ohlcv_panel(args.tickers, args.days)
+    n_rows = args.tickers * args.days
+
+    start = time.perf_counter()
+    for frame in panel.values():
+        calculate_technical_indicators(frame.set_index('date'))
+    loop_seconds = time.perf_counter() - start
+    print(f"{'loop':>8} {loop_seconds:>9.2f}s {n_rows / loop_seconds:>14,.0f} rows/s")
+
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        calculate_technical_indicators_panel(panel, n_workers=n_workers)
+        elapsed = time.perf_counter() - start
+        print(f"{n_workers:>8} {elapsed:>9.2f}s {n_rows / elapsed:>14,.0f} rows/s "
+              f"{loop_seconds / elapsed:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
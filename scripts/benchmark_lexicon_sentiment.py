@@ -0,0 +1,118 @@
+"""
+Lexicon Backend Parity Report and Benchmark
+
+Scores a corpus with both sentiment backends ('textblob' and 'lexicon'),
+reports how far the lexicon scores differ from TextBlob and the throughput
+of each backend in rows per second. Without --csv, the corpus is synthetic
+headlines that mix sentiment words, negations, intensifiers, punctuation,
+contractions and emoticons, so that every scoring rule is exercised.
+
+Usage:
+    python -m scripts.benchmark_lexicon_sentiment --rows 50000
+    python -m scripts.benchmark_lexicon_sentiment --csv data/raw_analyst_ratings.csv --rows 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.sentiment_analysis import apply_sentiment_analysis
+
+
+# Building blocks for headlines that exercise every sentiment scoring rule
+SENTIMENT_WORDS = [
+    'good', 'great', 'bad', 'poor', 'strong', 'weak', 'best', 'worst', 'higher', 'lower', 'new',
+    'positive', 'negative', 'surprising', 'disappointing', 'excellent', 'terrible', 'big', 'small',
+    'happy', 'sad', 'down', 'more', 'most', 'less', 'amazing', 'awful',
+]
+MODIFIERS = ['very', 'really', 'extremely', 'slightly', 'quite', 'highly', 'so', 'too', 'pretty']
+NEGATIONS = ['not', 'no', 'never', "isn't", "don't", "can't", "won't"]
+FILLERS = [
+    'a', 'an', 'the', 'I', 'is', 'at', 'of', 'it', 'quarter', 'shares', 'stock', 'earnings',
+    'Apple', 'U.S.', 'Inc.', 'e-mail', '52-week', '5%', '$10', "it's", "we'll", 'Q1',
+]
+PUNCTUATION = [',', '.', '!', '!!', '?', '...', ':', ';', '-', '--', '(!)', '"', "'", '(', ')']
+EMOTICONS = [':D', ':d', ':)', ':-)', ':(', ';)', ':P', '<3', 'XD', ':/']
+
+
+def make_varied_headlines(n_rows: int, seed: int = 0) -> np.ndarray:
+    """
+    Headlines mixing sentiment words, negations, intensifiers, punctuation,
+    contractions, abbreviations and emoticons in random order and case.
+
+    Returns:
+    --------
+    np.ndarray
+        Object array of `n_rows` headlines
+    """
+    rng = np.random.default_rng(seed)
+    groups = [SENTIMENT_WORDS, MODIFIERS, NEGATIONS, FILLERS, PUNCTUATION, EMOTICONS]
+    weights = np.array([0.3, 0.15, 0.12, 0.25, 0.12, 0.06])
+
+    headlines = []
+    for length in rng.integers(1, 14, n_rows):
+        words = []
+        for group in rng.choice(len(groups), size=length, p=weights):
+            word = groups[group][rng.integers(len(groups[group]))]
+            if group != 5 and rng.random() < 0.1:
+                word = word.capitalize() if rng.random() < 0.5 else word.upper()
+            # Punctuation is often attached to the previous word
+            if group == 4 and words and rng.random() < 0.5:
+                words[-1] += word
+            else:
+                words.append(word)
+        separator = '\n\n' if rng.random() < 0.02 else ' '
+        headlines.append(separator.join(words))
+    return np.array(headlines, dtype=object)
+
+
+def load_sample(csv_path, n_rows: int, text_col: str = 'headline') -> pd.DataFrame:
+    """Load a headline sample from a news CSV, or build a varied synthetic one."""
+    if csv_path is None:
+        return pd.DataFrame({text_col: make_varied_headlines(n_rows)})
+    return pd.read_csv(csv_path, usecols=[text_col], nrows=n_rows)
+
+
+def parity_report(df: pd.DataFrame, text_col: str = 'headline') -> dict:
+    """Score `df` with both backends and summarise the differences."""
+    timings = {}
+    results = {}
+    for backend in ('textblob', 'lexicon'):
+        start = time.perf_counter()
+        results[backend] = apply_sentiment_analysis(df, text_col=text_col, backend=backend)
+        timings[backend] = time.perf_counter() - start
+
+    reference, candidate = results['textblob'], results['lexicon']
+    polarity_error = (candidate['sentiment_polarity'] - reference['sentiment_polarity']).abs()
+    subjectivity_error = (candidate['sentiment_subjectivity'] - reference['sentiment_subjectivity']).abs()
+
+    return {
+        'rows': len(df),
+        'polarity_mae': polarity_error.mean(),
+        'polarity_p99_abs_error': polarity_error.quantile(0.99),
+        'polarity_max_abs_error': polarity_error.max(),
+        'polarity_exact_share': (polarity_error < 1e-9).mean(),
+        'polarity_correlation': np.corrcoef(candidate['sentiment_polarity'],
+                                            reference['sentiment_polarity'])[0, 1],
+        'subjectivity_mae': subjectivity_error.mean(),
+        'label_agreement': (candidate['sentiment_label'] == reference['sentiment_label']).mean(),
+        'textblob_rows_per_sec': len(df) / timings['textblob'],
+        'lexicon_rows_per_sec': len(df) / timings['lexicon'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--csv', default=None, help='News CSV with a headline column')
+    args = parser.parse_args()
+
+    report = parity_report(load_sample(args.csv, args.rows))
+    for name, value in report.items():
+        print(f"{name:>24}: {value:,.4f}" if isinstance(value, float) else f"{name:>24}: {value:,}")
+
+
+if __name__ == '__main__':
+    main()
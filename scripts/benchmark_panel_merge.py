@@ -0,0 +1,79 @@
+"""
+Panel Merge Benchmark
+
+Compares aligning daily sentiment with returns through a hash `pd.merge`
+followed by a sort (the previous `merge_sentiment_returns`) with the
+sorted-key `StockDatePanel` merge-join, on a synthetic multi-million-row
+(stock x day) panel.
+
+Usage:
+    python -m scripts.benchmark_panel_merge --stocks 2000 --days 2500
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.panel import StockDatePanel
+
+
+def make_panels(n_stocks: int, n_days: int, seed: int = 0):
+    """Sentiment on a random 40% of (stock, day) cells and returns on 90% of them."""
+    rng = np.random.default_rng(seed)
+    stocks = np.array([f"S{i:05d}" for i in range(n_stocks)], dtype=object)
+    dates = pd.bdate_range('2010-01-01', periods=n_days)
+    stock_col, date_col = np.repeat(stocks, n_days), np.tile(dates, n_stocks)
+
+    keep = rng.random(len(stock_col)) < 0.4
+    sentiment = pd.DataFrame({'stock': stock_col[keep], 'date': date_col[keep],
+                              'avg_sentiment': rng.normal(0, 0.2, keep.sum())}).sample(frac=1, random_state=seed)
+    keep = rng.random(len(stock_col)) < 0.9
+    returns = pd.DataFrame({'stock': stock_col[keep], 'date': date_col[keep],
+                            'daily_return': rng.normal(0, 1.5, keep.sum())}).sample(frac=1, random_state=seed + 1)
+    return sentiment, returns
+
+
+def hash_merge(sentiment: pd.DataFrame, returns: pd.DataFrame) -> pd.DataFrame:
+    sentiment = sentiment.copy()
+    returns = returns.copy()
+    sentiment['date'] = pd.to_datetime(sentiment['date'])
+    returns['date'] = pd.to_datetime(returns['date'])
+    merged = pd.merge(sentiment, returns, on=['stock', 'date'], how='inner')
+    return merged.sort_values(['stock', 'date'])
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stocks', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=2500)
+    args = parser.parse_args()
+
+    sentiment, returns = make_panels(args.stocks, args.days)
+    n_rows = len(sentiment) + len(returns)
+    print(f"sentiment rows: {len(sentiment):,}  returns rows: {len(returns):,}")
+
+    expected, hash_seconds = timed(hash_merge, sentiment, returns)
+
+    sentiment_panel, build_seconds = timed(StockDatePanel, sentiment)
+    returns_panel, seconds = timed(lambda df: StockDatePanel(df, stocks=sentiment_panel.stocks), returns)
+    build_seconds += seconds
+    merged, join_seconds = timed(sentiment_panel.join, returns_panel)
+    assert len(merged) == len(expected)
+
+    print(f"{'method':<28} {'seconds':>10} {'input rows/s':>14}")
+    print(f"{'pd.merge + sort':<28} {hash_seconds:>10.2f} {n_rows / hash_seconds:>14,.0f}")
+    print(f"{'panel build + join':<28} {build_seconds + join_seconds:>10.2f} "
+          f"{n_rows / (build_seconds + join_seconds):>14,.0f}")
+    print(f"{'panel join (prebuilt)':<28} {join_seconds:>10.2f} {n_rows / join_seconds:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Text Preprocessing Benchmark
+
+Compares the row-by-row `eda_utils.preprocess_text` (called with its
+defaults, as the notebooks do) with the batch `preprocess_texts` engine.
+The row-wise function is timed on a smaller sample and both outputs are
+checked for identical tokens on that sample.
+
+Usage:
+    python -m scripts.benchmark_preprocessing --rows 1000000 --baseline-rows 20000 --workers 1 4
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from scripts.benchmark_sentiment import make_headlines
+from src.eda_utils import preprocess_text
+from src.text_preprocessing import TextPreprocessor, preprocess_texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--baseline-rows', type=int, default=20000)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument('--csv', default=None, help='News CSV to sample headlines from')
+    args = parser.parse_args()
+
+    if args.csv is None:
+        headlines = list(make_headlines(args.rows))
+    else:
+        headlines = pd.read_csv(args.csv, usecols=['headline'], nrows=args.rows)['headline'].tolist()
+    sample = headlines[:args.baseline_rows]
+
+    start = time.perf_counter()
+    expected = pd.Series(sample).apply(preprocess_text).tolist()
+    baseline_rate = len(sample) / (time.perf_counter() - start)
+
+    preprocessor = TextPreprocessor()
+    mismatches = sum(a != b for a, b in zip(expected, preprocess_texts(sample, preprocessor=preprocessor)))
+
+    print(f"preprocess_text: {baseline_rate:,.0f} rows/s on {len(sample):,} rows")
+    print(f"token mismatches on that sample: {mismatches}")
+    print()
+    print(f"{'workers':>8} {'seconds':>10} {'rows/s':>12} {'speedup':>8}")
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        preprocess_texts(headlines, n_workers=n_workers, chunk_size=args.chunk_size,
+                         preprocessor=TextPreprocessor())
+        elapsed = time.perf_counter() - start
+        rate = len(headlines) / elapsed
+        print(f"{n_workers:>8} {elapsed:>10.2f} {rate:>12,.0f} {rate / baseline_rate:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
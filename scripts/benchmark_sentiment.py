@@ -0,0 +1,63 @@
+"""
+Sentiment Scoring Benchmark
+
+Measures headline scoring throughput of `score_sentiment_batch` for an
+increasing number of worker processes.
+
+Usage:
+    python -m scripts.benchmark_sentiment --rows 200000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.sentiment_analysis import score_sentiment_batch
+
+
+SAMPLE_HEADLINES = [
+    "Apple shares surge after strong quarterly earnings beat expectations",
+    "Tesla stock falls on weak delivery numbers",
+    "Analyst upgrades Microsoft to buy with higher price target",
+    "FDA approval sends biotech shares sharply higher",
+    "Company reports disappointing revenue and cuts guidance",
+    "Stocks that hit 52-week lows on Friday",
+    "Merger talks boost shares of regional bank",
+    "Oil prices steady ahead of OPEC meeting",
+]
+
+
+def make_headlines(n_rows: int, seed: int = 0) -> np.ndarray:
+    """Build a synthetic headline column by sampling the sample headlines."""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(SAMPLE_HEADLINES), size=n_rows)
+    suffix = rng.integers(0, 1000, size=n_rows)
+    return np.array([f"{SAMPLE_HEADLINES[i]} {s}" for i, s in zip(idx, suffix)], dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    headlines = make_headlines(args.rows)
+    baseline = None
+
+    print(f"{'workers':>8} {'seconds':>10} {'rows/s':>12} {'speedup':>8}")
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        score_sentiment_batch(headlines, n_workers=n_workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = elapsed
+        print(f"{n_workers:>8} {elapsed:>10.2f} {args.rows / elapsed:>12,.0f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+News Frame Memory Report
+
+Loads a news CSV the default way (object dtypes plus `prepare_date_features`
+and a publisher domain column, as in the EDA notebook) and with
+`load_news_data`, then prints the per-column memory of both.
+
+Usage:
+    python -m scripts.news_memory_report data/raw_analyst_ratings.csv --arrow-strings
+"""
+
+import argparse
+
+import pandas as pd
+
+from src.eda_utils import extract_domain, load_news_data, memory_report, prepare_date_features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv', help='News CSV file')
+    parser.add_argument('--arrow-strings', action='store_true',
+                        help='Store headline and url as Arrow-backed strings')
+    parser.add_argument('--rows', type=int, default=None, help='Only read the first N rows')
+    args = parser.parse_args()
+
+    before = pd.read_csv(args.csv, low_memory=False, nrows=args.rows)
+    before = prepare_date_features(before)
+    if 'publisher' in before.columns:
+        before['publisher_domain'] = before['publisher'].apply(extract_domain)
+
+    after = load_news_data(args.csv, arrow_strings=args.arrow_strings, nrows=args.rows)
+
+    with pd.option_context('display.width', 120, 'display.max_columns', None):
+        print(memory_report(before, after).round(3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Daily Sentiment Pipeline
+
+Streams a raw news CSV in chunks, scores the headlines and writes the
+per-(stock, date) daily sentiment aggregates to a CSV file.
+
+Usage:
+    python -m scripts.run_daily_sentiment data/raw_analyst_ratings.csv daily_sentiment.csv
+"""
+
+import argparse
+
+from src.sentiment_analysis import stream_daily_sentiment
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('news_file')
+    parser.add_argument('output_file')
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--backend', choices=['textblob', 'lexicon'], default='textblob')
+    args = parser.parse_args()
+
+    daily_sentiment = stream_daily_sentiment(
+        args.news_file,
+        chunksize=args.chunksize,
+        n_workers=args.workers,
+        backend=args.backend,
+    )
+    daily_sentiment.to_csv(args.output_file, index=False)
+    print(f"Wrote {len(daily_sentiment):,} (stock, date) rows to {args.output_file}")
+
+
+if __name__ == '__main__':
+    main()
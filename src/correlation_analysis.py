@@ -7,10 +7,15 @@ news sentiment and stock returns.
 
 import pandas as pd
 import numpy as np
+from scipy import stats
 from scipy.stats import pearsonr, spearmanr
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
+from .instrumentation import instrument
+from .panel import StockDatePanel
 
+
+@instrument
 def calculate_daily_returns(df: pd.DataFrame, 
                            price_col: str = 'close',
                            date_col: str = 'date') -> pd.DataFrame:
@@ -43,12 +48,19 @@ def calculate_daily_returns(df: pd.DataFrame,
     return df
 
 
+@instrument
 def merge_sentiment_returns(sentiment_df: pd.DataFrame,
                             returns_df: pd.DataFrame,
                             stock_col: str = 'stock',
                             date_col: str = 'date') -> pd.DataFrame:
     """
-    Merge sentiment and returns data by stock and date.
+    Merge sentiment and returns data by stock and calendar day.
+    
+    Dates are matched by calendar day, not by exact timestamp: a sentiment
+    row stamped 13:00 joins the returns of that day. Use `effective_dates`
+    first to move news published after the close to the next day. The date
+    column of the result holds the day (at midnight) and the rows are sorted
+    by (stock, date) with a new RangeIndex.
     
     Parameters:
     -----------
@@ -66,22 +78,12 @@ def merge_sentiment_returns(sentiment_df: pd.DataFrame,
     pd.DataFrame
         Merged DataFrame with sentiment and returns
     """
-    # Ensure dates are datetime
-    sentiment_df = sentiment_df.copy()
-    returns_df = returns_df.copy()
-    
-    sentiment_df[date_col] = pd.to_datetime(sentiment_df[date_col])
-    returns_df[date_col] = pd.to_datetime(returns_df[date_col])
-    
-    # Merge
-    merged = pd.merge(
-        sentiment_df,
-        returns_df,
-        on=[stock_col, date_col],
-        how='inner'
-    )
+    # Sort each side once by integer (stock, day) keys and merge-join them
+    sentiment_panel = StockDatePanel(sentiment_df, stock_col=stock_col, date_col=date_col)
+    returns_panel = StockDatePanel(returns_df, stock_col=stock_col, date_col=date_col,
+                                   stocks=sentiment_panel.stocks)
     
-    return merged.sort_values([stock_col, date_col])
+    return sentiment_panel.join(returns_panel)
 
 
 def calculate_correlation(sentiment: pd.Series,
@@ -123,11 +125,167 @@ def calculate_correlation(sentiment: pd.Series,
     return corr, p_val
 
 
+def _segment_ranks(codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Average (tie-aware) ranks of `values` within each group of `codes`."""
+    n = len(values)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+    
+    order = np.lexsort((values, codes))
+    sorted_codes = codes[order]
+    sorted_values = values[order]
+    
+    # Runs of equal values inside a group share their average position
+    group_break = np.ones(n, dtype=bool)
+    group_break[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    run_break = group_break.copy()
+    run_break[1:] |= sorted_values[1:] != sorted_values[:-1]
+    
+    run_starts = np.flatnonzero(run_break)
+    run_ends = np.append(run_starts[1:], n) - 1
+    run_ids = np.cumsum(run_break) - 1
+    group_starts = np.flatnonzero(group_break)[np.cumsum(group_break) - 1]
+    
+    ranks = np.empty(n, dtype=np.float64)
+    ranks[order] = (run_starts + run_ends)[run_ids] / 2.0 - group_starts + 1.0
+    return ranks
+
+
+def _grouped_pearson(codes: np.ndarray,
+                     x: np.ndarray,
+                     y: np.ndarray,
+                     n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson correlation of x and y within each group, using segment sums.
+    
+    Returns (r, n) arrays of length `n_groups`; r is NaN for groups with
+    fewer than 2 points or a constant input, like `scipy.stats.pearsonr`.
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    safe_counts = np.maximum(counts, 1)
+    mean_x = np.bincount(codes, weights=x, minlength=n_groups) / safe_counts
+    mean_y = np.bincount(codes, weights=y, minlength=n_groups) / safe_counts
+    
+    dx = x - mean_x[codes]
+    dy = y - mean_y[codes]
+    sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+    syy = np.bincount(codes, weights=dy * dy, minlength=n_groups)
+    sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+    
+    # Exactly constant inputs are undefined (checked on the raw values, as
+    # the mean of identical floats may not reproduce them exactly)
+    max_x = np.full(n_groups, -np.inf)
+    min_x = np.full(n_groups, np.inf)
+    max_y = np.full(n_groups, -np.inf)
+    min_y = np.full(n_groups, np.inf)
+    np.maximum.at(max_x, codes, x)
+    np.minimum.at(min_x, codes, x)
+    np.maximum.at(max_y, codes, y)
+    np.minimum.at(min_y, codes, y)
+    constant = (max_x == min_x) | (max_y == min_y)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+    r[constant | (counts < 2)] = np.nan
+    
+    # pearsonr returns exactly +/-1 for two points
+    r = np.where(counts == 2, np.round(r), r)
+    
+    return r, counts
+
+
+def _pearson_p_values(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-values of Pearson coefficients (exact beta distribution)."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ab = n / 2.0 - 1.0
+        p = 2.0 * stats.beta.cdf(-np.abs(r), ab, ab, loc=-1, scale=2)
+    p = np.where(n == 2, 1.0, np.minimum(p, 1.0))
+    return np.where(np.isnan(r), np.nan, p)
+
+
+def _spearman_p_values(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-values of Spearman coefficients (t approximation)."""
+    dof = n - 2.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = r * np.sqrt((dof / ((r + 1.0) * (1.0 - r))).clip(0))
+        p = 2.0 * stats.t.sf(np.abs(t), dof)
+    return np.where(np.isnan(r), np.nan, p)
+
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """
+    Benjamini-Hochberg adjusted p-values (q-values) controlling the false discovery rate.
+    
+    Parameters:
+    -----------
+    p_values : np.ndarray
+        Raw p-values; NaN entries are ignored and stay NaN
+    
+    Returns:
+    --------
+    np.ndarray
+        q-values; a test is significant at FDR level alpha when q < alpha
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    q_values = np.full(p_values.shape, np.nan)
+    tested = np.flatnonzero(~np.isnan(p_values))
+    if len(tested) == 0:
+        return q_values
+    
+    order = tested[np.argsort(p_values[tested], kind='stable')]
+    ranked = p_values[order] * len(order) / np.arange(1, len(order) + 1)
+    q_values[order] = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    return q_values
+
+
+def grouped_correlation(codes: np.ndarray,
+                        x: np.ndarray,
+                        y: np.ndarray,
+                        n_groups: int) -> Dict[str, np.ndarray]:
+    """
+    Pearson and Spearman correlations for many groups in one pass.
+    
+    Rows with a NaN in x or y are ignored, as in `calculate_correlation`.
+    
+    Parameters:
+    -----------
+    codes : np.ndarray
+        Integer group code (0..n_groups-1) of each row
+    x, y : np.ndarray
+        Values to correlate
+    n_groups : int
+        Number of groups
+    
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        'pearson', 'pearson_p', 'spearman', 'spearman_p' and 'n' (number of
+        non-NaN pairs) arrays, indexed by group code
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    codes, x, y = np.asarray(codes)[valid], x[valid], y[valid]
+    
+    pearson, n = _grouped_pearson(codes, x, y, n_groups)
+    spearman, _ = _grouped_pearson(codes, _segment_ranks(codes, x), _segment_ranks(codes, y), n_groups)
+    
+    return {
+        'pearson': pearson,
+        'pearson_p': _pearson_p_values(pearson, n),
+        'spearman': spearman,
+        'spearman_p': _spearman_p_values(spearman, n),
+        'n': n,
+    }
+
+
+@instrument
 def analyze_correlation_by_stock(df: pd.DataFrame,
                                   stock_col: str = 'stock',
                                   sentiment_col: str = 'avg_sentiment',
                                   returns_col: str = 'daily_return',
-                                  min_data_points: int = 10) -> pd.DataFrame:
+                                  min_data_points: int = 10,
+                                  correction: Optional[str] = None) -> pd.DataFrame:
     """
     Calculate correlation for each stock separately.
     
@@ -143,54 +301,116 @@ def analyze_correlation_by_stock(df: pd.DataFrame,
         Name of returns column
     min_data_points : int
         Minimum data points required for correlation calculation
+    correction : str, optional
+        'fdr_bh' to add a 'Pearson_Q_Value' column (Benjamini-Hochberg over
+        all tested stocks) and base 'Significant' on it instead of the raw
+        Pearson p-value
     
     Returns:
     --------
     pd.DataFrame
         DataFrame with correlation results per stock
     """
-    correlations = []
+    if correction not in (None, 'fdr_bh'):
+        raise ValueError(f"correction must be None or 'fdr_bh', got {correction}")
     
-    for stock in df[stock_col].unique():
-        stock_data = df[df[stock_col] == stock]
-        
-        if len(stock_data) >= min_data_points:
-            corr_pearson, p_pearson = calculate_correlation(
-                stock_data[sentiment_col],
-                stock_data[returns_col],
-                method='pearson'
-            )
-            
-            corr_spearman, p_spearman = calculate_correlation(
-                stock_data[sentiment_col],
-                stock_data[returns_col],
-                method='spearman'
-            )
-            
-            correlations.append({
-                'Stock': stock,
-                'Pearson_Correlation': corr_pearson,
-                'Pearson_P_Value': p_pearson,
-                'Spearman_Correlation': corr_spearman,
-                'Spearman_P_Value': p_spearman,
-                'Data_Points': len(stock_data),
-                'Significant': 'Yes' if p_pearson < 0.05 else 'No'
-            })
-    
-    if correlations:
-        return pd.DataFrame(correlations).sort_values('Pearson_Correlation', ascending=False)
-    else:
+    codes, stocks = pd.factorize(df[stock_col])
+    sizes = np.bincount(codes[codes >= 0], minlength=len(stocks))
+    eligible = sizes >= min_data_points
+    
+    if not eligible.any():
         return pd.DataFrame()
+    
+    # Single pass over all stocks; rows of stocks below min_data_points are dropped up front
+    keep = codes >= 0
+    keep[keep] = eligible[codes[keep]]
+    result = grouped_correlation(
+        codes[keep],
+        df[sentiment_col].to_numpy(dtype=np.float64)[keep],
+        df[returns_col].to_numpy(dtype=np.float64)[keep],
+        len(stocks)
+    )
+    
+    correlations = pd.DataFrame({
+        'Stock': stocks[eligible],
+        'Pearson_Correlation': result['pearson'][eligible],
+        'Pearson_P_Value': result['pearson_p'][eligible],
+        'Spearman_Correlation': result['spearman'][eligible],
+        'Spearman_P_Value': result['spearman_p'][eligible],
+        'Data_Points': sizes[eligible],
+        'Significant': np.where(result['pearson_p'][eligible] < 0.05, 'Yes', 'No'),
+    })
+    if correction == 'fdr_bh':
+        q_values = benjamini_hochberg(correlations['Pearson_P_Value'].to_numpy())
+        correlations.insert(6, 'Pearson_Q_Value', q_values)
+        correlations['Significant'] = np.where(q_values < 0.05, 'Yes', 'No')
+    
+    return correlations.sort_values('Pearson_Correlation', ascending=False)
 
 
+def _lagged_pairs(df: pd.DataFrame,
+                  codes: np.ndarray,
+                  sentiment_col: str,
+                  returns_col: str,
+                  date_col: str,
+                  lags: Iterable[int]) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Yield (lag, codes, sentiment, lagged returns) for every lag.
+    
+    The panel is sorted once by stock code and date; for each lag the returns
+    are shifted by index arithmetic within each stock's contiguous block.
+    Only rows with a sentiment and a lagged return are yielded; rows without
+    a stock (code -1) keep their own return at lag 0.
+    """
+    date_codes = pd.factorize(df[date_col], sort=True)[0]
+    order = np.lexsort((date_codes, codes))
+    
+    codes = codes[order]
+    sentiment = df[sentiment_col].to_numpy(dtype=np.float64)[order]
+    returns = df[returns_col].to_numpy(dtype=np.float64)[order]
+    n_rows = len(order)
+    
+    # Bounds of each row's stock block in the sorted panel
+    in_stock = codes >= 0
+    block_break = np.ones(n_rows, dtype=bool)
+    block_break[1:] = codes[1:] != codes[:-1]
+    block_starts = np.flatnonzero(block_break)
+    block_ids = np.cumsum(block_break) - 1
+    row_start = block_starts[block_ids] if n_rows else block_starts
+    row_end = np.append(block_starts[1:], n_rows)[block_ids] if n_rows else block_starts
+    positions = np.arange(n_rows)
+    has_sentiment = ~np.isnan(sentiment)
+    
+    for lag in lags:
+        if lag != 0:
+            # Shift returns by lag days within each stock
+            target = positions + lag
+            shifted = in_stock & (target >= row_start) & (target < row_end)
+            returns_lag = np.full(n_rows, np.nan)
+            returns_lag[shifted] = returns[target[shifted]]
+        else:
+            # Lag 0 (no shift)
+            returns_lag = returns
+        
+        valid = has_sentiment & ~np.isnan(returns_lag)
+        yield lag, codes[valid], sentiment[valid], returns_lag[valid]
+
+
+@instrument
 def analyze_lag_correlation(df: pd.DataFrame,
                             stock_col: str = 'stock',
                             sentiment_col: str = 'avg_sentiment',
                             returns_col: str = 'daily_return',
-                            lags: range = range(-2, 3)) -> pd.DataFrame:
+                            lags: range = range(-2, 3),
+                            date_col: str = 'date',
+                            by_stock: bool = False) -> pd.DataFrame:
     """
     Analyze correlation at different time lags.
     
+    The panel is sorted once by stock and date; for each lag the returns are
+    shifted by index arithmetic within each stock's contiguous block, so no
+    per-lag DataFrame copies are made.
+    
     Parameters:
     -----------
     df : pd.DataFrame
@@ -203,53 +423,43 @@ def analyze_lag_correlation(df: pd.DataFrame,
         Name of returns column
     lags : range
         Range of lags to test
+    date_col : str
+        Name of date column
+    by_stock : bool
+        If True, return one row per (stock, lag) instead of pooled results
     
     Returns:
     --------
     pd.DataFrame
         DataFrame with correlation results at different lags
     """
+    codes, stocks = pd.factorize(df[stock_col])
     lag_correlations = []
     
-    for lag in lags:
-        lag_data = df.copy()
-        lag_data = lag_data.sort_values([stock_col, 'date'])
-        
-        if lag != 0:
-            # Shift returns by lag days
-            lag_data['returns_lag'] = lag_data.groupby(stock_col)[returns_col].shift(-lag)
-            lag_data_clean = lag_data.dropna(subset=[sentiment_col, 'returns_lag'])
-            
-            if len(lag_data_clean) > 10:
-                corr, p_val = calculate_correlation(
-                    lag_data_clean[sentiment_col],
-                    lag_data_clean['returns_lag'],
-                    method='pearson'
-                )
-                lag_correlations.append({
-                    'Lag': lag,
-                    'Correlation': corr,
-                    'P_Value': p_val,
-                    'Data_Points': len(lag_data_clean)
-                })
-        else:
-            # Lag 0 (no shift)
-            lag_data_clean = lag_data.dropna(subset=[sentiment_col, returns_col])
-            if len(lag_data_clean) > 10:
-                corr, p_val = calculate_correlation(
-                    lag_data_clean[sentiment_col],
-                    lag_data_clean[returns_col],
-                    method='pearson'
-                )
-                lag_correlations.append({
-                    'Lag': lag,
-                    'Correlation': corr,
-                    'P_Value': p_val,
-                    'Data_Points': len(lag_data_clean)
-                })
+    for lag, lag_codes, sentiment, returns_lag in _lagged_pairs(df, codes, sentiment_col, returns_col,
+                                                                 date_col, lags):
+        if by_stock:
+            known = lag_codes >= 0
+            result = grouped_correlation(lag_codes[known], sentiment[known], returns_lag[known], len(stocks))
+            enough = result['n'] > 10
+            lag_correlations.append(pd.DataFrame({
+                'Stock': stocks[enough],
+                'Lag': lag,
+                'Correlation': result['pearson'][enough],
+                'P_Value': result['pearson_p'][enough],
+                'Data_Points': result['n'][enough],
+            }))
+        elif len(sentiment) > 10:
+            corr, count = _grouped_pearson(np.zeros(len(sentiment), dtype=np.int64), sentiment, returns_lag, 1)
+            lag_correlations.append(pd.DataFrame({
+                'Lag': [lag],
+                'Correlation': corr,
+                'P_Value': _pearson_p_values(corr, count),
+                'Data_Points': count,
+            }))
     
     if lag_correlations:
-        return pd.DataFrame(lag_correlations).sort_values('Lag')
+        sort_cols = ['Stock', 'Lag'] if by_stock else 'Lag'
+        return pd.concat(lag_correlations, ignore_index=True).sort_values(sort_cols)
     else:
         return pd.DataFrame()
-
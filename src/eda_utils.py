@@ -15,6 +15,8 @@ from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 
+from .term_index import TermDocumentIndex
+
 
 def download_nltk_data():
     """Download required NLTK data if not already present"""
@@ -142,7 +144,7 @@ def get_financial_keywords():
     ]
 
 
-def analyze_keyword_frequency(df, tokens_col='processed_tokens', keywords=None):
+def analyze_keyword_frequency(df, tokens_col='processed_tokens', keywords=None, index=None):
     """
     Analyze frequency of financial keywords in processed tokens.
     
@@ -154,6 +156,8 @@ def analyze_keyword_frequency(df, tokens_col='processed_tokens', keywords=None):
         Name of the column containing processed tokens
     keywords : list, optional
         List of keywords to search for. If None, uses default financial keywords.
+    index : TermDocumentIndex, optional
+        Prebuilt index of `df[tokens_col]`, reused across calls. If None, one is built.
     
     Returns:
     --------
@@ -163,16 +167,10 @@ def analyze_keyword_frequency(df, tokens_col='processed_tokens', keywords=None):
     if keywords is None:
         keywords = get_financial_keywords()
     
-    keyword_counts = {}
-    for keyword in keywords:
-        count = sum(1 for tokens in df[tokens_col] if keyword in tokens)
-        keyword_counts[keyword] = count
-    
-    keyword_df = pd.DataFrame(list(keyword_counts.items()), 
-                            columns=['Keyword', 'Frequency'])
-    keyword_df = keyword_df.sort_values('Frequency', ascending=False)
+    if index is None:
+        index = TermDocumentIndex.from_tokens(df[tokens_col])
     
-    return keyword_df
+    return index.keyword_frequency(keywords)
 
 
 def detect_publication_spikes(daily_counts, z_threshold=2):
@@ -205,7 +203,17 @@ def detect_publication_spikes(daily_counts, z_threshold=2):
     return spike_days
 
 
-def prepare_date_features(df, date_col='date'):
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _small_int(values, dtype):
+    """Cast date components to a small integer dtype (nullable if any are missing)."""
+    if values.isna().any():
+        return values.astype(dtype.capitalize())
+    return values.astype(dtype)
+
+
+def prepare_date_features(df, date_col='date', compact=False):
     """
     Extract date-related features from datetime column.
     
@@ -215,6 +223,9 @@ def prepare_date_features(df, date_col='date'):
         DataFrame with date column
     date_col : str
         Name of the date column
+    compact : bool
+        If True, store year as int16, month/day/hour as int8 and day_of_week
+        as an ordered categorical instead of int64 and string columns
     
     Returns:
     --------
@@ -226,6 +237,18 @@ def prepare_date_features(df, date_col='date'):
     if date_col in df.columns:
         df[date_col] = pd.to_datetime(df[date_col], errors='coerce', utc=True)
         
+        if compact:
+            dates = df[date_col].dt
+            df['year'] = _small_int(dates.year, 'int16')
+            df['month'] = _small_int(dates.month, 'int8')
+            df['day'] = _small_int(dates.day, 'int8')
+            weekday = dates.dayofweek.fillna(-1).to_numpy(dtype=np.int8)
+            df['day_of_week'] = pd.Categorical.from_codes(
+                weekday, dtype=pd.CategoricalDtype(DAY_NAMES, ordered=True)
+            )
+            df['hour'] = _small_int(dates.hour, 'int8')
+            return df
+        
         # Extract date components
         df['year'] = df[date_col].dt.year
         df['month'] = df[date_col].dt.month
@@ -235,3 +258,124 @@ def prepare_date_features(df, date_col='date'):
     
     return df
 
+
+def compact_news_frame(df, date_col='date', categorical_cols=('stock', 'publisher'),
+                       string_cols=('headline', 'url'), arrow_strings=False):
+    """
+    Convert a news DataFrame to compact dtypes.
+    
+    Stock and publisher become categoricals, a categorical 'publisher_domain'
+    column is derived once per distinct publisher, the date column is parsed
+    to UTC datetime64 with compact date features, and free-text columns can
+    be stored as Arrow-backed strings.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        News DataFrame (e.g. as loaded with `pd.read_csv`)
+    date_col : str
+        Name of the date column
+    categorical_cols : tuple
+        Low-cardinality columns to store as categoricals
+    string_cols : tuple
+        Free-text columns to convert when `arrow_strings` is True
+    arrow_strings : bool
+        Store `string_cols` as 'string[pyarrow]' instead of Python objects
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with compact dtypes and date features
+    """
+    df = prepare_date_features(df, date_col=date_col, compact=True)
+    
+    for col in categorical_cols:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    
+    if 'publisher' in df.columns:
+        publishers = df['publisher'].astype('category').cat
+        domain_codes, domains = pd.factorize(
+            pd.Series([extract_domain(p) for p in publishers.categories], dtype=object)
+        )
+        codes = np.append(domain_codes, -1)[publishers.codes.to_numpy()]
+        df['publisher_domain'] = pd.Categorical.from_codes(codes, categories=domains)
+    
+    if arrow_strings:
+        for col in string_cols:
+            if col in df.columns:
+                df[col] = df[col].astype('string[pyarrow]')
+    
+    return df
+
+
+def load_news_data(path, date_col='date', categorical_cols=('stock', 'publisher'),
+                   string_cols=('headline', 'url'), arrow_strings=False, **read_csv_kwargs):
+    """
+    Load a news CSV directly into compact dtypes.
+    
+    Categorical and Arrow string dtypes are applied while parsing, so the
+    per-row Python strings of the default load are never materialized.
+    
+    Parameters:
+    -----------
+    path : str or Path
+        News CSV file
+    date_col : str
+        Name of the date column
+    categorical_cols : tuple
+        Low-cardinality columns to store as categoricals
+    string_cols : tuple
+        Free-text columns to store as 'string[pyarrow]' when `arrow_strings` is True
+    arrow_strings : bool
+        Use Arrow-backed strings for `string_cols`
+    **read_csv_kwargs
+        Extra keyword arguments for `pd.read_csv`
+    
+    Returns:
+    --------
+    pd.DataFrame
+        News DataFrame as returned by `compact_news_frame`
+    """
+    dtype = {col: 'category' for col in categorical_cols}
+    if arrow_strings:
+        dtype.update({col: 'string[pyarrow]' for col in string_cols})
+    dtype.update(read_csv_kwargs.pop('dtype', {}))
+    
+    header = pd.read_csv(path, **{**read_csv_kwargs, 'nrows': 0}).columns
+    df = pd.read_csv(path, dtype={col: kind for col, kind in dtype.items() if col in header},
+                     **read_csv_kwargs)
+    
+    return compact_news_frame(df, date_col=date_col, categorical_cols=categorical_cols,
+                              string_cols=string_cols, arrow_strings=arrow_strings)
+
+
+def memory_report(before, after):
+    """
+    Compare the memory use of two versions of a DataFrame column by column.
+    
+    Parameters:
+    -----------
+    before : pd.DataFrame
+        Original DataFrame
+    after : pd.DataFrame
+        Converted DataFrame
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Per-column dtypes and deep memory in MB, with a 'TOTAL' row
+    """
+    before_mb = before.memory_usage(deep=True, index=False) / 1e6
+    after_mb = after.memory_usage(deep=True, index=False) / 1e6
+    
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'mb_before': before_mb,
+        'mb_after': after_mb,
+    }).reindex(list(dict.fromkeys(list(before.columns) + list(after.columns))))
+    report.loc['TOTAL', ['mb_before', 'mb_after']] = [before_mb.sum(), after_mb.sum()]
+    report['reduction'] = 1 - report['mb_after'] / report['mb_before']
+    
+    return report
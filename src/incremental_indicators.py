@@ -0,0 +1,453 @@
+"""
+Incremental Indicator Calculators
+
+This module provides stateful calculators that update technical indicators
+and financial metrics one bar at a time in O(1), so appending a daily bar
+does not require recomputing the full history. Values follow the batch
+results of `calculate_technical_indicators` (TA-Lib) and
+`calculate_financial_metrics` (pandas) up to floating-point rounding, and
+every calculator's state can be serialized to JSON and restored later.
+"""
+
+import json
+import math
+from collections import deque
+from typing import Dict
+
+import pandas as pd
+
+
+NAN = float('nan')
+
+
+class IncrementalIndicator:
+    """
+    Base class for incremental calculators.
+
+    Subclasses list their state attributes in `_state_fields`; deques are
+    stored as lists together with their maxlen.
+    """
+
+    _state_fields = ()
+
+    def state_dict(self) -> Dict:
+        """Return a JSON-serializable snapshot of the calculator state."""
+        state = {'type': type(self).__name__}
+        for field in self._state_fields:
+            value = getattr(self, field)
+            if isinstance(value, deque):
+                value = {'items': list(value), 'maxlen': value.maxlen}
+            elif isinstance(value, IncrementalIndicator):
+                value = value.state_dict()
+            state[field] = value
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'IncrementalIndicator':
+        """Rebuild a calculator from `state_dict` output."""
+        calculator = _CALCULATORS[state['type']].__new__(_CALCULATORS[state['type']])
+        for field in calculator._state_fields:
+            value = state[field]
+            if isinstance(value, dict) and 'maxlen' in value:
+                value = deque(value['items'], maxlen=value['maxlen'])
+            elif isinstance(value, dict) and 'type' in value:
+                value = IncrementalIndicator.from_state(value)
+            setattr(calculator, field, value)
+        return calculator
+
+
+class RollingWindow(IncrementalIndicator):
+    """
+    Fixed-size window with running sum and sum of squares.
+
+    The sums are rebuilt from the buffered values once per window, so
+    rounding errors of the running updates do not accumulate over long
+    streams.
+    """
+
+    _state_fields = ('values', 'total', 'total_sq', 'pushes')
+
+    def __init__(self, size: int):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.pushes = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.values.maxlen
+
+    def push(self, value: float) -> None:
+        if self.full:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+        self.pushes = (self.pushes + 1) % self.values.maxlen
+        if self.pushes == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    def mean(self) -> float:
+        return self.total / len(self.values) if self.values else NAN
+
+    def std(self, ddof: int = 0) -> float:
+        n = len(self.values)
+        if n - ddof <= 0:
+            return NAN
+        variance = (self.total_sq - self.total * self.total / n) / (n - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+
+class SMA(IncrementalIndicator):
+    """Simple moving average (talib.SMA)."""
+
+    _state_fields = ('window',)
+
+    def __init__(self, timeperiod: int = 30):
+        self.window = RollingWindow(timeperiod)
+
+    def update(self, value: float) -> float:
+        self.window.push(value)
+        return self.window.mean() if self.window.full else NAN
+
+
+class EMA(IncrementalIndicator):
+    """Exponential moving average seeded with an SMA (talib.EMA)."""
+
+    _state_fields = ('timeperiod', 'count', 'seed_sum', 'value')
+
+    def __init__(self, timeperiod: int = 30):
+        self.timeperiod = timeperiod
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        if self.count < self.timeperiod:
+            self.seed_sum += value
+            return NAN
+        if self.count == self.timeperiod:
+            self.value = (self.seed_sum + value) / self.timeperiod
+        else:
+            k = 2.0 / (self.timeperiod + 1)
+            self.value = (value - self.value) * k + self.value
+        return self.value
+
+
+class RSI(IncrementalIndicator):
+    """Relative Strength Index with Wilder smoothing (talib.RSI)."""
+
+    _state_fields = ('timeperiod', 'count', 'prev_close', 'avg_gain', 'avg_loss')
+
+    def __init__(self, timeperiod: int = 14):
+        self.timeperiod = timeperiod
+        self.count = 0
+        self.prev_close = NAN
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, close: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.prev_close = close
+            return NAN
+
+        change = close - self.prev_close
+        self.prev_close = close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        n = self.timeperiod
+
+        # The first average is a plain mean of the first n changes
+        if self.count <= n:
+            self.avg_gain += gain
+            self.avg_loss += loss
+            return NAN
+        if self.count == n + 1:
+            self.avg_gain = (self.avg_gain + gain) / n
+            self.avg_loss = (self.avg_loss + loss) / n
+        else:
+            self.avg_gain = (self.avg_gain * (n - 1) + gain) / n
+            self.avg_loss = (self.avg_loss * (n - 1) + loss) / n
+
+        total = self.avg_gain + self.avg_loss
+        return 100.0 * self.avg_gain / total if total != 0 else 0.0
+
+
+class MACD(IncrementalIndicator):
+    """
+    MACD line, signal and histogram (talib.MACD).
+
+    As in TA-Lib, both EMAs start at the slow period: the slow EMA is seeded
+    with the SMA of the first `slowperiod` closes and the fast EMA with the
+    SMA of the last `fastperiod` of those closes.
+    """
+
+    _state_fields = ('fastperiod', 'slowperiod', 'count', 'warmup', 'fast', 'slow', 'signal')
+
+    def __init__(self, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9):
+        self.fastperiod = fastperiod
+        self.slowperiod = slowperiod
+        self.count = 0
+        self.warmup = deque(maxlen=slowperiod)
+        self.fast = NAN
+        self.slow = NAN
+        self.signal = EMA(signalperiod)
+
+    def update(self, close: float):
+        self.count += 1
+        if self.count < self.slowperiod:
+            self.warmup.append(close)
+            return NAN, NAN, NAN
+
+        if self.count == self.slowperiod:
+            self.warmup.append(close)
+            closes = list(self.warmup)
+            self.slow = sum(closes) / self.slowperiod
+            self.fast = sum(closes[-self.fastperiod:]) / self.fastperiod
+            self.warmup.clear()
+        else:
+            k_fast = 2.0 / (self.fastperiod + 1)
+            k_slow = 2.0 / (self.slowperiod + 1)
+            self.fast = (close - self.fast) * k_fast + self.fast
+            self.slow = (close - self.slow) * k_slow + self.slow
+
+        macd = self.fast - self.slow
+        signal = self.signal.update(macd)
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+
+class BollingerBands(IncrementalIndicator):
+    """Bollinger Bands around an SMA (talib.BBANDS with matype=0)."""
+
+    _state_fields = ('nbdev', 'window')
+
+    def __init__(self, timeperiod: int = 20, nbdev: float = 2.0):
+        self.nbdev = nbdev
+        self.window = RollingWindow(timeperiod)
+
+    def update(self, close: float):
+        self.window.push(close)
+        if not self.window.full:
+            return NAN, NAN, NAN
+        middle = self.window.mean()
+        width = self.nbdev * self.window.std(ddof=0)
+        return middle + width, middle, middle - width
+
+
+class ATR(IncrementalIndicator):
+    """Average True Range with Wilder smoothing (talib.ATR)."""
+
+    _state_fields = ('timeperiod', 'count', 'prev_close', 'value')
+
+    def __init__(self, timeperiod: int = 14):
+        self.timeperiod = timeperiod
+        self.count = 0
+        self.prev_close = NAN
+        self.value = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.prev_close = close
+            return NAN
+
+        true_range = max(high, self.prev_close) - min(low, self.prev_close)
+        self.prev_close = close
+        n = self.timeperiod
+
+        if self.count <= n:
+            self.value += true_range
+            return NAN
+        if self.count == n + 1:
+            self.value = (self.value + true_range) / n
+        else:
+            self.value = (self.value * (n - 1) + true_range) / n
+        return self.value
+
+
+class OBV(IncrementalIndicator):
+    """On Balance Volume (talib.OBV)."""
+
+    _state_fields = ('prev_close', 'value')
+
+    def __init__(self):
+        self.prev_close = None
+        self.value = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if self.prev_close is None:
+            self.value = volume
+        elif close > self.prev_close:
+            self.value += volume
+        elif close < self.prev_close:
+            self.value -= volume
+        self.prev_close = close
+        return self.value
+
+
+class RollingVolatility(IncrementalIndicator):
+    """Annualized rolling standard deviation of daily returns."""
+
+    _state_fields = ('periods_per_year', 'prev_close', 'window')
+
+    def __init__(self, window: int = 30, periods_per_year: int = 252):
+        self.periods_per_year = periods_per_year
+        self.prev_close = None
+        self.window = RollingWindow(window)
+
+    def update(self, close: float) -> float:
+        if self.prev_close is None:
+            self.prev_close = close
+            return NAN
+        self.window.push(close / self.prev_close - 1)
+        self.prev_close = close
+        if not self.window.full:
+            return NAN
+        return self.window.std(ddof=1) * math.sqrt(self.periods_per_year)
+
+
+class RollingSharpe(IncrementalIndicator):
+    """Annualized rolling Sharpe ratio of daily excess returns."""
+
+    _state_fields = ('periods_per_year', 'daily_risk_free', 'prev_close', 'window')
+
+    def __init__(self, window: int = 252, risk_free_rate: float = 0.02, periods_per_year: int = 252):
+        self.periods_per_year = periods_per_year
+        self.daily_risk_free = risk_free_rate / periods_per_year
+        self.prev_close = None
+        self.window = RollingWindow(window)
+
+    def update(self, close: float) -> float:
+        if self.prev_close is None:
+            self.prev_close = close
+            return NAN
+        self.window.push(close / self.prev_close - 1 - self.daily_risk_free)
+        self.prev_close = close
+        if not self.window.full:
+            return NAN
+        std = self.window.std(ddof=1)
+        return self.window.mean() / std * math.sqrt(self.periods_per_year) if std > 0 else NAN
+
+
+class Drawdown(IncrementalIndicator):
+    """Cumulative return, current drawdown and maximum drawdown."""
+
+    _state_fields = ('first_close', 'peak', 'max_drawdown')
+
+    def __init__(self):
+        self.first_close = None
+        self.peak = NAN
+        self.max_drawdown = NAN
+
+    def update(self, close: float):
+        """Return (cumulative_return, drawdown, max_drawdown)."""
+        if self.first_close is None:
+            self.first_close = close
+            return NAN, NAN, NAN
+
+        wealth = close / self.first_close
+        self.peak = wealth if math.isnan(self.peak) else max(self.peak, wealth)
+        drawdown = (wealth - self.peak) / self.peak
+        self.max_drawdown = drawdown if math.isnan(self.max_drawdown) else min(self.max_drawdown, drawdown)
+        return wealth - 1, drawdown, self.max_drawdown
+
+
+_CALCULATORS = {cls.__name__: cls for cls in [
+    RollingWindow, SMA, EMA, RSI, MACD, BollingerBands, ATR, OBV,
+    RollingVolatility, RollingSharpe, Drawdown,
+]}
+
+
+class IncrementalIndicatorSet:
+    """
+    All incremental calculators of one ticker.
+
+    `update` takes one OHLCV bar and returns the indicator and metric values
+    for it, using the column names of `calculate_technical_indicators` and
+    `calculate_financial_metrics`.
+
+    Parameters:
+    -----------
+    risk_free_rate : float
+        Annual risk-free rate used for the Sharpe ratio
+    """
+
+    def __init__(self, risk_free_rate: float = 0.02):
+        self.calculators = {
+            'SMA_20': SMA(20),
+            'SMA_50': SMA(50),
+            'SMA_200': SMA(200),
+            'EMA_12': EMA(12),
+            'EMA_26': EMA(26),
+            'RSI': RSI(14),
+            'MACD': MACD(12, 26, 9),
+            'BB': BollingerBands(20, 2.0),
+            'ATR': ATR(14),
+            'OBV': OBV(),
+            'volatility_30d': RollingVolatility(30),
+            'sharpe_ratio': RollingSharpe(252, risk_free_rate),
+            'drawdown': Drawdown(),
+        }
+
+    def update(self, bar) -> Dict[str, float]:
+        """
+        Update all calculators with one bar.
+
+        Parameters:
+        -----------
+        bar : Mapping
+            Bar with 'high', 'low', 'close' and 'volume' values
+
+        Returns:
+        --------
+        Dict[str, float]
+            Indicator and metric values for the bar
+        """
+        c = self.calculators
+        high, low, close, volume = (float(bar[key]) for key in ('high', 'low', 'close', 'volume'))
+
+        values = {name: c[name].update(close) for name in ('SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'RSI')}
+        values['MACD'], values['MACD_signal'], values['MACD_hist'] = c['MACD'].update(close)
+        values['BB_upper'], values['BB_middle'], values['BB_lower'] = c['BB'].update(close)
+        values['ATR'] = c['ATR'].update(high, low, close)
+        values['OBV'] = c['OBV'].update(close, volume)
+        values['volatility_30d'] = c['volatility_30d'].update(close)
+        values['sharpe_ratio'] = c['sharpe_ratio'].update(close)
+        values['cumulative_return'], values['drawdown'], values['max_drawdown'] = c['drawdown'].update(close)
+        return values
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feed every bar of `df` in order and return the values as a DataFrame."""
+        rows = [self.update(bar) for bar in df[['high', 'low', 'close', 'volume']].to_dict('records')]
+        return pd.DataFrame(rows, index=df.index)
+
+    def state_dict(self) -> Dict:
+        """Return a JSON-serializable snapshot of all calculators."""
+        return {name: calculator.state_dict() for name, calculator in self.calculators.items()}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'IncrementalIndicatorSet':
+        """Rebuild an indicator set from `state_dict` output."""
+        indicator_set = cls.__new__(cls)
+        indicator_set.calculators = {name: IncrementalIndicator.from_state(calc_state)
+                                     for name, calc_state in state.items()}
+        return indicator_set
+
+
+def save_indicator_states(states: Dict[str, IncrementalIndicatorSet], path) -> None:
+    """Write the indicator sets of several tickers to a JSON file."""
+    with open(path, 'w') as f:
+        json.dump({ticker: indicator_set.state_dict() for ticker, indicator_set in states.items()}, f)
+
+
+def load_indicator_states(path) -> Dict[str, IncrementalIndicatorSet]:
+    """Read indicator sets written by `save_indicator_states`."""
+    with open(path) as f:
+        return {ticker: IncrementalIndicatorSet.from_state(state) for ticker, state in json.load(f).items()}
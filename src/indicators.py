@@ -0,0 +1,223 @@
+"""
+Indicator Registry
+
+This module provides a declarative registry of technical indicator specs and
+a lazy indicator frame that computes only the columns that are requested.
+Results are memoized per (ticker, spec, data version), and specs can use
+other indicator columns as inputs so intermediates (e.g. SMA_20 for the
+Bollinger Bands) are computed once and shared.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class IndicatorSpec(NamedTuple):
+    """
+    Declarative description of an indicator.
+
+    Attributes:
+    -----------
+    name : str
+        Registry key
+    outputs : Tuple[str, ...]
+        Column names produced, in the order returned by `compute`
+    compute : Callable
+        Function called as `compute(*input_arrays, **params)`, returning one
+        array or a tuple of arrays (one per output)
+    inputs : Tuple[str, ...]
+        OHLCV columns or other indicator columns passed to `compute`
+    params : Dict, optional
+        Keyword parameters passed to `compute` (None for none)
+    """
+    name: str
+    outputs: Tuple[str, ...]
+    compute: Callable
+    inputs: Tuple[str, ...] = ('close',)
+    params: Optional[Dict] = None
+
+
+def _bollinger_from_parts(middle: np.ndarray, stddev: np.ndarray, nbdev: float = 2.0):
+    """Bollinger Bands from a moving average and a moving standard deviation."""
+    return middle + nbdev * stddev, middle, middle - nbdev * stddev
+
+
+INDICATOR_REGISTRY: Dict[str, IndicatorSpec] = {}
+
+
+def register_indicator(spec: IndicatorSpec,
+                       registry: Optional[Dict[str, IndicatorSpec]] = None) -> IndicatorSpec:
+    """
+    Add an indicator spec to a registry.
+
+    Parameters:
+    -----------
+    spec : IndicatorSpec
+        Spec to register
+    registry : Dict[str, IndicatorSpec], optional
+        Registry to add to (default: INDICATOR_REGISTRY)
+
+    Returns:
+    --------
+    IndicatorSpec
+        The registered spec
+    """
+    registry = INDICATOR_REGISTRY if registry is None else registry
+    if spec.name in registry:
+        raise ValueError(f"Indicator '{spec.name}' is already registered")
+
+    taken = {column for other in registry.values() for column in other.outputs}
+    clashes = taken.intersection(spec.outputs)
+    if clashes:
+        raise ValueError(f"Columns {sorted(clashes)} are already produced by another indicator")
+
+    registry[spec.name] = spec
+    return spec
+
+
+for _spec in [
+    IndicatorSpec('SMA_20', ('SMA_20',), talib.SMA, params={'timeperiod': 20}),
+    IndicatorSpec('SMA_50', ('SMA_50',), talib.SMA, params={'timeperiod': 50}),
+    IndicatorSpec('SMA_200', ('SMA_200',), talib.SMA, params={'timeperiod': 200}),
+    IndicatorSpec('EMA_12', ('EMA_12',), talib.EMA, params={'timeperiod': 12}),
+    IndicatorSpec('EMA_26', ('EMA_26',), talib.EMA, params={'timeperiod': 26}),
+    IndicatorSpec('RSI', ('RSI',), talib.RSI, params={'timeperiod': 14}),
+    # TA-Lib seeds the MACD EMAs differently from EMA_12/EMA_26, so MACD is
+    # computed by its own call to keep the warm-up values identical
+    IndicatorSpec('MACD', ('MACD', 'MACD_signal', 'MACD_hist'), talib.MACD,
+                  params={'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9}),
+    IndicatorSpec('STDDEV_20', ('STDDEV_20',), talib.STDDEV, params={'timeperiod': 20, 'nbdev': 1}),
+    IndicatorSpec('BBANDS', ('BB_upper', 'BB_middle', 'BB_lower'), _bollinger_from_parts,
+                  inputs=('SMA_20', 'STDDEV_20'), params={'nbdev': 2.0}),
+    IndicatorSpec('STOCH', ('Stoch_K', 'Stoch_D'), talib.STOCH, inputs=('high', 'low', 'close'),
+                  params={'fastk_period': 14, 'slowk_period': 3, 'slowd_period': 3}),
+    IndicatorSpec('ATR', ('ATR',), talib.ATR, inputs=('high', 'low', 'close'), params={'timeperiod': 14}),
+    IndicatorSpec('OBV', ('OBV',), talib.OBV, inputs=('close', 'volume')),
+    IndicatorSpec('ADX', ('ADX',), talib.ADX, inputs=('high', 'low', 'close'), params={'timeperiod': 14}),
+]:
+    register_indicator(_spec)
+
+
+class IndicatorCache:
+    """
+    LRU memo of indicator outputs keyed by (ticker, spec, data version).
+
+    Parameters:
+    -----------
+    max_entries : int
+        Maximum number of spec results kept
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.computations = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _spec_key(spec: IndicatorSpec) -> Tuple:
+    return (spec.name, tuple(sorted((spec.params or {}).items())))
+
+
+class LazyIndicatorFrame:
+    """
+    OHLCV frame whose indicator columns are computed on first access.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with OHLCV data (date as index)
+    ticker : str, optional
+        Ticker symbol, used in the memo key
+    registry : Dict[str, IndicatorSpec], optional
+        Indicator registry (default: INDICATOR_REGISTRY)
+    cache : IndicatorCache, optional
+        Shared memo; pass the same cache to reuse results across frames
+    data_version : str, optional
+        Version of the price data. Defaults to a hash of the OHLCV values.
+    """
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 ticker: Optional[str] = None,
+                 registry: Optional[Dict[str, IndicatorSpec]] = None,
+                 cache: Optional[IndicatorCache] = None,
+                 data_version: Optional[str] = None):
+        self.df = df
+        self.ticker = ticker
+        self.registry = INDICATOR_REGISTRY if registry is None else registry
+        self.cache = IndicatorCache() if cache is None else cache
+
+        self._arrays = {col: df[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS if col in df.columns}
+        if data_version is None:
+            digest = hashlib.sha1()
+            for col in sorted(self._arrays):
+                digest.update(self._arrays[col].tobytes())
+            data_version = digest.hexdigest()
+        self.data_version = data_version
+
+        self._producers = {column: spec for spec in self.registry.values() for column in spec.outputs}
+
+    @property
+    def available(self) -> List[str]:
+        """Indicator columns that can be requested."""
+        return list(self._producers)
+
+    def __getitem__(self, column: str) -> pd.Series:
+        return pd.Series(self._column(column), index=self.df.index, name=column)
+
+    def compute(self, columns: Iterable[str]) -> pd.DataFrame:
+        """Return the requested indicator columns, computing only what is missing."""
+        columns = list(columns)
+        return pd.DataFrame({column: self._column(column) for column in columns},
+                            index=self.df.index, columns=columns)
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Return the OHLCV frame with the requested indicator columns added."""
+        indicators = self.compute(columns if columns is not None else self.available)
+        df = self.df.copy()
+        df[list(indicators.columns)] = indicators.to_numpy()
+        return df
+
+    def _column(self, column: str) -> np.ndarray:
+        if column in self._arrays:
+            return self._arrays[column]
+
+        spec = self._producers.get(column)
+        if spec is None:
+            raise KeyError(f"Unknown indicator column '{column}'")
+
+        key = (self.ticker, _spec_key(spec), self.data_version)
+        outputs = self.cache.get(key)
+        if outputs is None:
+            inputs = [self._column(name) for name in spec.inputs]
+            result = spec.compute(*inputs, **(spec.params or {}))
+            if not isinstance(result, tuple):
+                result = (result,)
+            outputs = dict(zip(spec.outputs, (np.asarray(values, dtype=np.float64) for values in result)))
+            self.cache.put(key, outputs)
+            self.cache.computations += 1
+
+        return outputs[column]
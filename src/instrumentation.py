@@ -0,0 +1,300 @@
+"""
+Pipeline Instrumentation Utility Functions
+
+This module provides opt-in per-stage instrumentation for the analysis
+pipeline. Functions decorated with `instrument` (and blocks wrapped in
+`stage`) record wall time, rows in/out, peak traced memory and the number
+of DataFrame copies made while a `PipelineProfiler` is active. A profiler
+is only active in the thread (or asyncio task) that entered it, so
+concurrent code elsewhere is neither recorded nor counted. Nested stages
+are recorded with their call path, so the report can be exported as JSON
+or as folded stacks for flame graph tools.
+
+When no profiler is active, a decorated function costs one context
+variable lookup and a branch per call.
+"""
+
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Profiler receiving records in the current thread or task; None when off
+_ACTIVE: ContextVar[Optional['PipelineProfiler']] = ContextVar('active_profiler', default=None)
+# The counting `DataFrame.copy` is installed once while any profiler counts copies
+_COPY_PATCH_LOCK = threading.Lock()
+_copy_patch_users = 0
+_original_copy = None
+
+
+def _install_copy_counter() -> None:
+    global _copy_patch_users, _original_copy
+    with _COPY_PATCH_LOCK:
+        if _copy_patch_users == 0:
+            # None when DataFrame inherits `copy` from NDFrame
+            _original_copy = vars(pd.DataFrame).get('copy')
+            original = pd.DataFrame.copy
+
+            @functools.wraps(original)
+            def counting_copy(frame, *args, **kwargs):
+                profiler = _ACTIVE.get()
+                if profiler is not None and profiler.track_copies:
+                    profiler._copies += 1
+                return original(frame, *args, **kwargs)
+
+            pd.DataFrame.copy = counting_copy
+        _copy_patch_users += 1
+
+
+def _remove_copy_counter() -> None:
+    global _copy_patch_users, _original_copy
+    with _COPY_PATCH_LOCK:
+        _copy_patch_users -= 1
+        if _copy_patch_users == 0:
+            if _original_copy is None:
+                del pd.DataFrame.copy
+            else:
+                pd.DataFrame.copy = _original_copy
+            _original_copy = None
+
+
+def _row_count(value) -> Optional[int]:
+    """Rows of a DataFrame, Series or array (or of the first one in a tuple)."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return len(value) if value.ndim else None
+    if isinstance(value, tuple):
+        for item in value:
+            rows = _row_count(item)
+            if rows is not None:
+                return rows
+    return None
+
+
+class _Frame:
+    """Bookkeeping of one running stage."""
+
+    __slots__ = ('name', 'path', 'start_time', 'start_memory', 'peak_memory', 'start_copies', 'rows_in')
+
+    def __init__(self, name: str, path: str, rows_in: Optional[int]):
+        self.name = name
+        self.path = path
+        self.rows_in = rows_in
+        self.start_time = 0.0
+        self.start_memory = 0
+        self.peak_memory = 0
+        self.start_copies = 0
+
+
+class PipelineProfiler:
+    """
+    Collects per-stage records while active.
+
+    Usage::
+
+        with PipelineProfiler() as profiler:
+            scored = apply_sentiment_analysis(news)
+            daily = aggregate_daily_sentiment(scored)
+        print(profiler.summary())
+        profiler.to_json('profile.json')
+
+    Parameters:
+    -----------
+    track_memory : bool
+        Record peak memory with `tracemalloc` (adds allocation overhead)
+    track_copies : bool
+        Count `DataFrame.copy` calls made inside each stage by the thread
+        (or asyncio task) that entered the profiler
+    """
+
+    def __init__(self, track_memory: bool = True, track_copies: bool = True):
+        self.track_memory = track_memory
+        self.track_copies = track_copies
+        self.records: List[Dict] = []
+
+        self._stack: List[_Frame] = []
+        self._copies = 0
+        self._token = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        self._token = _ACTIVE.set(self)
+
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.track_copies:
+            _install_copy_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        token, self._token = self._token, None
+        try:
+            _ACTIVE.reset(token)
+        finally:
+            if self.track_copies:
+                _remove_copy_counter()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def _start(self, name: str, rows_in: Optional[int]) -> _Frame:
+        parent = self._stack[-1] if self._stack else None
+        frame = _Frame(name, f"{parent.path};{name}" if parent else name, rows_in)
+
+        if self.track_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.peak_memory = max(parent.peak_memory, peak)
+            tracemalloc.reset_peak()
+            frame.start_memory = frame.peak_memory = current
+        frame.start_copies = self._copies
+        self._stack.append(frame)
+        frame.start_time = time.perf_counter()
+        return frame
+
+    def _finish(self, frame: _Frame, result=None, error: Optional[BaseException] = None) -> None:
+        wall_time = time.perf_counter() - frame.start_time
+        self._stack.pop()
+
+        peak_bytes = None
+        if self.track_memory and tracemalloc.is_tracing():
+            frame.peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+            peak_bytes = frame.peak_memory - frame.start_memory
+            if self._stack:
+                self._stack[-1].peak_memory = max(self._stack[-1].peak_memory, frame.peak_memory)
+
+        self.records.append({
+            'stage': frame.name,
+            'path': frame.path,
+            'depth': frame.path.count(';'),
+            'wall_time_s': wall_time,
+            'rows_in': frame.rows_in,
+            'rows_out': _row_count(result),
+            'peak_memory_mb': peak_bytes / 1e6 if peak_bytes is not None else None,
+            'dataframe_copies': self._copies - frame.start_copies if self.track_copies else None,
+            'error': type(error).__name__ if error is not None else None,
+        })
+
+    def report(self) -> pd.DataFrame:
+        """One row per recorded call, in completion order."""
+        report = pd.DataFrame(self.records, columns=[
+            'stage', 'path', 'depth', 'wall_time_s', 'rows_in', 'rows_out',
+            'peak_memory_mb', 'dataframe_copies', 'error'
+        ])
+        return report.astype({'rows_in': 'Int64', 'rows_out': 'Int64', 'dataframe_copies': 'Int64'})
+
+    def summary(self) -> pd.DataFrame:
+        """Calls aggregated by call path, with inclusive and self wall time."""
+        report = self.report()
+        if report.empty:
+            return report
+
+        inclusive_time = report['wall_time_s'].groupby(report['path']).sum()
+        parents = report['path'].str.rpartition(';')[0]
+        child_time = report['wall_time_s'].groupby(parents).sum()
+        summary = report.groupby('path', sort=False).agg(
+            calls=('stage', 'size'),
+            wall_time_s=('wall_time_s', 'sum'),
+            rows_in=('rows_in', lambda rows: rows.sum(min_count=1)),
+            rows_out=('rows_out', lambda rows: rows.sum(min_count=1)),
+            peak_memory_mb=('peak_memory_mb', 'max'),
+            dataframe_copies=('dataframe_copies', 'sum'),
+        )
+        summary['self_time_s'] = inclusive_time.sub(child_time, fill_value=0).reindex(summary.index)
+        return summary.sort_values('wall_time_s', ascending=False)
+
+    def to_json(self, path: Union[str, Path, None] = None) -> str:
+        """Serialize the per-call records as JSON, optionally writing them to a file."""
+        text = self.report().to_json(orient='records', indent=2)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+    def to_folded(self, path: Union[str, Path, None] = None) -> str:
+        """
+        Export self time per call path in folded-stack format
+        (`a;b;c <microseconds>`), readable by flamegraph.pl and speedscope.
+        """
+        summary = self.summary()
+        lines = [f"{stack} {max(int(round(seconds * 1e6)), 0)}"
+                 for stack, seconds in summary['self_time_s'].items()] if not summary.empty else []
+        text = '\n'.join(lines)
+        if path is not None:
+            Path(path).write_text(text + '\n')
+        return text
+
+
+def instrument(func: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Decorator recording a function call as a pipeline stage.
+
+    Parameters:
+    -----------
+    func : Callable
+        Function to wrap
+    name : str, optional
+        Stage name (default: `module.function`)
+    """
+    if func is None:
+        return functools.partial(instrument, name=name)
+
+    stage_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _ACTIVE.get()
+        if profiler is None:
+            return func(*args, **kwargs)
+
+        rows_in = None
+        for value in (*args, *kwargs.values()):
+            rows_in = _row_count(value)
+            if rows_in is not None:
+                break
+
+        frame = profiler._start(stage_name, rows_in)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as error:
+            profiler._finish(frame, error=error)
+            raise
+        profiler._finish(frame, result)
+        return result
+
+    return wrapper
+
+
+@contextmanager
+def stage(name: str, rows_in: Optional[int] = None):
+    """
+    Record a block of code as a pipeline stage.
+
+    Parameters:
+    -----------
+    name : str
+        Stage name
+    rows_in : int, optional
+        Number of input rows to report
+    """
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield
+        return
+
+    frame = profiler._start(name, rows_in)
+    try:
+        yield
+    except BaseException as error:
+        profiler._finish(frame, error=error)
+        raise
+    profiler._finish(frame)
@@ -0,0 +1,275 @@
+"""
+Lexicon Sentiment Scorer
+
+This module provides a vectorized alternative to TextBlob sentiment scoring.
+The TextBlob/pattern polarity lexicon is loaded once into compact arrays.
+Whole text columns are then scored with NumPy scans and segment reductions,
+instead of building one TextBlob object per row.
+
+Texts are split into tokens exactly as pattern's `find_tokens` does. For
+example, "isn't" becomes "is n ' t", so contractions never act as
+negations. The rules of pattern's `Sentiment.assessments` then run on the
+flat token arrays. A negation carries forward across one-letter tokens to
+the next known word ("not a great quarter"). An adverb scales the next
+known word it modifies ("not very good"). Exclamation marks boost the
+assessment before them, and emoticons and "(!)" are assessed on their own.
+Scores match `analyze_sentiment_textblob` for lexicons without multi-word
+entries, which pattern only uses for part-of-speech tagged input.
+"""
+
+import re
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from textblob import en
+from textblob._text import (
+    ABBREVIATIONS,
+    EMOTICONS,
+    PUNCTUATION,
+    RE_ABBR1,
+    RE_ABBR2,
+    RE_ABBR3,
+    RE_EMOTICONS,
+    RE_SARCASM,
+)
+
+
+# Version of the scoring rules in this module. Bump it whenever they change,
+# so that cached lexicon scores are invalidated (see `sentiment_cache`).
+SCORER_VERSION = '1'
+
+NEGATIONS = ('no', 'not', "n't", 'never')
+
+# find_tokens: contractions are split off, then every quote is spaced out
+_RE_CONTRACTIONS = re.compile(r"('d|'m|'s|'ll|'re|'ve|n't)")
+_QUOTES = ('“', '”', '‘', '’', "'", '"')
+_RE_LINEBREAKS = re.compile(r"\n{2,}")
+_LEADING = tuple(PUNCTUATION.replace('.', ''))
+_TRAILING = _LEADING + ('.',)
+_EDGE_CHARACTERS = frozenset(_TRAILING)
+
+# Lowercased emoticon -> polarity, first match in pattern's lookup order
+_EMOTICON_POLARITY = {}
+for (_, _polarity), _faces in EMOTICONS.items():
+    for _face in _faces:
+        _EMOTICON_POLARITY.setdefault(_face.lower(), _polarity)
+
+
+def _split_chunk(chunk: str, tokens: List[str]) -> None:
+    """Split leading and trailing punctuation off one whitespace-separated chunk."""
+    while chunk.startswith(_LEADING):
+        tokens.append(chunk[0])
+        chunk = chunk[1:]
+
+    tail = []
+    while chunk.endswith(_TRAILING):
+        if chunk.endswith(_LEADING):
+            tail.append(chunk[-1])
+            chunk = chunk[:-1]
+        if chunk.endswith('...'):
+            tail.append('...')
+            chunk = chunk[:-3].rstrip('.')
+        if chunk.endswith('.'):
+            # Abbreviations keep their period ("U.S.", "Inc.")
+            if (chunk in ABBREVIATIONS or RE_ABBR1.match(chunk) or RE_ABBR2.match(chunk)
+                    or RE_ABBR3.match(chunk)):
+                break
+            tail.append('.')
+            chunk = chunk[:-1]
+
+    if chunk:
+        tokens.append(chunk)
+    tokens.extend(reversed(tail))
+
+
+def pattern_tokens(text: str) -> List[str]:
+    """Lowercased tokens of `text`, as pattern's sentiment analyzer sees them."""
+    text = _RE_CONTRACTIONS.sub(r' \1', text)
+    for quote in _QUOTES:
+        if quote in text:
+            text = text.replace(quote, f" {quote} ")
+    # Paragraph breaks only end sentences; the sentences are joined again
+    text = _RE_LINEBREAKS.sub(' ', text.replace('\r\n', '\n'))
+
+    tokens = []
+    for chunk in text.split():
+        if chunk[0] in _EDGE_CHARACTERS or chunk[-1] in _EDGE_CHARACTERS:
+            _split_chunk(chunk, tokens)
+        else:
+            tokens.append(chunk)
+
+    joined = RE_SARCASM.sub('(!)', ' '.join(tokens))
+    joined = RE_EMOTICONS.sub(lambda m: m.group(1).replace(' ', '') + m.group(2), joined)
+    return joined.lower().split()
+
+
+def _last_before(mask: np.ndarray, doc_start: np.ndarray) -> np.ndarray:
+    """Position of the last True in `mask` strictly before each token of the same document (-1 if none)."""
+    positions = np.where(mask, np.arange(len(mask)), -1)
+    last = np.concatenate(([-1], np.maximum.accumulate(positions)[:-1])) if len(mask) else positions
+    return np.where(last >= doc_start, last, -1)
+
+
+class LexiconSentimentScorer:
+    """
+    Vectorized polarity/subjectivity scorer backed by the pattern lexicon.
+
+    Parameters:
+    -----------
+    lexicon : dict, optional
+        Mapping of word -> {pos: (polarity, subjectivity, intensity)}.
+        Defaults to the English lexicon shipped with TextBlob.
+    """
+
+    def __init__(self, lexicon=None):
+        if lexicon is None:
+            lexicon = en.sentiment
+            if dict.__len__(lexicon) == 0:
+                lexicon.load()
+
+        words = sorted(w for w in dict.keys(lexicon) if ' ' not in w)
+        entries = [dict.__getitem__(lexicon, w) for w in words]
+
+        self.vocabulary = pd.Index(words)
+        scores = np.array([entry[None] for entry in entries], dtype=np.float64).reshape(-1, 3)
+        self.polarity = scores[:, 0]
+        self.subjectivity = scores[:, 1]
+        self.intensity = scores[:, 2]
+        self.is_modifier = np.array(['RB' in entry for entry in entries], dtype=bool)
+        # Only "-ly" adverbs take a following negation ("really not good")
+        self.is_ly_modifier = self.is_modifier & np.array([w.endswith('ly') for w in words], dtype=bool)
+
+    def tokenize(self, texts: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tokenize a text column.
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (doc_ids, tokens) for every token in the column
+        """
+        tokens = [pattern_tokens(text) for text in pd.Series(texts, dtype=object).fillna('').astype(str)]
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        flat = np.fromiter(chain.from_iterable(tokens), dtype=object, count=int(lengths.sum()))
+        return np.repeat(np.arange(len(tokens)), lengths), flat
+
+    def score(self, texts: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a text column.
+
+        Parameters:
+        -----------
+        texts : Iterable
+            Texts to analyze
+
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (polarity, subjectivity) arrays aligned with the input
+        """
+        texts = pd.Series(texts, dtype=object)
+        n_docs = len(texts)
+        doc_ids, flat = self.tokenize(texts)
+        n_tokens = len(flat)
+        if n_tokens == 0:
+            return np.zeros(n_docs), np.zeros(n_docs)
+
+        # Token attributes are computed once per distinct token
+        codes, uniques = pd.factorize(flat)
+        uniques = uniques.astype(object)
+        unique_ids = self.vocabulary.get_indexer(uniques)
+        token_ids = unique_ids[codes]
+        known = token_ids >= 0
+        lookup = np.where(known, token_ids, 0)
+
+        def attribute(func, dtype=bool) -> np.ndarray:
+            return np.array([func(w) for w in uniques], dtype=dtype)[codes]
+
+        unknown = ~known
+        negation = unknown & attribute(lambda w: w in NEGATIONS)
+        clears_negation = unknown & ~negation & attribute(lambda w: len(w.strip("'")) > 1)
+        long_word = unknown & attribute(lambda w: len(w) > 2)
+        exclamation = unknown & attribute(lambda w: w == '!')
+        irony = unknown & attribute(lambda w: w == '(!)')
+        emoticon_polarity = attribute(
+            lambda w: _EMOTICON_POLARITY.get(w, np.nan)
+            if not w.isalpha() and len(w) <= 5 and w not in PUNCTUATION else np.nan,
+            dtype=np.float64,
+        )
+        emoticon = unknown & ~np.isnan(emoticon_polarity)
+
+        doc_start = np.searchsorted(doc_ids, doc_ids, side='left')
+        modifier = known & self.is_modifier[lookup]
+        ly_modifier = known & self.is_ly_modifier[lookup]
+
+        # Pending modifier (m in pattern): the last known word is an adverb and
+        # no longer unknown word came after it. A negation right after a "-ly"
+        # adverb is attached to the adverb's assessment instead of resetting it.
+        last_known = _last_before(known, doc_start)
+        safe_last = np.maximum(last_known, 0)
+        after_ly = (last_known >= 0) & ly_modifier[safe_last]
+        resets_modifier = long_word & ~(negation & after_ly)
+        modifier_pending = ((last_known >= 0) & modifier[safe_last]
+                            & (_last_before(resets_modifier, doc_start) < last_known))
+        absorbed = negation & modifier_pending & after_ly
+
+        # Pending negation (n in pattern): set by a negation word, kept across
+        # one-letter tokens, cleared by known words and longer unknown words
+        sets_negation = negation & ~absorbed
+        clears = known | clears_negation | absorbed
+        negated = known & (_last_before(sets_negation, doc_start) > _last_before(clears, doc_start))
+
+        # Assessments start at known words without a pending modifier, and at
+        # emoticons and "(!)"; a modified word rewrites the latest assessment
+        starts = (known & ~modifier_pending) | emoticon | irony
+        assessment = np.cumsum(starts) - 1
+        latest_start = np.where(starts, np.arange(n_tokens), _last_before(starts, doc_start))
+        has_assessment = latest_start >= 0
+
+        polarity = np.where(known, self.polarity[lookup], np.where(emoticon, emoticon_polarity, 0.0))
+        subjectivity = np.where(known, self.subjectivity[lookup], 1.0)
+        raw_intensity = np.where(known, self.intensity[lookup], 1.0)
+        intensity = np.where(negated, 1.0 / raw_intensity, raw_intensity)
+
+        # A modified word is scaled by the intensity of the assessment it
+        # rewrites: the previous known word, unless an emoticon came between
+        members = known & modifier_pending
+        scale = np.where(latest_start > last_known, 1.0, intensity[safe_last])
+        polarity = np.where(members, np.clip(polarity * scale, -1.0, 1.0), polarity)
+        subjectivity = np.where(members, np.clip(subjectivity * scale, -1.0, 1.0), subjectivity)
+
+        # Each assessment keeps the scores of its last writer
+        writers = np.flatnonzero(starts | members)
+        writer_assessment = assessment[writers]
+        last_writer = writers[np.append(writer_assessment[1:] != writer_assessment[:-1], True)]
+        n_assessments = len(last_writer)
+        final_polarity = polarity[last_writer]
+        final_subjectivity = subjectivity[last_writer]
+
+        is_negated = np.zeros(n_assessments, dtype=bool)
+        is_negated[assessment[negated]] = True
+        is_negated[assessment[absorbed & has_assessment]] = True
+
+        # Exclamation marks after the last writer boost the assessment by 1.25 each
+        boosts = exclamation & has_assessment
+        boosts &= np.arange(n_tokens) > last_writer[np.maximum(assessment, 0)]
+        boost_count = np.bincount(assessment[boosts], minlength=n_assessments)
+        final_polarity = np.clip(final_polarity * 1.25 ** boost_count, -1.0, 1.0)
+
+        # "not good" = slightly bad, "not bad" = slightly good
+        final_polarity = np.where(is_negated, final_polarity * -0.5, final_polarity)
+
+        assessment_doc = doc_ids[last_writer]
+        counts = np.bincount(assessment_doc, minlength=n_docs)
+        denominator = np.maximum(counts, 1).astype(np.float64)
+        return (np.bincount(assessment_doc, weights=final_polarity, minlength=n_docs) / denominator,
+                np.bincount(assessment_doc, weights=final_subjectivity, minlength=n_docs) / denominator)
+
+
+@lru_cache(maxsize=1)
+def get_lexicon_scorer() -> LexiconSentimentScorer:
+    """Return a shared scorer so the lexicon is only loaded once per process."""
+    return LexiconSentimentScorer()
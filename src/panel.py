@@ -0,0 +1,316 @@
+"""
+Stock-Date Panel Utility Functions
+
+This module provides a panel structure that keeps (stock, date) rows sorted
+by a single integer key, with the stock code in the high 32 bits and the
+calendar day in the low 32 bits. Panels are sorted once when they are
+built. After that, returns are computed within the stock blocks, and two
+panels are aligned with `searchsorted` merge-joins (exact or as-of) that
+only gather the rows they output.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .trading_calendar import TradingCalendar
+
+
+# Offset keeping day numbers (days since 1970-01-01) positive in 32 bits
+_DAY_OFFSET = 2 ** 31
+_DAY_MASK = 2 ** 32 - 1
+
+
+def _calendar_days(dates) -> np.ndarray:
+    """Days since the epoch of each date (local calendar day for tz-aware values)."""
+    dates = pd.to_datetime(pd.Series(dates).reset_index(drop=True))
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').view(np.int64)
+
+
+def _gather_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenate `arange(start, start + count)` for every (start, count) pair."""
+    total = int(counts.sum())
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + np.arange(total) - offsets
+
+
+class StockDatePanel:
+    """
+    Rows keyed by (stock, calendar day) and kept sorted by that key.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Data with stock and date columns
+    stock_col : str
+        Name of stock column
+    date_col : str
+        Name of date column; dates are matched by calendar day
+    stocks : Sequence, optional
+        Sorted stock vocabulary to code against (e.g. another panel's
+        `stocks`); rows of other stocks are dropped. Defaults to the sorted
+        stocks of `df`.
+
+    Attributes:
+    -----------
+    frame : pd.DataFrame
+        Rows sorted by (stock, date), with a RangeIndex and the date column
+        normalized to the calendar day
+    keys : np.ndarray
+        Sorted int64 (stock, day) keys, one per row of `frame`
+    stocks : pd.Index
+        Stock label of every stock code
+    """
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 stock_col: str = 'stock',
+                 date_col: str = 'date',
+                 stocks: Optional[Sequence] = None):
+        self.stock_col = stock_col
+        self.date_col = date_col
+
+        if stocks is None:
+            codes, uniques = pd.factorize(df[stock_col], sort=True)
+            self.stocks = pd.Index(uniques)
+        else:
+            self.stocks = pd.Index(stocks)
+            codes = self.stocks.get_indexer(df[stock_col])
+
+        days = _calendar_days(df[date_col])
+        valid = (codes >= 0) & (days != np.iinfo(np.int64).min)
+        keys = (codes.astype(np.int64) << 32) | (days + _DAY_OFFSET)
+
+        rows = np.flatnonzero(valid)
+        if len(rows) > 1 and (np.diff(keys[rows]) < 0).any():
+            order = rows[np.argsort(keys[rows], kind='stable')]
+        else:
+            order = rows
+        self.keys = keys[order]
+
+        frame = df.take(order)
+        frame.index = pd.RangeIndex(len(frame))
+        frame[date_col] = (self.days - _DAY_OFFSET).astype('datetime64[D]').astype('datetime64[ns]')
+        self.frame = frame
+
+    @classmethod
+    def _from_sorted(cls, frame: pd.DataFrame, keys: np.ndarray, stocks: pd.Index,
+                     stock_col: str, date_col: str) -> 'StockDatePanel':
+        panel = cls.__new__(cls)
+        panel.frame, panel.keys, panel.stocks = frame, keys, stocks
+        panel.stock_col, panel.date_col = stock_col, date_col
+        return panel
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def stock_codes(self) -> np.ndarray:
+        return self.keys >> 32
+
+    @property
+    def days(self) -> np.ndarray:
+        return self.keys & _DAY_MASK
+
+    @property
+    def is_unique(self) -> bool:
+        """Whether every (stock, date) key occurs once."""
+        return bool(len(self.keys) < 2 or (np.diff(self.keys) > 0).all())
+
+    def block_starts(self) -> np.ndarray:
+        """Row where each stock's block starts (length len(stocks) + 1)."""
+        return np.searchsorted(self.keys, np.arange(len(self.stocks) + 1, dtype=np.int64) << 32)
+
+    def with_returns(self, price_col: str = 'close') -> 'StockDatePanel':
+        """
+        Add 'daily_return' and 'log_return' (in percent, as in
+        `calculate_daily_returns`) computed within each stock block.
+        """
+        codes = self.stock_codes
+        block_start = np.ones(len(codes), dtype=bool)
+        block_start[1:] = codes[1:] != codes[:-1]
+
+        def previous(values: np.ndarray) -> np.ndarray:
+            shifted = np.concatenate([[np.nan], values[:-1]])
+            shifted[block_start] = np.nan
+            return shifted
+
+        prices = self.frame[price_col].to_numpy(dtype=np.float64)
+        # pct_change forward-fills missing prices within each stock
+        filled = pd.Series(prices).groupby(codes).ffill().to_numpy()
+
+        frame = self.frame.assign(
+            daily_return=(filled / previous(filled) - 1) * 100,
+            log_return=np.log(prices / previous(prices)) * 100,
+        )
+        return self._from_sorted(frame, self.keys, self.stocks, self.stock_col, self.date_col)
+
+    def _recoded_keys(self, other: 'StockDatePanel') -> np.ndarray:
+        """`other`'s keys expressed in this panel's stock codes (-1 where unknown)."""
+        if other.stocks.equals(self.stocks):
+            return other.keys
+        mapping = self.stocks.get_indexer(other.stocks)
+        codes = mapping[other.stock_codes]
+        return np.where(codes >= 0, (codes.astype(np.int64) << 32) | other.days, -1)
+
+    def _combine(self, other: 'StockDatePanel', left_rows: np.ndarray, right_rows: np.ndarray,
+                 suffixes: Tuple[str, str], extra: Optional[dict] = None) -> pd.DataFrame:
+        left = self.frame.take(left_rows)
+        right_cols = [col for col in other.frame.columns if col not in (other.stock_col, other.date_col)]
+
+        overlap = set(left.columns).intersection(right_cols)
+        left.columns = [f"{col}{suffixes[0]}" if col in overlap else col for col in left.columns]
+        left.index = pd.RangeIndex(len(left))
+
+        matched = right_rows >= 0
+        columns = {}
+        for col in right_cols:
+            values = other.frame[col].to_numpy()
+            if matched.all():
+                taken = values[right_rows]
+            else:
+                taken = pd.Series(values).reindex(np.where(matched, right_rows, -1)).to_numpy()
+            columns[f"{col}{suffixes[1]}" if col in overlap else col] = taken
+        if extra:
+            columns.update(extra)
+
+        return pd.concat([left, pd.DataFrame(columns, index=left.index)], axis=1)
+
+    def join(self, other: 'StockDatePanel', how: str = 'inner',
+             suffixes: Tuple[str, str] = ('_x', '_y')) -> pd.DataFrame:
+        """
+        Merge-join with another panel on (stock, date).
+
+        Parameters:
+        -----------
+        other : StockDatePanel
+            Panel to join
+        how : str
+            'inner' or 'left'
+        suffixes : Tuple[str, str]
+            Suffixes for overlapping column names, as in `pd.merge`
+
+        Returns:
+        --------
+        pd.DataFrame
+            This panel's columns followed by `other`'s, sorted by (stock, date)
+        """
+        if how not in ('inner', 'left'):
+            raise ValueError(f"how must be 'inner' or 'left', got '{how}'")
+
+        other_keys = self._recoded_keys(other)
+        known = np.flatnonzero(other_keys >= 0)
+        if len(known) < len(other_keys):
+            order = known[np.argsort(other_keys[known], kind='stable')]
+            other_keys = other_keys[order]
+        else:
+            order = None
+
+        starts = np.searchsorted(other_keys, self.keys, side='left')
+        counts = np.searchsorted(other_keys, self.keys, side='right') - starts
+        if how == 'left':
+            unmatched = counts == 0
+            counts = np.where(unmatched, 1, counts)
+
+        left_rows = np.repeat(np.arange(len(self.keys)), counts)
+        right_rows = _gather_ranges(starts, counts)
+        if how == 'left':
+            right_rows[np.repeat(unmatched, counts)] = -1
+        if order is not None:
+            right_rows = np.where(right_rows >= 0, order[np.clip(right_rows, 0, None)], -1)
+
+        return self._combine(other, left_rows, right_rows, suffixes)
+
+    def join_asof(self, other: 'StockDatePanel', direction: str = 'forward',
+                  tolerance: Optional[int] = None, allow_exact_matches: bool = True,
+                  suffixes: Tuple[str, str] = ('_x', '_y')) -> pd.DataFrame:
+        """
+        Align each row with the nearest date of the same stock in `other`.
+
+        With `direction='forward'`, news dated on a weekend or holiday (or
+        shifted past the close, see `effective_dates`) is mapped to the next
+        trading day present in `other`.
+
+        Parameters:
+        -----------
+        other : StockDatePanel
+            Panel to align to; its keys must be unique
+        direction : str
+            'forward' (next date on or after) or 'backward' (last date on or before)
+        tolerance : int, optional
+            Maximum distance in calendar days
+        allow_exact_matches : bool
+            If False, only strictly later/earlier dates match
+        suffixes : Tuple[str, str]
+            Suffixes for overlapping column names
+
+        Returns:
+        --------
+        pd.DataFrame
+            This panel's rows with a matched `aligned_<date_col>` column and
+            `other`'s columns (NaN where nothing matches)
+        """
+        if direction not in ('forward', 'backward'):
+            raise ValueError(f"direction must be 'forward' or 'backward', got '{direction}'")
+        if not other.is_unique:
+            raise ValueError('join_asof needs unique (stock, date) keys in the right panel')
+
+        other_keys = self._recoded_keys(other)
+        order = None
+        if (other_keys < 0).any() or not other.stocks.equals(self.stocks):
+            known = np.flatnonzero(other_keys >= 0)
+            order = known[np.argsort(other_keys[known], kind='stable')]
+            other_keys = other_keys[order]
+
+        if direction == 'forward':
+            side = 'left' if allow_exact_matches else 'right'
+            rows = np.searchsorted(other_keys, self.keys, side=side)
+            in_range = rows < len(other_keys)
+        else:
+            side = 'right' if allow_exact_matches else 'left'
+            rows = np.searchsorted(other_keys, self.keys, side=side) - 1
+            in_range = rows >= 0
+
+        candidate = other_keys[np.clip(rows, 0, max(len(other_keys) - 1, 0))] if len(other_keys) else self.keys
+        matched = in_range & ((candidate >> 32) == self.stock_codes)
+        if tolerance is not None:
+            matched &= np.abs((candidate & _DAY_MASK) - self.days) <= tolerance
+
+        right_rows = np.where(matched, rows, -1)
+        aligned = np.where(matched, (candidate & _DAY_MASK) - _DAY_OFFSET, np.iinfo(np.int64).min)
+        if order is not None:
+            right_rows = np.where(matched, order[np.clip(right_rows, 0, None)], -1)
+
+        extra = {f"aligned_{self.date_col}": aligned.astype('datetime64[D]').astype('datetime64[ns]')}
+        return self._combine(other, np.arange(len(self.keys)), right_rows, suffixes, extra)
+
+
+def effective_dates(timestamps, cutoff: Optional[str] = '16:00', tz: Optional[str] = 'America/New_York') -> pd.Series:
+    """
+    Calendar day on which news can first affect prices.
+
+    Timestamps are converted to the exchange time zone. Anything published
+    at or after `cutoff` counts for the following day. Use this with
+    `StockDatePanel.join_asof` and `direction='forward'` to map after-hours
+    and weekend news to the next trading day. This is
+    `TradingCalendar.effective_dates` without a session calendar.
+
+    Parameters:
+    -----------
+    timestamps : array-like
+        Publication times (naive values are taken as UTC)
+    cutoff : str, optional
+        Local time of the market close as 'HH:MM' (None keeps the calendar day)
+    tz : str, optional
+        Exchange time zone (None keeps UTC)
+
+    Returns:
+    --------
+    pd.Series
+        Tz-naive dates (midnight, NaT for unparseable timestamps)
+    """
+    calendar = TradingCalendar(sessions=(), tz=tz or 'UTC', cutoff=cutoff)
+    return calendar.effective_dates(timestamps)
@@ -0,0 +1,255 @@
+"""
+Partitioned Correlation Utility Functions
+
+This module runs the correlation analysis on panels larger than memory.
+Rows are streamed in chunks and hash-partitioned by stock into Parquet files
+on disk, so that every stock lives in exactly one partition. The partitions
+are then processed one at a time, optionally by a local process pool:
+
+- per-stock results are computed exactly inside the partition that holds
+  the stock, with the in-memory functions of `correlation_analysis`;
+- pooled results are reduced from per-partition sufficient statistics
+  (count, means and centered second moments), merged with the pairwise
+  update of Chan et al., which stays accurate for large sums.
+"""
+
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .correlation_analysis import (
+    _lagged_pairs,
+    _pearson_p_values,
+    analyze_correlation_by_stock,
+    analyze_lag_correlation,
+)
+
+
+# Columns of a moments array: count, mean x, mean y, Σ(dx²), Σ(dy²), Σ(dx·dy)
+_N, _MEAN_X, _MEAN_Y, _M2_X, _M2_Y, _C_XY = range(6)
+
+
+def _moments(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Sufficient statistics of the Pearson correlation of x and y."""
+    n = len(x)
+    if n == 0:
+        return np.zeros(6)
+    mean_x, mean_y = x.mean(), y.mean()
+    dx, dy = x - mean_x, y - mean_y
+    return np.array([n, mean_x, mean_y, dx @ dx, dy @ dy, dx @ dy])
+
+
+def _merge_moments(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Combine the moments of two disjoint samples."""
+    n = a[_N] + b[_N]
+    if n == 0:
+        return np.zeros(6)
+    delta_x = b[_MEAN_X] - a[_MEAN_X]
+    delta_y = b[_MEAN_Y] - a[_MEAN_Y]
+    weight = a[_N] * b[_N] / n
+    return np.array([
+        n,
+        a[_MEAN_X] + delta_x * b[_N] / n,
+        a[_MEAN_Y] + delta_y * b[_N] / n,
+        a[_M2_X] + b[_M2_X] + delta_x * delta_x * weight,
+        a[_M2_Y] + b[_M2_Y] + delta_y * delta_y * weight,
+        a[_C_XY] + b[_C_XY] + delta_x * delta_y * weight,
+    ])
+
+
+def _moments_correlation(moments: np.ndarray) -> float:
+    """Pearson correlation from merged moments (NaN when undefined)."""
+    denominator = np.sqrt(moments[_M2_X] * moments[_M2_Y])
+    if moments[_N] < 2 or denominator == 0:
+        return np.nan
+    return float(np.clip(moments[_C_XY] / denominator, -1.0, 1.0))
+
+
+def _read_partition(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+
+def _partition_by_stock(path: Path, min_data_points: int, **columns) -> pd.DataFrame:
+    return analyze_correlation_by_stock(_read_partition(path), min_data_points=min_data_points, **columns)
+
+
+def _partition_lag_by_stock(path: Path, lags: List[int], **columns) -> pd.DataFrame:
+    return analyze_lag_correlation(_read_partition(path), lags=lags, by_stock=True, **columns)
+
+
+def _partition_lag_moments(path: Path, lags: List[int], stock_col: str, sentiment_col: str,
+                           returns_col: str, date_col: str) -> dict:
+    df = _read_partition(path)
+    codes = pd.factorize(df[stock_col])[0]
+    return {
+        lag: _moments(sentiment, returns)
+        for lag, _, sentiment, returns in _lagged_pairs(df, codes, sentiment_col, returns_col, date_col, lags)
+    }
+
+
+class PartitionedPanel:
+    """
+    Merged sentiment/returns panel stored on disk as stock-hash partitions.
+
+    Parameters:
+    -----------
+    directory : str or Path
+        Directory written by `PartitionedPanel.write`
+    stock_col, date_col, sentiment_col, returns_col : str
+        Column names, as in `analyze_correlation_by_stock`
+    n_workers : int
+        Number of worker processes used to process partitions (default: 1)
+    """
+
+    def __init__(self,
+                 directory: Union[str, Path],
+                 stock_col: str = 'stock',
+                 date_col: str = 'date',
+                 sentiment_col: str = 'avg_sentiment',
+                 returns_col: str = 'daily_return',
+                 n_workers: int = 1):
+        self.directory = Path(directory)
+        self.partitions = sorted(path for path in self.directory.glob('part-*') if path.is_dir())
+        self.stock_col = stock_col
+        self.date_col = date_col
+        self.sentiment_col = sentiment_col
+        self.returns_col = returns_col
+        self.n_workers = n_workers
+
+    @classmethod
+    def write(cls,
+              source: Union[str, Path, pd.DataFrame, Iterable[pd.DataFrame]],
+              directory: Union[str, Path],
+              n_partitions: int = 16,
+              stock_col: str = 'stock',
+              chunksize: int = 1_000_000,
+              overwrite: bool = False,
+              **kwargs) -> 'PartitionedPanel':
+        """
+        Stream a panel into stock-hash partitions on disk.
+
+        Parameters:
+        -----------
+        source : str, Path, pd.DataFrame or iterable of pd.DataFrame
+            CSV file (read in chunks of `chunksize` rows), a DataFrame or
+            an iterable of DataFrame chunks
+        directory : str or Path
+            Output directory; one `part-NNNN` subdirectory of Parquet files
+            is written per partition
+        n_partitions : int
+            Number of partitions; pick it so that one partition fits in memory
+        stock_col : str
+            Name of stock column used as the partition key
+        chunksize : int
+            Rows per chunk when reading a CSV file
+        overwrite : bool
+            Remove an existing `directory` first
+        **kwargs
+            Passed to the `PartitionedPanel` constructor
+
+        Returns:
+        --------
+        PartitionedPanel
+            Panel over the written partitions
+        """
+        directory = Path(directory)
+        if directory.exists():
+            if not overwrite:
+                raise FileExistsError(f"{directory} already exists (pass overwrite=True to replace it)")
+            shutil.rmtree(directory)
+
+        if isinstance(source, (str, Path)):
+            chunks = pd.read_csv(source, chunksize=chunksize)
+        elif isinstance(source, pd.DataFrame):
+            chunks = [source]
+        else:
+            chunks = source
+
+        for chunk_id, chunk in enumerate(chunks):
+            # Hashes depend only on the stock value, so a stock always lands
+            # in the same partition whichever chunk it appears in
+            hashes = pd.util.hash_pandas_object(chunk[stock_col], index=False).to_numpy()
+            partition_ids = (hashes % np.uint64(n_partitions)).astype(np.int64)
+            order = np.argsort(partition_ids, kind='stable')
+            bounds = np.searchsorted(partition_ids[order], np.arange(n_partitions + 1))
+
+            for partition in range(n_partitions):
+                rows = order[bounds[partition]:bounds[partition + 1]]
+                if len(rows) == 0:
+                    continue
+                partition_dir = directory / f"part-{partition:04d}"
+                partition_dir.mkdir(parents=True, exist_ok=True)
+                chunk.take(rows).to_parquet(partition_dir / f"chunk-{chunk_id:06d}.parquet", index=False)
+
+        return cls(directory, stock_col=stock_col, **kwargs)
+
+    def _columns(self) -> dict:
+        return {
+            'stock_col': self.stock_col,
+            'sentiment_col': self.sentiment_col,
+            'returns_col': self.returns_col,
+        }
+
+    def map_partitions(self, func: Callable[[Path], object]) -> list:
+        """
+        Apply `func` to the path of every partition.
+
+        `func` must be picklable (a module-level function or a `partial` of
+        one) when `n_workers > 1`.
+        """
+        if self.n_workers > 1 and len(self.partitions) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(self.partitions))) as executor:
+                return list(executor.map(func, self.partitions))
+        return [func(path) for path in self.partitions]
+
+    def correlation_by_stock(self, min_data_points: int = 10) -> pd.DataFrame:
+        """
+        Out-of-core `analyze_correlation_by_stock`.
+
+        Every stock is held by one partition, so per-stock coefficients and
+        p-values are computed exactly there and the partitions only need to
+        be concatenated.
+        """
+        results = self.map_partitions(partial(_partition_by_stock, min_data_points=min_data_points,
+                                              **self._columns()))
+        results = [result for result in results if not result.empty]
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results, ignore_index=True).sort_values('Pearson_Correlation', ascending=False)
+
+    def lag_correlation(self, lags: Iterable[int] = range(-2, 3), by_stock: bool = False) -> pd.DataFrame:
+        """
+        Out-of-core `analyze_lag_correlation`.
+
+        With `by_stock=False`, each partition returns the moments of every
+        lag and the pooled coefficients are computed from their merge.
+        """
+        lags = list(lags)
+        if by_stock:
+            results = self.map_partitions(partial(_partition_lag_by_stock, lags=lags,
+                                                  date_col=self.date_col, **self._columns()))
+            results = [result for result in results if not result.empty]
+            if not results:
+                return pd.DataFrame()
+            return pd.concat(results, ignore_index=True).sort_values(['Stock', 'Lag'])
+
+        totals = {lag: np.zeros(6) for lag in lags}
+        for partition_moments in self.map_partitions(partial(_partition_lag_moments, lags=lags,
+                                                             date_col=self.date_col, **self._columns())):
+            for lag, moments in partition_moments.items():
+                totals[lag] = _merge_moments(totals[lag], moments)
+
+        rows = [(lag, _moments_correlation(totals[lag]), int(totals[lag][_N]))
+                for lag in lags if totals[lag][_N] > 10]
+        if not rows:
+            return pd.DataFrame()
+
+        result = pd.DataFrame(rows, columns=['Lag', 'Correlation', 'Data_Points'])
+        result.insert(2, 'P_Value', _pearson_p_values(result['Correlation'].to_numpy(),
+                                                      result['Data_Points'].to_numpy()))
+        return result.sort_values('Lag')
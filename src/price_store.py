@@ -0,0 +1,169 @@
+"""
+Local Price Store
+
+This module provides a columnar (Parquet) store for downloaded OHLCV data,
+partitioned by ticker. Each partition records which date ranges have
+already been fetched, so later requests only download the missing gaps and
+read the requested range back with predicate pushdown.
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, List, Tuple, Union
+
+import pandas as pd
+
+
+Fetcher = Callable[[str, pd.Timestamp, pd.Timestamp], pd.DataFrame]
+Interval = Tuple[pd.Timestamp, pd.Timestamp]
+
+# Column holding the tz-naive session date; used for coverage and filtering
+_SESSION_COL = '_session'
+
+
+def _to_session(value) -> pd.Timestamp:
+    """Convert a date-like value to a tz-naive midnight timestamp."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.normalize()
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Merge overlapping or adjacent half-open [start, end) intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_intervals(start: pd.Timestamp, end: pd.Timestamp, covered: List[Interval]) -> List[Interval]:
+    """Return the parts of [start, end) that are not in `covered`."""
+    gaps = []
+    cursor = start
+    for cov_start, cov_end in merge_intervals(covered):
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, min(cov_start, end)))
+        cursor = max(cursor, cov_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class PriceStore:
+    """
+    Parquet price store partitioned by ticker.
+
+    Layout::
+
+        root/
+            ticker=AAPL/
+                prices.parquet
+                coverage.json
+
+    Parameters:
+    -----------
+    root : str or Path
+        Root directory of the store
+    fetcher : callable
+        Function `(ticker, start, end) -> DataFrame` returning OHLCV rows
+        with a 'date' column for the half-open range [start, end)
+    """
+
+    def __init__(self, root: Union[str, Path], fetcher: Fetcher):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.fetcher = fetcher
+
+    def partition(self, ticker: str) -> Path:
+        """Directory holding the data of one ticker."""
+        return self.root / f"ticker={ticker}"
+
+    def coverage(self, ticker: str) -> List[Interval]:
+        """Date ranges [start, end) already fetched for a ticker."""
+        path = self.partition(ticker) / 'coverage.json'
+        if not path.exists():
+            return []
+        with open(path) as f:
+            return [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in json.load(f)]
+
+    def ensure(self, ticker: str, start_date, end_date) -> int:
+        """
+        Fetch the parts of [start_date, end_date) that are not stored yet.
+
+        Ranges are only marked as covered up to today, so the current
+        (possibly incomplete) session is fetched again on the next call.
+
+        Returns:
+        --------
+        int
+            Number of rows fetched
+        """
+        start, end = _to_session(start_date), _to_session(end_date)
+        covered = self.coverage(ticker)
+        gaps = missing_intervals(start, end, covered)
+        if not gaps:
+            return 0
+
+        fetched = []
+        today = _to_session(pd.Timestamp.now())
+        for gap_start, gap_end in gaps:
+            df = self.fetcher(ticker, gap_start, gap_end)
+            if df is not None and not df.empty:
+                fetched.append(df)
+            if gap_start < today:
+                covered.append((gap_start, min(gap_end, today)))
+
+        if fetched:
+            self._append(ticker, pd.concat(fetched, ignore_index=True))
+        self._write_coverage(ticker, covered)
+
+        return sum(len(df) for df in fetched)
+
+    def load(self, ticker: str, start_date, end_date) -> pd.DataFrame:
+        """
+        Read the stored rows of [start_date, end_date) for a ticker, pushing
+        the date filter down to the Parquet reader.
+        """
+        path = self.partition(ticker) / 'prices.parquet'
+        if not path.exists():
+            return pd.DataFrame()
+
+        df = pd.read_parquet(path, filters=[
+            (_SESSION_COL, '>=', _to_session(start_date)),
+            (_SESSION_COL, '<', _to_session(end_date)),
+        ])
+        return df.drop(columns=_SESSION_COL).reset_index(drop=True)
+
+    def get(self, ticker: str, start_date, end_date) -> pd.DataFrame:
+        """Fetch any missing gaps, then load [start_date, end_date)."""
+        self.ensure(ticker, start_date, end_date)
+        return self.load(ticker, start_date, end_date)
+
+    def _append(self, ticker: str, df: pd.DataFrame) -> None:
+        df = df.copy()
+        sessions = pd.to_datetime(df['date'])
+        if sessions.dt.tz is not None:
+            sessions = sessions.dt.tz_localize(None)
+        df[_SESSION_COL] = sessions.dt.normalize().astype('datetime64[ns]')
+
+        path = self.partition(ticker) / 'prices.parquet'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            df = pd.concat([pd.read_parquet(path), df], ignore_index=True)
+
+        df = df.drop_duplicates(_SESSION_COL, keep='last').sort_values(_SESSION_COL)
+        df.to_parquet(path, index=False)
+
+    def _write_coverage(self, ticker: str, covered: List[Interval]) -> None:
+        path = self.partition(ticker) / 'coverage.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump([[start.isoformat(), end.isoformat()] for start, end in merge_intervals(covered)], f)
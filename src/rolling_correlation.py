@@ -0,0 +1,231 @@
+"""
+Rolling Correlation Utility Functions
+
+This module computes time-varying sentiment/return correlations. The panel
+is laid out as (date x stock) matrices, and every window correlation comes
+from differences of cumulative sums of n, Σx, Σy, Σx², Σy² and Σxy. Each
+date therefore costs O(1) per stock, whatever the window length. Values are
+centered first (per stock, or on the pooled mean) so that the differences
+of large sums do not lose precision. `StreamingCorrelation` maintains the
+same sums incrementally, as each new day arrives.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Stocks processed at a time, bounding the (dates x stocks) temporaries
+_STOCK_BLOCK = 512
+
+
+def _correlation_from_sums(n, sx, sy, sxx, syy, sxy, min_periods: int) -> np.ndarray:
+    """Pearson correlation from raw window sums (NaN below `min_periods` or for constant windows)."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = np.clip((sxy - sx * sy / n) / np.sqrt(var_x * var_y), -1.0, 1.0)
+    # A constant window has zero variance up to the rounding of the sums
+    constant = (var_x <= 1e-10 * sxx) | (var_y <= 1e-10 * syy)
+    r[(n < max(min_periods, 2)) | constant | ~np.isfinite(r)] = np.nan
+    return r
+
+
+def _window_sums(values: np.ndarray, window: Optional[int]) -> np.ndarray:
+    """Sums over the trailing `window` rows (all rows so far if None) via cumulative sums."""
+    cumulative = np.cumsum(values, axis=0)
+    if window is None or window >= len(values):
+        return cumulative
+    sums = cumulative.copy()
+    sums[window:] -= cumulative[:-window]
+    return sums
+
+
+def _panel_matrices(df: pd.DataFrame, stock_col: str, date_col: str, sentiment_col: str,
+                    returns_col: str) -> Tuple[np.ndarray, np.ndarray, pd.Index, pd.Index]:
+    """(date x stock) sentiment and return matrices, NaN where a pair is missing."""
+    date_codes, dates = pd.factorize(pd.to_datetime(df[date_col]), sort=True)
+    stock_codes, stocks = pd.factorize(df[stock_col], sort=True)
+    keep = (date_codes >= 0) & (stock_codes >= 0)
+
+    cells = date_codes[keep] * len(stocks) + stock_codes[keep]
+    duplicated = np.bincount(cells, minlength=len(dates) * len(stocks)) > 1
+    if duplicated.any():
+        date_code, stock_code = divmod(int(np.argmax(duplicated)), len(stocks))
+        raise ValueError(
+            f"{int(duplicated.sum())} (date, stock) pairs have several rows, e.g. "
+            f"({dates[date_code]}, {stocks[stock_code]}); aggregate them first "
+            f"(e.g. with aggregate_daily_sentiment)"
+        )
+
+    x = np.full((len(dates), len(stocks)), np.nan)
+    y = np.full((len(dates), len(stocks)), np.nan)
+    x.flat[cells] = df[sentiment_col].to_numpy(dtype=np.float64)[keep]
+    y.flat[cells] = df[returns_col].to_numpy(dtype=np.float64)[keep]
+
+    # Only dates where both values are present count, as in `calculate_correlation`
+    missing = np.isnan(x) | np.isnan(y)
+    x[missing] = np.nan
+    y[missing] = np.nan
+    return x, y, pd.Index(dates, name=date_col), pd.Index(stocks, name=stock_col)
+
+
+def _rolling_block(x: np.ndarray, y: np.ndarray, window: Optional[int], min_periods: int) -> np.ndarray:
+    """Rolling correlations of the columns of x and y."""
+    valid = ~np.isnan(x)
+    with np.errstate(invalid='ignore'):
+        x = np.where(valid, x - np.nanmean(x, axis=0), 0.0)
+        y = np.where(valid, y - np.nanmean(y, axis=0), 0.0)
+
+    return _correlation_from_sums(
+        _window_sums(valid.astype(np.float64), window),
+        _window_sums(x, window), _window_sums(y, window),
+        _window_sums(x * x, window), _window_sums(y * y, window), _window_sums(x * y, window),
+        min_periods,
+    )
+
+
+def rolling_correlation(df: pd.DataFrame,
+                        window: Optional[int] = 60,
+                        min_periods: int = 10,
+                        pooled: bool = False,
+                        stock_col: str = 'stock',
+                        date_col: str = 'date',
+                        sentiment_col: str = 'avg_sentiment',
+                        returns_col: str = 'daily_return'):
+    """
+    Rolling or expanding Pearson correlation between sentiment and returns.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Merged sentiment and returns data (as from `merge_sentiment_returns`),
+        with at most one row per (date, stock); duplicates raise a ValueError
+    window : int, optional
+        Number of trailing panel dates per window; None gives an expanding
+        correlation over all dates so far
+    min_periods : int
+        Minimum (sentiment, return) pairs in a window for a coefficient
+    pooled : bool
+        If True, correlate all stocks' pairs in each window together
+    stock_col : str
+        Name of stock column
+    date_col : str
+        Name of date column
+    sentiment_col : str
+        Name of sentiment column
+    returns_col : str
+        Name of returns column
+
+    Returns:
+    --------
+    pd.DataFrame or pd.Series
+        (date x stock) correlation matrix, or a Series indexed by date if `pooled`
+    """
+    if window is not None and window < 1:
+        raise ValueError(f"window must be a positive integer or None, got {window}")
+
+    x, y, dates, stocks = _panel_matrices(df, stock_col, date_col, sentiment_col, returns_col)
+
+    if pooled:
+        valid = ~np.isnan(x)
+        with np.errstate(invalid='ignore'):
+            x = np.where(valid, x - np.nanmean(x), 0.0)
+            y = np.where(valid, y - np.nanmean(y), 0.0)
+        # Per-date totals over stocks, then the same running window sums
+        totals = np.column_stack([valid.sum(axis=1), x.sum(axis=1), y.sum(axis=1),
+                                  (x * x).sum(axis=1), (y * y).sum(axis=1), (x * y).sum(axis=1)])
+        sums = _window_sums(totals.astype(np.float64), window).T
+        return pd.Series(_correlation_from_sums(*sums, min_periods), index=dates, name='Correlation')
+
+    correlations = np.empty(x.shape)
+    for start in range(0, len(stocks), _STOCK_BLOCK):
+        block = slice(start, start + _STOCK_BLOCK)
+        correlations[:, block] = _rolling_block(x[:, block], y[:, block], window, min_periods)
+
+    return pd.DataFrame(correlations, index=dates, columns=stocks)
+
+
+class StreamingCorrelation:
+    """
+    Rolling or expanding correlation per stock, updated one day at a time.
+
+    Each update adds the new day's pairs to running sums and, for a rolling
+    window, subtracts the pairs leaving the window, which are kept in a ring
+    buffer. Every stock's values are shifted by its first observation to
+    keep the sums small, and the sums are rebuilt from the buffer once per
+    window to stop rounding errors from accumulating.
+
+    Parameters:
+    -----------
+    stocks : Sequence
+        Stocks tracked; other stocks in an update are ignored
+    window : int, optional
+        Number of days per window; None gives an expanding correlation
+    min_periods : int
+        Minimum pairs in a window for a coefficient
+    """
+
+    def __init__(self, stocks, window: Optional[int] = 60, min_periods: int = 10):
+        if window is not None and window < 1:
+            raise ValueError(f"window must be a positive integer or None, got {window}")
+
+        self.stocks = pd.Index(stocks)
+        self.window = window
+        self.min_periods = min_periods
+        self.n_days = 0
+
+        n_stocks = len(self.stocks)
+        self._shift_x = np.full(n_stocks, np.nan)
+        self._shift_y = np.full(n_stocks, np.nan)
+        self._sums = np.zeros((6, n_stocks))
+        if window is not None:
+            self._buffer = np.zeros((window, 6, n_stocks))
+
+    def _day_terms(self, sentiment, returns) -> np.ndarray:
+        """(6 x stocks) contributions of one day: 1, x, y, x², y², xy (zero where missing)."""
+        x = pd.Series(sentiment).reindex(self.stocks).to_numpy(dtype=np.float64)
+        y = pd.Series(returns).reindex(self.stocks).to_numpy(dtype=np.float64)
+        valid = ~(np.isnan(x) | np.isnan(y))
+
+        first = valid & np.isnan(self._shift_x)
+        self._shift_x[first] = x[first]
+        self._shift_y[first] = y[first]
+
+        x = np.where(valid, x - self._shift_x, 0.0)
+        y = np.where(valid, y - self._shift_y, 0.0)
+        return np.stack([valid.astype(np.float64), x, y, x * x, y * y, x * y])
+
+    def update(self, sentiment, returns) -> pd.Series:
+        """
+        Add one day and return the current correlations.
+
+        Parameters:
+        -----------
+        sentiment, returns : pd.Series
+            The day's values indexed by stock; missing stocks have no pair
+
+        Returns:
+        --------
+        pd.Series
+            Correlation per stock over the current window
+        """
+        terms = self._day_terms(sentiment, returns)
+
+        if self.window is None:
+            self._sums += terms
+        else:
+            slot = self.n_days % self.window
+            self._sums += terms - self._buffer[slot]
+            self._buffer[slot] = terms
+            if slot == self.window - 1:
+                self._sums = self._buffer.sum(axis=0)
+        self.n_days += 1
+
+        return self.correlations()
+
+    def correlations(self) -> pd.Series:
+        """Correlation per stock over the current window."""
+        return pd.Series(_correlation_from_sums(*self._sums, self.min_periods),
+                         index=self.stocks, name='Correlation')
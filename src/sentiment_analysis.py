@@ -4,10 +4,25 @@ Sentiment Analysis Utility Functions
 This module provides reusable functions for sentiment analysis on financial news.
 """
 
+import logging
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from textblob import TextBlob
-from typing import Tuple, Optional
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Optional, Union
+
+from .instrumentation import instrument
+from .lexicon_sentiment import get_lexicon_scorer
+from .sentiment_cache import SentimentCache
+from .signals import sentiment_categories
+from .trading_calendar import TradingCalendar
+
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_BACKENDS = ('textblob', 'lexicon')
 
 
 def analyze_sentiment_textblob(text: str) -> Tuple[float, float]:
@@ -29,11 +44,9 @@ def analyze_sentiment_textblob(text: str) -> Tuple[float, float]:
     if pd.isna(text) or text == '':
         return 0.0, 0.0
     
-    blob = TextBlob(str(text))
-    polarity = blob.sentiment.polarity
-    subjectivity = blob.sentiment.subjectivity
+    sentiment = TextBlob(str(text)).sentiment
     
-    return polarity, subjectivity
+    return sentiment.polarity, sentiment.subjectivity
 
 
 def classify_sentiment(polarity: float, threshold: float = 0.1) -> str:
@@ -60,13 +73,146 @@ def classify_sentiment(polarity: float, threshold: float = 0.1) -> str:
         return 'Neutral'
 
 
+def _score_chunk(texts: List, backend: str = 'textblob') -> np.ndarray:
+    """Score one chunk of texts, returning an (n, 2) polarity/subjectivity array."""
+    if backend == 'lexicon':
+        return np.column_stack(get_lexicon_scorer().score(texts))
+    
+    scores = np.empty((len(texts), 2), dtype=np.float64)
+    for i, text in enumerate(texts):
+        scores[i] = analyze_sentiment_textblob(text)
+    return scores
+
+
+@instrument
+def score_sentiment_batch(texts: Iterable,
+                          n_workers: int = 1,
+                          chunk_size: int = 10000,
+                          threshold: float = 0.1,
+                          backend: str = 'textblob') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score a batch of texts in chunks, optionally on a process pool.
+    
+    Produces the same scores as calling `analyze_sentiment_textblob` on each
+    text, but splits the input into chunks so they can be scored in parallel.
+    
+    Parameters:
+    -----------
+    texts : Iterable
+        Texts to analyze (e.g. a headline Series)
+    n_workers : int
+        Number of worker processes (default: 1, scores in the current process)
+    chunk_size : int
+        Number of texts per chunk sent to a worker
+    threshold : float
+        Threshold passed to `classify_sentiment` for the labels
+    backend : str
+        'textblob' (per-text TextBlob scoring) or 'lexicon' (vectorized
+        lexicon scorer, see `lexicon_sentiment`)
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        (polarity, subjectivity, label) arrays aligned with the input
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Backend must be one of {SENTIMENT_BACKENDS}, got {backend}")
+    
+    texts = list(texts)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    
+    score_chunk = partial(_score_chunk, backend=backend)
+    
+    if n_workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(chunks))) as executor:
+            results = list(executor.map(score_chunk, chunks))
+    else:
+        results = [score_chunk(chunk) for chunk in chunks]
+    
+    scores = np.vstack(results) if results else np.empty((0, 2), dtype=np.float64)
+    polarity = scores[:, 0]
+    subjectivity = scores[:, 1]
+    
+    return polarity, subjectivity, _classify_array(polarity, threshold)
+
+
+def _classify_array(polarity: np.ndarray, threshold: float = 0.1) -> np.ndarray:
+    """Array version of `classify_sentiment`, as plain string labels."""
+    return np.asarray(sentiment_categories(polarity, threshold, nan_label='Neutral'), dtype=object)
+
+
+@instrument
+def score_sentiment_cached(texts: pd.Series,
+                           cache: SentimentCache,
+                           n_workers: int = 1,
+                           chunk_size: int = 10000,
+                           threshold: float = 0.1,
+                           backend: str = 'textblob') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score texts through a `SentimentCache`, scoring only unseen headlines.
+    
+    Texts are deduplicated by their normalized content, looked up in the
+    cache, and only the misses are passed to `score_sentiment_batch`. New
+    scores are written back to the cache.
+    
+    Parameters:
+    -----------
+    texts : pd.Series
+        Texts to analyze
+    cache : SentimentCache
+        Cache used for lookups and write-back. Keys include `backend`, so
+        scores of different backends never mix.
+    n_workers : int
+        Number of worker processes used for the misses
+    chunk_size : int
+        Number of texts per scoring chunk
+    threshold : float
+        Threshold passed to `classify_sentiment` for the labels
+    backend : str
+        Scoring backend used for the misses ('textblob' or 'lexicon')
+    
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        (polarity, subjectivity, label) arrays aligned with the input
+    """
+    texts = pd.Series(texts).reset_index(drop=True)
+    keys = cache.keys_for(texts, backend)
+    unique_keys, first_idx, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    
+    scores = cache.get_many(unique_keys)
+    missing = np.isnan(scores[:, 0])
+    if missing.any():
+        polarity, subjectivity, _ = score_sentiment_batch(
+            texts.iloc[first_idx[missing]], n_workers=n_workers, chunk_size=chunk_size,
+            backend=backend
+        )
+        scores[missing, 0] = polarity
+        scores[missing, 1] = subjectivity
+        cache.put_many(unique_keys[missing], scores[missing])
+    
+    polarity = scores[inverse.ravel(), 0]
+    subjectivity = scores[inverse.ravel(), 1]
+    
+    return polarity, subjectivity, _classify_array(polarity, threshold)
+
+
+@instrument
 def aggregate_daily_sentiment(df: pd.DataFrame, 
                               stock_col: str = 'stock',
                               date_col: str = 'date',
-                              sentiment_col: str = 'sentiment_polarity') -> pd.DataFrame:
+                              sentiment_col: str = 'sentiment_polarity',
+                              calendar: Optional[TradingCalendar] = None,
+                              return_report: bool = False):
     """
     Aggregate sentiment by stock and date.
     If multiple articles for same stock on same day, calculate average sentiment.
+    With a `calendar`, articles are grouped by their effective trading session
+    instead of their calendar date, so after-close and weekend news is kept
+    and counted for the next session. Articles without a session are
+    dropped and logged as a warning.
     
     Parameters:
     -----------
@@ -78,15 +224,31 @@ def aggregate_daily_sentiment(df: pd.DataFrame,
         Name of date column
     sentiment_col : str
         Name of sentiment polarity column
+    calendar : TradingCalendar, optional
+        Exchange calendar used to align articles to trading sessions
+    return_report : bool
+        If True, also return the calendar alignment report (see
+        `TradingCalendar.align`; None without a calendar)
     
     Returns:
     --------
-    pd.DataFrame
-        Aggregated daily sentiment by stock and date
+    pd.DataFrame or Tuple[pd.DataFrame, Dict[str, int]]
+        Aggregated daily sentiment by stock and date, and the alignment
+        report if `return_report`
     """
     # Normalize date to date only
     df = df.copy()
-    df['date_only'] = pd.to_datetime(df[date_col]).dt.date
+    report = None
+    if calendar is not None:
+        df['date_only'], report = calendar.align(df[date_col])
+        dropped = report['dropped_invalid_timestamp'] + report['dropped_outside_calendar']
+        if dropped:
+            logger.warning("Dropped %d of %d articles without a trading session "
+                           "(%d invalid timestamps, %d outside the calendar)",
+                           dropped, report['articles'], report['dropped_invalid_timestamp'],
+                           report['dropped_outside_calendar'])
+    else:
+        df['date_only'] = pd.to_datetime(df[date_col]).dt.date
     
     # Aggregate
     daily_sentiment = df.groupby([stock_col, 'date_only']).agg({
@@ -98,11 +260,18 @@ def aggregate_daily_sentiment(df: pd.DataFrame,
     daily_sentiment.columns = [stock_col, 'date', 'avg_sentiment', 'article_count', 'avg_subjectivity']
     daily_sentiment['date'] = pd.to_datetime(daily_sentiment['date'])
     
+    if return_report:
+        return daily_sentiment, report
     return daily_sentiment
 
 
+@instrument
 def apply_sentiment_analysis(df: pd.DataFrame, 
-                            text_col: str = 'headline') -> pd.DataFrame:
+                            text_col: str = 'headline',
+                            n_workers: int = 1,
+                            chunk_size: int = 10000,
+                            cache: Optional[SentimentCache] = None,
+                            backend: str = 'textblob') -> pd.DataFrame:
     """
     Apply sentiment analysis to a DataFrame column.
     
@@ -112,6 +281,14 @@ def apply_sentiment_analysis(df: pd.DataFrame,
         DataFrame with text data
     text_col : str
         Name of text column to analyze
+    n_workers : int
+        Number of worker processes used for scoring (default: 1)
+    chunk_size : int
+        Number of rows scored per chunk
+    cache : SentimentCache, optional
+        Cache of previously scored headlines. Only cache misses are scored.
+    backend : str
+        'textblob' (default) or 'lexicon' for the vectorized lexicon scorer
     
     Returns:
     --------
@@ -121,12 +298,152 @@ def apply_sentiment_analysis(df: pd.DataFrame,
     df = df.copy()
     
     # Apply sentiment analysis
-    sentiment_results = df[text_col].apply(analyze_sentiment_textblob)
-    df['sentiment_polarity'] = [result[0] for result in sentiment_results]
-    df['sentiment_subjectivity'] = [result[1] for result in sentiment_results]
+    if cache is not None:
+        polarity, subjectivity, labels = score_sentiment_cached(
+            df[text_col], cache, n_workers=n_workers, chunk_size=chunk_size,
+            backend=backend
+        )
+    else:
+        polarity, subjectivity, labels = score_sentiment_batch(
+            df[text_col], n_workers=n_workers, chunk_size=chunk_size, backend=backend
+        )
+    df['sentiment_polarity'] = polarity
+    df['sentiment_subjectivity'] = subjectivity
     
     # Classify sentiment
-    df['sentiment_label'] = df['sentiment_polarity'].apply(classify_sentiment)
+    df['sentiment_label'] = labels
     
     return df
 
+
+def daily_sentiment_sums(df: pd.DataFrame,
+                         stock_col: str = 'stock',
+                         date_col: str = 'date',
+                         sentiment_col: str = 'sentiment_polarity') -> pd.DataFrame:
+    """
+    Compute additive per-(stock, date) sentiment accumulators.
+    
+    Unlike `aggregate_daily_sentiment`, the result can be summed across
+    chunks or days and converted into daily averages afterwards with
+    `sums_to_daily_sentiment`.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with sentiment data
+    stock_col : str
+        Name of stock column
+    date_col : str
+        Name of date column
+    sentiment_col : str
+        Name of sentiment polarity column
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame indexed by (stock, date) with 'sentiment_sum',
+        'article_count' and 'subjectivity_sum' columns
+    """
+    dates = pd.to_datetime(pd.to_datetime(df[date_col]).dt.date)
+    valid = df[sentiment_col].notna()
+    
+    frame = pd.DataFrame({
+        stock_col: df[stock_col].values,
+        'date': dates.values,
+        'sentiment_sum': df[sentiment_col].values,
+        'article_count': valid.values.astype(np.int64),
+        'subjectivity_sum': df['sentiment_subjectivity'].values,
+    })
+    
+    return frame.groupby([stock_col, 'date']).sum()
+
+
+def sums_to_daily_sentiment(sums: pd.DataFrame, stock_col: str = 'stock') -> pd.DataFrame:
+    """
+    Convert accumulators from `daily_sentiment_sums` into the
+    `aggregate_daily_sentiment` output format.
+    
+    Parameters:
+    -----------
+    sums : pd.DataFrame
+        Accumulators indexed by (stock, date)
+    stock_col : str
+        Name of stock column
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Aggregated daily sentiment by stock and date
+    """
+    sums = sums.sort_index()
+    counts = sums['article_count'].astype(np.int64)
+    
+    daily_sentiment = pd.DataFrame({
+        'avg_sentiment': sums['sentiment_sum'] / counts,
+        'article_count': counts,
+        'avg_subjectivity': sums['subjectivity_sum'] / counts,
+    }).reset_index()
+    daily_sentiment.columns = [stock_col, 'date', 'avg_sentiment', 'article_count', 'avg_subjectivity']
+    
+    return daily_sentiment
+
+
+@instrument
+def stream_daily_sentiment(news_file: Union[str, Path],
+                           chunksize: int = 100000,
+                           text_col: str = 'headline',
+                           stock_col: str = 'stock',
+                           date_col: str = 'date',
+                           n_workers: int = 1,
+                           cache: Optional[SentimentCache] = None,
+                           backend: str = 'textblob',
+                           read_csv_kwargs: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Score a news CSV chunk by chunk and aggregate daily sentiment.
+    
+    Equivalent to `aggregate_daily_sentiment(apply_sentiment_analysis(df))`
+    on the full file, but only one chunk of articles is held in memory at a
+    time; the running state is one row of sums per (stock, date).
+    
+    Parameters:
+    -----------
+    news_file : str or Path
+        Path to the raw news CSV
+    chunksize : int
+        Number of CSV rows read and scored per chunk
+    text_col : str
+        Name of text column to analyze
+    stock_col : str
+        Name of stock column
+    date_col : str
+        Name of date column
+    n_workers : int
+        Number of worker processes used for scoring
+    cache : SentimentCache, optional
+        Cache of previously scored headlines
+    backend : str
+        Scoring backend ('textblob' or 'lexicon')
+    read_csv_kwargs : dict, optional
+        Extra keyword arguments for `pd.read_csv`
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Aggregated daily sentiment by stock and date
+    """
+    read_csv_kwargs = dict(read_csv_kwargs or {})
+    read_csv_kwargs.setdefault('usecols', [text_col, stock_col, date_col])
+    
+    totals = None
+    for chunk in pd.read_csv(news_file, chunksize=chunksize, **read_csv_kwargs):
+        scored = apply_sentiment_analysis(
+            chunk, text_col=text_col, n_workers=n_workers, cache=cache, backend=backend
+        )
+        sums = daily_sentiment_sums(scored, stock_col=stock_col, date_col=date_col)
+        totals = sums if totals is None else totals.add(sums, fill_value=0)
+    
+    if totals is None:
+        return pd.DataFrame(columns=[stock_col, 'date', 'avg_sentiment',
+                                     'article_count', 'avg_subjectivity'])
+    
+    return sums_to_daily_sentiment(totals, stock_col=stock_col)
@@ -0,0 +1,219 @@
+"""
+Sentiment Cache
+
+This module provides a content-addressed cache for sentiment scores, keyed by
+a hash of the scoring backend and the normalized headline text. Scores are
+kept in an in-memory LRU layer, optionally backed by an on-disk SQLite store
+so that reruns and daily increments only score headlines that have not been
+seen before. Entries are tagged with the scorer version, which covers the
+TextBlob release and the rules of the lexicon backend.
+"""
+
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .lexicon_sentiment import SCORER_VERSION as LEXICON_SCORER_VERSION
+
+
+try:
+    _TEXTBLOB_VERSION = f"textblob-{version('textblob')}"
+except PackageNotFoundError:
+    _TEXTBLOB_VERSION = 'textblob'
+
+# The lexicon backend reads TextBlob's lexicon and adds rules of its own, so
+# a change to either must invalidate cached scores
+DEFAULT_SCORER_VERSION = f"{_TEXTBLOB_VERSION}+lexicon-{LEXICON_SCORER_VERSION}"
+
+# SQLite limits the number of host parameters in a single statement
+_SQLITE_BATCH_SIZE = 900
+
+
+def normalize_text(text) -> str:
+    """
+    Normalize a headline for cache lookups.
+
+    Collapses runs of whitespace only. Case is kept, as TextBlob scores
+    emoticons case-sensitively (":D" is positive, ":d" is not). Missing
+    values map to the empty string, which scores the same as a missing
+    headline.
+    """
+    if pd.isna(text):
+        return ''
+    return ' '.join(str(text).split())
+
+
+def text_key(text, backend: str = 'textblob') -> str:
+    """Return the cache key (SHA-1 hex digest) of the backend and normalized text."""
+    return hashlib.sha1(f"{backend}\0{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """
+    Two-level (memory LRU + SQLite) cache of (polarity, subjectivity) scores.
+
+    Keys include the scoring backend, so one cache can hold the scores of
+    several backends. Entries are stored together with the scorer version
+    that produced them; entries written by a different scorer version are
+    treated as misses and can be purged with `invalidate`.
+
+    Parameters:
+    -----------
+    path : str or Path, optional
+        SQLite database file. If None, only the in-memory layer is used.
+    max_memory_items : int
+        Maximum number of entries kept in the in-memory LRU layer
+    scorer_version : str
+        Identifier of the scorer whose results are cached
+    """
+
+    def __init__(self,
+                 path: Optional[Union[str, Path]] = None,
+                 max_memory_items: int = 100000,
+                 scorer_version: str = DEFAULT_SCORER_VERSION):
+        self.path = Path(path) if path is not None else None
+        self.max_memory_items = max_memory_items
+        self.scorer_version = scorer_version
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._conn = None
+
+        if self.path is not None:
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sentiment ('
+                'key TEXT PRIMARY KEY, version TEXT NOT NULL, '
+                'polarity REAL NOT NULL, subjectivity REAL NOT NULL)'
+            )
+            self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        if self._conn is None:
+            return len(self._memory)
+        return self._conn.execute(
+            'SELECT COUNT(*) FROM sentiment WHERE version = ?', (self.scorer_version,)
+        ).fetchone()[0]
+
+    def keys_for(self, texts: Iterable, backend: str = 'textblob') -> np.ndarray:
+        """Return the cache keys for a sequence of texts scored by `backend`."""
+        return np.array([text_key(text, backend) for text in texts], dtype=object)
+
+    def get_many(self, keys: Iterable[str]) -> np.ndarray:
+        """
+        Look up scores for a sequence of keys.
+
+        Returns:
+        --------
+        np.ndarray
+            (n, 2) array of (polarity, subjectivity); rows for missing keys are NaN
+        """
+        keys = list(keys)
+        scores = np.full((len(keys), 2), np.nan, dtype=np.float64)
+        pending: Dict[str, list] = {}
+
+        for i, key in enumerate(keys):
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                scores[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending and self._conn is not None:
+            pending_keys = list(pending)
+            for start in range(0, len(pending_keys), _SQLITE_BATCH_SIZE):
+                batch = pending_keys[start:start + _SQLITE_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(
+                    f'SELECT key, polarity, subjectivity FROM sentiment '
+                    f'WHERE version = ? AND key IN ({placeholders})',
+                    [self.scorer_version] + batch
+                ).fetchall()
+                for key, polarity, subjectivity in rows:
+                    scores[pending.pop(key)] = (polarity, subjectivity)
+                    self._remember(key, (polarity, subjectivity))
+
+        missed = sum(len(rows) for rows in pending.values())
+        self.misses += missed
+        self.hits += len(keys) - missed
+
+        return scores
+
+    def put_many(self, keys: Iterable[str], scores: np.ndarray) -> None:
+        """Store (polarity, subjectivity) rows for a sequence of keys."""
+        keys = list(keys)
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1, 2)
+        records = [(key, float(pol), float(subj)) for key, (pol, subj) in zip(keys, scores)]
+
+        for key, polarity, subjectivity in records:
+            self._remember(key, (polarity, subjectivity))
+
+        if self._conn is not None and records:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO sentiment (key, version, polarity, subjectivity) '
+                'VALUES (?, ?, ?, ?)',
+                [(key, self.scorer_version, pol, subj) for key, pol, subj in records]
+            )
+            self._conn.commit()
+
+    def invalidate(self, all_versions: bool = False) -> int:
+        """
+        Drop cached entries that were produced by another scorer version.
+
+        Parameters:
+        -----------
+        all_versions : bool
+            If True, drop every entry, including those of the current version
+
+        Returns:
+        --------
+        int
+            Number of on-disk entries removed
+        """
+        self._memory.clear()
+        if self._conn is None:
+            return 0
+
+        if all_versions:
+            cursor = self._conn.execute('DELETE FROM sentiment')
+        else:
+            cursor = self._conn.execute(
+                'DELETE FROM sentiment WHERE version != ?', (self.scorer_version,)
+            )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_items': len(self._memory),
+        }
+
+    def close(self) -> None:
+        """Close the on-disk store."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _remember(self, key: str, value) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
@@ -0,0 +1,280 @@
+"""
+Incremental Daily Sentiment Store
+
+This module provides a persistent SQLite store of per-(stock, date)
+sentiment accumulators. Each update only scores articles that are new or
+changed since the previous run and adjusts the affected (stock, date) cells,
+so a nightly job costs time proportional to the new data rather than the
+full history.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .sentiment_analysis import apply_sentiment_analysis, daily_sentiment_sums, sums_to_daily_sentiment
+from .sentiment_cache import SentimentCache
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_sums (
+    stock TEXT NOT NULL,
+    date TEXT NOT NULL,
+    sentiment_sum REAL NOT NULL,
+    article_count INTEGER NOT NULL,
+    subjectivity_sum REAL NOT NULL,
+    PRIMARY KEY (stock, date)
+);
+CREATE INDEX IF NOT EXISTS daily_sums_date ON daily_sums (date);
+CREATE TABLE IF NOT EXISTS articles (
+    article_key INTEGER PRIMARY KEY,
+    content_hash INTEGER NOT NULL,
+    stock TEXT NOT NULL,
+    date TEXT NOT NULL,
+    polarity REAL NOT NULL,
+    subjectivity REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _hash_columns(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """Row hashes of the given columns as signed 64-bit integers (SQLite INTEGER)."""
+    return pd.util.hash_pandas_object(df[list(columns)], index=False).to_numpy().view(np.int64)
+
+
+class DailySentimentStore:
+    """
+    Persistent per-(stock, date) sentiment aggregates with a watermark.
+
+    Articles are identified by a hash of `key_cols` (by default the article
+    URL and stock); a hash of `content_cols` detects articles whose headline
+    or timestamp changed. Unchanged articles are skipped, new ones are added
+    and changed ones replace their previous contribution.
+
+    Parameters:
+    -----------
+    path : str or Path
+        SQLite database file
+    text_col : str
+        Name of text column to analyze
+    stock_col : str
+        Name of stock column
+    date_col : str
+        Name of date column
+    key_cols : Sequence[str]
+        Columns identifying an article
+    content_cols : Sequence[str], optional
+        Columns whose change triggers rescoring (default: text and date columns)
+    """
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 text_col: str = 'headline',
+                 stock_col: str = 'stock',
+                 date_col: str = 'date',
+                 key_cols: Sequence[str] = ('url', 'stock'),
+                 content_cols: Optional[Sequence[str]] = None):
+        self.path = Path(path)
+        self.text_col = text_col
+        self.stock_col = stock_col
+        self.date_col = date_col
+        self.key_cols = list(key_cols)
+        self.content_cols = list(content_cols) if content_cols is not None else [text_col, date_col]
+
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def watermark(self) -> Optional[pd.Timestamp]:
+        """Latest (UTC) article timestamp ingested so far."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+        return pd.Timestamp(row[0]) if row and row[0] else None
+
+    def update(self,
+               df: pd.DataFrame,
+               lookback: Optional[pd.Timedelta] = pd.Timedelta(days=1),
+               n_workers: int = 1,
+               cache: Optional[SentimentCache] = None,
+               backend: str = 'textblob') -> Dict[str, int]:
+        """
+        Ingest a batch of articles.
+
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Raw news articles (may overlap with previously ingested ones)
+        lookback : pd.Timedelta, optional
+            Articles older than `watermark - lookback` are ignored without
+            being hashed. None considers every row (full reconciliation).
+        n_workers : int
+            Number of worker processes used for scoring
+        cache : SentimentCache, optional
+            Cache of previously scored headlines
+        backend : str
+            Scoring backend ('textblob' or 'lexicon')
+
+        Returns:
+        --------
+        Dict[str, int]
+            Counts of 'new', 'changed', 'unchanged' and 'skipped' articles
+        """
+        stats = {'new': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
+        df = df.dropna(subset=[self.stock_col, self.date_col])
+
+        timestamps = pd.to_datetime(df[self.date_col], utc=True)
+        watermark = self.watermark
+        if watermark is not None and lookback is not None:
+            recent = (timestamps >= watermark - lookback).to_numpy()
+            stats['skipped'] = int((~recent).sum())
+            df, timestamps = df[recent], timestamps[recent]
+
+        if df.empty:
+            return stats
+
+        df = df.assign(
+            _article_key=_hash_columns(df, self.key_cols),
+            _content_hash=_hash_columns(df, self.content_cols),
+        ).drop_duplicates('_article_key', keep='last')
+
+        keys = df['_article_key'].to_numpy()
+        previous = self._lookup_articles(keys)
+        known_hash = previous['content_hash'].astype('Int64').reindex(keys)
+        is_new = known_hash.isna().to_numpy()
+        is_changed = ~is_new & (known_hash.to_numpy(dtype=np.int64, na_value=0) !=
+                                df['_content_hash'].to_numpy())
+
+        stats['new'] = int(is_new.sum())
+        stats['changed'] = int(is_changed.sum())
+        stats['unchanged'] = len(df) - stats['new'] - stats['changed']
+
+        pending = df[is_new | is_changed]
+        if not pending.empty:
+            scored = apply_sentiment_analysis(
+                pending, text_col=self.text_col, n_workers=n_workers, cache=cache, backend=backend
+            )
+            delta = daily_sentiment_sums(scored, stock_col=self.stock_col, date_col=self.date_col)
+
+            replaced = previous.loc[keys[is_changed]]
+            if not replaced.empty:
+                old = daily_sentiment_sums(
+                    replaced.rename(columns={'stock': self.stock_col,
+                                             'polarity': 'sentiment_polarity',
+                                             'subjectivity': 'sentiment_subjectivity'}),
+                    stock_col=self.stock_col, date_col='date'
+                )
+                delta = delta.sub(old, fill_value=0)
+
+            self._apply_delta(delta)
+            self._store_articles(scored)
+
+        latest = timestamps.max()
+        if watermark is None or latest > watermark:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('watermark', ?)",
+                (latest.isoformat(),)
+            )
+        self._conn.commit()
+
+        return stats
+
+    def to_frame(self,
+                 stocks: Optional[List[str]] = None,
+                 start_date=None,
+                 end_date=None) -> pd.DataFrame:
+        """
+        Return daily sentiment in the `aggregate_daily_sentiment` layout,
+        ready for `merge_sentiment_returns`.
+
+        Parameters:
+        -----------
+        stocks : List[str], optional
+            Only return these stocks
+        start_date, end_date : date-like, optional
+            Inclusive date range to return
+        """
+        query = 'SELECT stock, date, sentiment_sum, article_count, subjectivity_sum FROM daily_sums WHERE 1 = 1'
+        params = []
+        if stocks is not None:
+            query += f" AND stock IN ({','.join('?' * len(stocks))})"
+            params.extend(stocks)
+        if start_date is not None:
+            query += ' AND date >= ?'
+            params.append(pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+        if end_date is not None:
+            query += ' AND date <= ?'
+            params.append(pd.Timestamp(end_date).strftime('%Y-%m-%d'))
+
+        sums = pd.read_sql_query(query, self._conn, params=params)
+        sums['date'] = pd.to_datetime(sums['date'])
+        sums = sums.rename(columns={'stock': self.stock_col}).set_index([self.stock_col, 'date'])
+
+        return sums_to_daily_sentiment(sums, stock_col=self.stock_col)
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _lookup_articles(self, keys: np.ndarray) -> pd.DataFrame:
+        self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS incoming (article_key INTEGER PRIMARY KEY)')
+        self._conn.execute('DELETE FROM incoming')
+        self._conn.executemany('INSERT INTO incoming (article_key) VALUES (?)',
+                               ((int(key),) for key in keys))
+        previous = pd.read_sql_query(
+            'SELECT a.article_key, a.content_hash, a.stock, a.date, a.polarity, a.subjectivity '
+            'FROM articles a JOIN incoming i ON a.article_key = i.article_key',
+            self._conn
+        )
+        return previous.set_index('article_key')
+
+    def _apply_delta(self, delta: pd.DataFrame) -> None:
+        delta = delta.reset_index()
+        records = zip(
+            delta[self.stock_col].astype(str),
+            delta['date'].dt.strftime('%Y-%m-%d'),
+            delta['sentiment_sum'].astype(float),
+            delta['article_count'].astype(np.int64).tolist(),
+            delta['subjectivity_sum'].astype(float),
+        )
+        self._conn.executemany(
+            'INSERT INTO daily_sums (stock, date, sentiment_sum, article_count, subjectivity_sum) '
+            'VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (stock, date) DO UPDATE SET '
+            'sentiment_sum = sentiment_sum + excluded.sentiment_sum, '
+            'article_count = article_count + excluded.article_count, '
+            'subjectivity_sum = subjectivity_sum + excluded.subjectivity_sum',
+            records
+        )
+        self._conn.execute('DELETE FROM daily_sums WHERE article_count <= 0')
+
+    def _store_articles(self, scored: pd.DataFrame) -> None:
+        dates = pd.to_datetime(pd.to_datetime(scored[self.date_col]).dt.date)
+        records = zip(
+            scored['_article_key'].astype(np.int64).tolist(),
+            scored['_content_hash'].astype(np.int64).tolist(),
+            scored[self.stock_col].astype(str),
+            dates.dt.strftime('%Y-%m-%d'),
+            scored['sentiment_polarity'].astype(float),
+            scored['sentiment_subjectivity'].astype(float),
+        )
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO articles '
+            '(article_key, content_hash, stock, date, polarity, subjectivity) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            records
+        )
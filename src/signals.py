@@ -0,0 +1,176 @@
+"""
+Signal Classification Utility Functions
+
+This module provides array-level versions of the scalar signal rules
+(`get_rsi_signal`, `get_macd_signal`, `get_trend_signal` and
+`classify_sentiment`). Each function takes whole columns or matrices,
+evaluates the rules with `np.select` and returns categorical labels backed
+by int8 codes, so screens over millions of (ticker, day) rows stay fast and
+compact.
+
+Missing inputs are handled explicitly: rows with a NaN input get a missing
+label by default, or `nan_label` if one is given (the scalar functions fall
+through to their default label, e.g. 'Neutral', on NaN).
+"""
+
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+ArrayLike = Union[pd.Series, pd.DataFrame, np.ndarray, Sequence[float]]
+
+RSI_LABELS = ['Oversold', 'Neutral', 'Overbought']
+MACD_LABELS = ['Bearish', 'Bullish']
+TREND_LABELS = ['Downtrend', 'Sideways', 'Uptrend']
+SENTIMENT_LABELS = ['Negative', 'Neutral', 'Positive']
+
+
+def _as_float_array(values: ArrayLike) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _categorize(template: ArrayLike,
+                conditions: List[np.ndarray],
+                choices: List[str],
+                default: str,
+                categories: List[str],
+                missing: np.ndarray,
+                nan_label: Optional[str] = None,
+                ordered: bool = True):
+    """
+    Evaluate label rules with `np.select` and wrap the codes as categoricals
+    shaped like `template`.
+    """
+    if nan_label is not None and nan_label not in categories:
+        raise ValueError(f"nan_label must be one of {categories}, got '{nan_label}'")
+
+    codes = np.select(conditions,
+                      [np.int8(categories.index(choice)) for choice in choices],
+                      default=np.int8(categories.index(default))).astype(np.int8)
+    codes[missing] = -1 if nan_label is None else categories.index(nan_label)
+
+    dtype = pd.CategoricalDtype(categories, ordered=ordered)
+    if codes.ndim == 2:
+        is_frame = isinstance(template, pd.DataFrame)
+        frame = pd.DataFrame(
+            {i: pd.Categorical.from_codes(codes[:, i], dtype=dtype) for i in range(codes.shape[1])},
+            index=template.index if is_frame else None
+        )
+        frame.columns = template.columns if is_frame else range(codes.shape[1])
+        return frame
+
+    labels = pd.Categorical.from_codes(codes.ravel(), dtype=dtype)
+    if isinstance(template, pd.Series):
+        return pd.Series(labels, index=template.index, name=template.name)
+    return labels
+
+
+def rsi_signals(rsi: ArrayLike,
+                overbought: float = 70,
+                oversold: float = 30,
+                nan_label: Optional[str] = None):
+    """
+    Vectorized `get_rsi_signal`.
+
+    Parameters:
+    -----------
+    rsi : array-like
+        RSI values (Series, 1-D array, or a dates x tickers matrix)
+    overbought : float
+        RSI above this level is 'Overbought' (default: 70)
+    oversold : float
+        RSI below this level is 'Oversold' (default: 30)
+    nan_label : str, optional
+        Label for NaN RSI values (default: missing)
+
+    Returns:
+    --------
+    pd.Categorical, pd.Series or pd.DataFrame
+        'Oversold' < 'Neutral' < 'Overbought' labels shaped like the input
+    """
+    values = _as_float_array(rsi)
+    return _categorize(rsi, [values > overbought, values < oversold], ['Overbought', 'Oversold'],
+                       'Neutral', RSI_LABELS, np.isnan(values), nan_label)
+
+
+def macd_signals(macd: ArrayLike, signal: ArrayLike, nan_label: Optional[str] = None):
+    """
+    Vectorized `get_macd_signal`.
+
+    Parameters:
+    -----------
+    macd : array-like
+        MACD line values
+    signal : array-like
+        MACD signal line values, same shape as `macd`
+    nan_label : str, optional
+        Label where either input is NaN (default: missing)
+
+    Returns:
+    --------
+    pd.Categorical, pd.Series or pd.DataFrame
+        'Bearish' / 'Bullish' labels shaped like `macd`
+    """
+    macd_values, signal_values = _as_float_array(macd), _as_float_array(signal)
+    missing = np.isnan(macd_values) | np.isnan(signal_values)
+    return _categorize(macd, [macd_values > signal_values], ['Bullish'],
+                       'Bearish', MACD_LABELS, missing, nan_label, ordered=False)
+
+
+def trend_signals(close: ArrayLike,
+                  sma_50: ArrayLike,
+                  sma_200: ArrayLike,
+                  nan_label: Optional[str] = None):
+    """
+    Vectorized `get_trend_signal`.
+
+    Parameters:
+    -----------
+    close : array-like
+        Closing prices
+    sma_50 : array-like
+        50-day SMA values, same shape as `close`
+    sma_200 : array-like
+        200-day SMA values, same shape as `close`
+    nan_label : str, optional
+        Label where any input is NaN (default: missing, e.g. the first 199
+        rows of each ticker)
+
+    Returns:
+    --------
+    pd.Categorical, pd.Series or pd.DataFrame
+        'Downtrend' < 'Sideways' < 'Uptrend' labels shaped like `close`
+    """
+    close_values = _as_float_array(close)
+    fast, slow = _as_float_array(sma_50), _as_float_array(sma_200)
+    missing = np.isnan(close_values) | np.isnan(fast) | np.isnan(slow)
+    conditions = [(close_values > fast) & (fast > slow), (close_values < fast) & (fast < slow)]
+    return _categorize(close, conditions, ['Uptrend', 'Downtrend'],
+                       'Sideways', TREND_LABELS, missing, nan_label)
+
+
+def sentiment_categories(polarity: ArrayLike,
+                         threshold: float = 0.1,
+                         nan_label: Optional[str] = None):
+    """
+    Vectorized `classify_sentiment`.
+
+    Parameters:
+    -----------
+    polarity : array-like
+        Sentiment polarity scores
+    threshold : float
+        Threshold for positive/negative classification (default: 0.1)
+    nan_label : str, optional
+        Label for NaN polarity (default: missing)
+
+    Returns:
+    --------
+    pd.Categorical, pd.Series or pd.DataFrame
+        'Negative' < 'Neutral' < 'Positive' labels shaped like the input
+    """
+    values = _as_float_array(polarity)
+    return _categorize(polarity, [values > threshold, values < -threshold], ['Positive', 'Negative'],
+                       'Neutral', SENTIMENT_LABELS, np.isnan(values), nan_label)
@@ -5,15 +5,200 @@ This module provides reusable functions for technical analysis using TA-Lib
 and financial metrics calculations.
 """
 
+import logging
 import pandas as pd
 import numpy as np
 import talib
+import threading
+import time
 import yfinance as yf
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
+from .indicators import LazyIndicatorFrame
+from .instrumentation import instrument
+from .price_store import PriceStore
 
-def download_stock_data(tickers: List[str], start_date: datetime, end_date: datetime) -> Dict[str, pd.DataFrame]:
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_yfinance_history(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+    """
+    Fetch OHLCV history of one ticker from yfinance.
+    
+    Parameters:
+    -----------
+    ticker : str
+        Stock ticker symbol
+    start_date : datetime
+        Start date (inclusive)
+    end_date : datetime
+        End date (exclusive)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        OHLCV data with lowercase column names and a 'date' column
+        (empty if nothing was returned)
+    """
+    df = yf.Ticker(ticker).history(start=start_date, end=end_date)
+    
+    if df.empty:
+        return pd.DataFrame()
+    
+    # Standardize column names
+    df.columns = [col.lower() for col in df.columns]
+    df.index.name = 'date'
+    return df.reset_index()
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+    
+    Parameters:
+    -----------
+    rate : float
+        Tokens added per second (sustained requests per second)
+    capacity : float, optional
+        Maximum burst size (default: max(1, rate))
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available and consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _download_one(ticker: str,
+                  start_date: datetime,
+                  end_date: datetime,
+                  store: Optional[PriceStore],
+                  fetcher: Callable,
+                  limiter: Optional[TokenBucket],
+                  max_retries: int,
+                  backoff: float) -> Tuple[Optional[pd.DataFrame], int, Optional[str]]:
+    """Download one ticker with retries; returns (data, attempts, error)."""
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            if store is not None:
+                df = store.get(ticker, start_date, end_date)
+            else:
+                df = fetcher(ticker, start_date, end_date)
+        except Exception as e:
+            if attempt == max_retries:
+                return None, attempt + 1, f"{type(e).__name__}: {e}"
+            time.sleep(backoff * 2 ** attempt)
+            continue
+        
+        if df is None or df.empty:
+            return None, attempt + 1, 'No data returned'
+        
+        # Ensure required columns exist
+        required_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
+        missing = [col for col in required_cols if col not in df.columns]
+        if missing:
+            return None, attempt + 1, f"Missing columns: {missing}"
+        
+        return df, attempt + 1, None
+
+
+@instrument
+def download_stock_data_report(tickers: List[str],
+                               start_date: datetime,
+                               end_date: datetime,
+                               store: Optional[PriceStore] = None,
+                               fetcher: Optional[Callable[[str, datetime, datetime], pd.DataFrame]] = None,
+                               max_workers: int = 8,
+                               requests_per_second: Optional[float] = None,
+                               max_retries: int = 3,
+                               backoff: float = 0.5) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Download stock price data concurrently with rate limiting and retries.
+    
+    Parameters:
+    -----------
+    tickers : List[str]
+        List of stock ticker symbols
+    start_date : datetime
+        Start date for data download
+    end_date : datetime
+        End date for data download
+    store : PriceStore, optional
+        Local price store used to serve already downloaded ranges
+    fetcher : callable, optional
+        Function `(ticker, start, end) -> DataFrame` (default: yfinance)
+    max_workers : int
+        Maximum number of concurrent downloads
+    requests_per_second : float, optional
+        Token-bucket limit on download attempts per second (default: unlimited)
+    max_retries : int
+        Number of retries after a failed attempt
+    backoff : float
+        Initial retry delay in seconds, doubled after every failed attempt
+    
+    Returns:
+    --------
+    Tuple[Dict[str, pd.DataFrame], pd.DataFrame]
+        (data, failures): dictionary mapping ticker symbols to DataFrames
+        with OHLCV data, and a DataFrame with one row per failed ticker
+        ('ticker', 'attempts', 'error')
+    """
+    if fetcher is None:
+        fetcher = fetch_yfinance_history
+    limiter = TokenBucket(requests_per_second) if requests_per_second else None
+    
+    def download(ticker):
+        return _download_one(ticker, start_date, end_date, store, fetcher,
+                             limiter, max_retries, backoff)
+    
+    if max_workers > 1 and len(tickers) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+            results = list(executor.map(download, tickers))
+    else:
+        results = [download(ticker) for ticker in tickers]
+    
+    stock_data = {}
+    failures = []
+    for ticker, (df, attempts, error) in zip(tickers, results):
+        if error is None:
+            stock_data[ticker] = df
+        else:
+            failures.append({'ticker': ticker, 'attempts': attempts, 'error': error})
+    
+    return stock_data, pd.DataFrame(failures, columns=['ticker', 'attempts', 'error'])
+
+
+def download_stock_data(tickers: List[str],
+                        start_date: datetime,
+                        end_date: datetime,
+                        store: Optional[PriceStore] = None,
+                        fetcher: Optional[Callable[[str, datetime, datetime], pd.DataFrame]] = None,
+                        max_workers: int = 1,
+                        requests_per_second: Optional[float] = None,
+                        max_retries: int = 0
+                        ) -> Dict[str, pd.DataFrame]:
     """
     Download stock price data using yfinance.
     
@@ -25,31 +210,35 @@ def download_stock_data(tickers: List[str], start_date: datetime, end_date: date
         Start date for data download
     end_date : datetime
         End date for data download
+    store : PriceStore, optional
+        Local price store. If given, data is read from the store and only
+        date ranges that are not stored yet are downloaded.
+    fetcher : callable, optional
+        Function `(ticker, start, end) -> DataFrame` used instead of
+        `fetch_yfinance_history` when no store is given
+    max_workers : int
+        Maximum number of concurrent downloads (default: 1, serial)
+    requests_per_second : float, optional
+        Rate limit on download attempts
+    max_retries : int
+        Number of retries after a failed attempt
     
     Returns:
     --------
     Dict[str, pd.DataFrame]
-        Dictionary mapping ticker symbols to DataFrames with OHLCV data
+        Dictionary mapping ticker symbols to DataFrames with OHLCV data.
+        Failed tickers are left out and logged as warnings; use
+        `download_stock_data_report` to get them as a DataFrame.
     """
-    stock_data = {}
+    stock_data, failures = download_stock_data_report(
+        tickers, start_date, end_date, store=store, fetcher=fetcher,
+        max_workers=max_workers, requests_per_second=requests_per_second,
+        max_retries=max_retries
+    )
     
-    for ticker in tickers:
-        try:
-            ticker_obj = yf.Ticker(ticker)
-            df = ticker_obj.history(start=start_date, end=end_date)
-            
-            if not df.empty:
-                # Standardize column names
-                df.columns = [col.lower() for col in df.columns]
-                df.index.name = 'date'
-                df = df.reset_index()
-                
-                # Ensure required columns exist
-                required_cols = ['date', 'open', 'high', 'low', 'close', 'volume']
-                if all(col in df.columns for col in required_cols):
-                    stock_data[ticker] = df
-        except Exception as e:
-            print(f"Error downloading {ticker}: {e}")
+    for failure in failures.itertuples():
+        logger.warning("Error downloading %s after %d attempts: %s",
+                       failure.ticker, failure.attempts, failure.error)
     
     return stock_data
 
@@ -91,69 +280,230 @@ def prepare_data_for_talib(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'RSI',
+    'MACD', 'MACD_signal', 'MACD_hist', 'BB_upper', 'BB_middle', 'BB_lower',
+    'Stoch_K', 'Stoch_D', 'ATR', 'OBV', 'ADX'
+]
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _indicator_matrix(ohlcv: np.ndarray) -> np.ndarray:
     """
-    Calculate various technical indicators using TA-Lib.
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        DataFrame with OHLCV data (date as index)
+    Compute all indicators for one ticker.
     
-    Returns:
-    --------
-    pd.DataFrame
-        DataFrame with added technical indicator columns
+    Takes an (n, 5) float64 array of open/high/low/close/volume and returns
+    an (n, len(INDICATOR_COLUMNS)) float64 array.
     """
-    df = df.copy()
+    ohlcv = np.ascontiguousarray(ohlcv, dtype=np.float64)
+    high = np.ascontiguousarray(ohlcv[:, 1])
+    low = np.ascontiguousarray(ohlcv[:, 2])
+    close = np.ascontiguousarray(ohlcv[:, 3])
+    volume = np.ascontiguousarray(ohlcv[:, 4])
     
-    # Convert to numpy arrays for TA-Lib
-    high = df['high'].values.astype(float)
-    low = df['low'].values.astype(float)
-    close = df['close'].values.astype(float)
-    open_price = df['open'].values.astype(float)
-    volume = df['volume'].values.astype(float)
+    out = np.empty((len(ohlcv), len(INDICATOR_COLUMNS)), dtype=np.float64)
     
     # Moving Averages
-    df['SMA_20'] = talib.SMA(close, timeperiod=20)
-    df['SMA_50'] = talib.SMA(close, timeperiod=50)
-    df['SMA_200'] = talib.SMA(close, timeperiod=200)
-    df['EMA_12'] = talib.EMA(close, timeperiod=12)
-    df['EMA_26'] = talib.EMA(close, timeperiod=26)
+    out[:, 0] = talib.SMA(close, timeperiod=20)
+    out[:, 1] = talib.SMA(close, timeperiod=50)
+    out[:, 2] = talib.SMA(close, timeperiod=200)
+    out[:, 3] = talib.EMA(close, timeperiod=12)
+    out[:, 4] = talib.EMA(close, timeperiod=26)
     
     # RSI (Relative Strength Index)
-    df['RSI'] = talib.RSI(close, timeperiod=14)
+    out[:, 5] = talib.RSI(close, timeperiod=14)
     
     # MACD (Moving Average Convergence Divergence)
-    macd, macd_signal, macd_hist = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
-    df['MACD'] = macd
-    df['MACD_signal'] = macd_signal
-    df['MACD_hist'] = macd_hist
+    out[:, 6], out[:, 7], out[:, 8] = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
     
     # Bollinger Bands
-    bb_upper, bb_middle, bb_lower = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
-    df['BB_upper'] = bb_upper
-    df['BB_middle'] = bb_middle
-    df['BB_lower'] = bb_lower
+    out[:, 9], out[:, 10], out[:, 11] = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
     
     # Stochastic Oscillator
-    slowk, slowd = talib.STOCH(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
-    df['Stoch_K'] = slowk
-    df['Stoch_D'] = slowd
+    out[:, 12], out[:, 13] = talib.STOCH(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
     
     # Average True Range (ATR)
-    df['ATR'] = talib.ATR(high, low, close, timeperiod=14)
+    out[:, 14] = talib.ATR(high, low, close, timeperiod=14)
     
     # On Balance Volume (OBV)
-    df['OBV'] = talib.OBV(close, volume)
+    out[:, 15] = talib.OBV(close, volume)
     
     # Average Directional Index (ADX)
-    df['ADX'] = talib.ADX(high, low, close, timeperiod=14)
+    out[:, 16] = talib.ADX(high, low, close, timeperiod=14)
+    
+    return out
+
+
+def _indicator_matrices(blocks: List[np.ndarray]) -> List[np.ndarray]:
+    """Worker task: compute indicators for a batch of tickers."""
+    return [_indicator_matrix(block) for block in blocks]
+
+
+@instrument
+def calculate_technical_indicators(df: pd.DataFrame,
+                                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Calculate various technical indicators using TA-Lib.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with OHLCV data (date as index)
+    columns : List[str], optional
+        Only compute these indicator columns (see `indicators.INDICATOR_REGISTRY`).
+        By default all of INDICATOR_COLUMNS are computed.
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with added technical indicator columns
+    """
+    if columns is not None:
+        return LazyIndicatorFrame(df).to_frame(columns)
+    
+    df = df.copy()
+    
+    # Convert to numpy arrays for TA-Lib
+    ohlcv = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    df[INDICATOR_COLUMNS] = _indicator_matrix(ohlcv)
     
     return df
 
 
-def calculate_financial_metrics(df: pd.DataFrame, risk_free_rate: float = 0.02) -> Dict:
+@instrument
+def calculate_technical_indicators_panel(data,
+                                         ticker_col: str = 'ticker',
+                                         date_col: str = 'date',
+                                         n_workers: int = 1,
+                                         tickers_per_task: int = 16) -> pd.DataFrame:
+    """
+    Calculate technical indicators for many tickers at once.
+    
+    Each ticker is sorted by date, its OHLCV values are packed into one
+    float64 matrix, and the indicator blocks are computed (optionally on a
+    process pool) and written into a preallocated output matrix.
+    
+    Parameters:
+    -----------
+    data : Dict[str, pd.DataFrame] or pd.DataFrame
+        Either a dictionary mapping tickers to OHLCV DataFrames (as returned
+        by `download_stock_data`), or a long DataFrame with a ticker column
+    ticker_col : str
+        Name of ticker column (long format only)
+    date_col : str
+        Name of date column; if missing, the frame index is used as the date
+    n_workers : int
+        Number of worker processes (default: 1, computes in this process)
+    tickers_per_task : int
+        Number of tickers sent to a worker per task
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame indexed by (ticker, date) with OHLCV and indicator columns
+    """
+    if isinstance(data, pd.DataFrame):
+        data = dict(tuple(data.groupby(ticker_col, sort=False)))
+    
+    tickers, dates, blocks = [], [], []
+    for ticker, frame in data.items():
+        frame_dates = frame[date_col] if date_col in frame.columns else frame.index.to_series()
+        order = np.argsort(frame_dates.to_numpy(), kind='stable')
+        tickers.append(ticker)
+        dates.append(frame_dates.to_numpy()[order])
+        blocks.append(frame[OHLCV_COLUMNS].to_numpy(dtype=np.float64)[order])
+    
+    lengths = np.array([len(block) for block in blocks], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    values = np.empty((offsets[-1], len(OHLCV_COLUMNS) + len(INDICATOR_COLUMNS)), dtype=np.float64)
+    
+    tasks = [blocks[i:i + tickers_per_task] for i in range(0, len(blocks), tickers_per_task)]
+    if n_workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+            results = executor.map(_indicator_matrices, tasks)
+            indicators = [matrix for batch in results for matrix in batch]
+    else:
+        indicators = [matrix for task in tasks for matrix in _indicator_matrices(task)]
+    
+    n_ohlcv = len(OHLCV_COLUMNS)
+    for i, (block, matrix) in enumerate(zip(blocks, indicators)):
+        values[offsets[i]:offsets[i + 1], :n_ohlcv] = block
+        values[offsets[i]:offsets[i + 1], n_ohlcv:] = matrix
+    
+    index = pd.MultiIndex.from_arrays(
+        [np.repeat(np.array(tickers, dtype=object), lengths),
+         np.concatenate(dates) if dates else np.array([], dtype='datetime64[ns]')],
+        names=['ticker', 'date']
+    )
+    return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS + INDICATOR_COLUMNS)
+
+
+def _summary_metrics(prices: np.ndarray,
+                     risk_free_rate: float = 0.02,
+                     volatility_window: int = 30,
+                     sharpe_window: int = 252) -> Dict[str, np.ndarray]:
+    """
+    Final-row financial metrics for every column of a (dates x tickers) price matrix.
+    
+    Follows the pandas semantics of `calculate_financial_metrics`: missing
+    prices are forward-filled (as `pct_change` does), leading gaps are
+    skipped by the cumulative product, and the rolling volatility and Sharpe
+    ratio are NaN unless their last window is complete.
+    """
+    rows = np.arange(len(prices))[:, None]
+    last_seen = np.maximum.accumulate(np.where(np.isnan(prices), 0, rows), axis=0)
+    prices = np.take_along_axis(prices, last_seen, axis=0)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = prices[1:] / prices[:-1] - 1
+    n_tickers = prices.shape[1]
+    
+    valid = ~np.isnan(returns)
+    has_returns = valid.any(axis=0)
+    growth = np.where(valid, 1 + returns, 1.0)
+    # Wealth starts at the first valid return, not at 1.0 on the leading gap
+    started = np.logical_or.accumulate(valid, axis=0)
+    wealth = np.where(started, np.cumprod(growth, axis=0), np.nan)
+    
+    total_return = np.where(has_returns, wealth[-1] - 1 if len(wealth) else 0.0, np.nan)
+    
+    peak = np.fmax.accumulate(wealth, axis=0)
+    with np.errstate(invalid='ignore'):
+        drawdown = (wealth - peak) / peak
+    max_drawdown = np.where(has_returns, np.fmin.reduce(drawdown, axis=0, initial=0.0), np.nan)
+    
+    def last_window_std(values: np.ndarray, window: int) -> np.ndarray:
+        if len(values) < window:
+            return np.full(n_tickers, np.nan)
+        return values[-window:].std(axis=0, ddof=1)
+    
+    volatility = last_window_std(returns, volatility_window) * np.sqrt(252)
+    
+    excess = returns - risk_free_rate / 252
+    if len(excess) >= sharpe_window:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = excess[-sharpe_window:].mean(axis=0) / last_window_std(excess, sharpe_window) * np.sqrt(252)
+    else:
+        sharpe = np.full(n_tickers, np.nan)
+    
+    counts = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_daily_return = np.where(valid, returns, 0.0).sum(axis=0) / counts
+    
+    return {
+        'total_return': total_return,
+        'volatility': volatility,
+        'sharpe_ratio': sharpe,
+        'max_drawdown': max_drawdown,
+        'avg_daily_return': avg_daily_return,
+    }
+
+
+@instrument
+def calculate_financial_metrics(df: pd.DataFrame,
+                                risk_free_rate: float = 0.02,
+                                summary_only: bool = False) -> Dict:
     """
     Calculate financial metrics including returns, volatility, Sharpe ratio, and drawdown.
     
@@ -163,12 +513,23 @@ def calculate_financial_metrics(df: pd.DataFrame, risk_free_rate: float = 0.02)
         DataFrame with price data
     risk_free_rate : float
         Annual risk-free rate (default: 0.02 for 2%)
+    summary_only : bool
+        If True, compute only the final metrics directly from the close
+        prices, without building the intermediate columns; the result has
+        no 'data' entry
     
     Returns:
     --------
     Dict
         Dictionary containing financial metrics
     """
+    if summary_only:
+        if len(df) == 0:
+            return {'total_return': 0, 'volatility': 0, 'sharpe_ratio': 0,
+                    'max_drawdown': 0, 'avg_daily_return': np.nan}
+        summary = _summary_metrics(df['close'].to_numpy(dtype=np.float64)[:, None], risk_free_rate)
+        return {name: values[0] for name, values in summary.items()}
+    
     df = df.copy()
     
     # Daily returns
@@ -203,6 +564,30 @@ def calculate_financial_metrics(df: pd.DataFrame, risk_free_rate: float = 0.02)
     return metrics
 
 
+@instrument
+def calculate_financial_metrics_panel(prices: pd.DataFrame, risk_free_rate: float = 0.02) -> pd.DataFrame:
+    """
+    Calculate summary financial metrics for many tickers at once.
+    
+    Parameters:
+    -----------
+    prices : pd.DataFrame
+        Close price matrix with dates as rows and tickers as columns
+        (e.g. `panel['close'].unstack('ticker')`)
+    risk_free_rate : float
+        Annual risk-free rate (default: 0.02 for 2%)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        One row per ticker with total_return, volatility, sharpe_ratio,
+        max_drawdown and avg_daily_return columns
+    """
+    prices = prices.sort_index()
+    summary = _summary_metrics(prices.to_numpy(dtype=np.float64), risk_free_rate)
+    return pd.DataFrame(summary, index=prices.columns)
+
+
 def get_rsi_signal(rsi_value: float) -> str:
     """
     Interpret RSI value as trading signal.
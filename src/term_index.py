@@ -0,0 +1,248 @@
+"""
+Term Index Utility Functions
+
+This module provides a sparse document-term index built once from
+preprocessed token lists. Keyword document frequencies, top terms, n-gram
+counts and per-stock or per-publisher breakdowns are answered with sparse
+column sums instead of scanning the token lists in Python.
+"""
+
+from itertools import chain
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class TermDocumentIndex:
+    """
+    CSR document-term count matrix plus vocabulary.
+
+    Terms are numbered in order of first occurrence, so ties in the ranked
+    outputs are broken the same way as `collections.Counter.most_common`.
+
+    Attributes:
+    -----------
+    matrix : scipy.sparse.csr_matrix
+        (documents x terms) occurrence counts
+    vocabulary : pd.Index
+        Term of each matrix column
+    """
+
+    def __init__(self, token_codes: np.ndarray, doc_offsets: np.ndarray, vocabulary: pd.Index):
+        self.vocabulary = vocabulary
+        self._token_codes = token_codes
+        self._doc_offsets = doc_offsets
+
+        n_docs = len(doc_offsets) - 1
+        doc_ids = np.repeat(np.arange(n_docs), np.diff(doc_offsets))
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(token_codes), dtype=np.int64), (doc_ids, token_codes)),
+            shape=(n_docs, len(vocabulary))
+        )
+        self.matrix.sum_duplicates()
+
+    @classmethod
+    def from_tokens(cls, token_lists: Iterable[Sequence[str]]) -> 'TermDocumentIndex':
+        """
+        Build the index from token lists (e.g. `df['processed_tokens']`).
+
+        Parameters:
+        -----------
+        token_lists : Iterable[Sequence[str]]
+            One token list per document; missing values count as empty documents
+
+        Returns:
+        --------
+        TermDocumentIndex
+            Index over the documents, in input order
+        """
+        token_lists = [tokens if isinstance(tokens, (list, tuple, np.ndarray)) else [] for tokens in token_lists]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        doc_offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        flat = np.fromiter(chain.from_iterable(token_lists), dtype=object, count=int(doc_offsets[-1]))
+        codes, vocabulary = pd.factorize(flat)
+        return cls(codes.astype(np.int64), doc_offsets, pd.Index(vocabulary, dtype=object))
+
+    @property
+    def n_documents(self) -> int:
+        return self.matrix.shape[0]
+
+    def term_counts(self) -> pd.Series:
+        """Total occurrences of every term."""
+        counts = np.bincount(self._token_codes, minlength=len(self.vocabulary))
+        return pd.Series(counts, index=self.vocabulary)
+
+    def document_frequency(self, terms: Optional[Iterable[str]] = None) -> pd.Series:
+        """
+        Number of documents containing each term.
+
+        Parameters:
+        -----------
+        terms : Iterable[str], optional
+            Terms to report (default: whole vocabulary). Unknown terms get 0.
+        """
+        frequency = pd.Series(np.bincount(self.matrix.indices, minlength=len(self.vocabulary)),
+                              index=self.vocabulary)
+        if terms is None:
+            return frequency
+        return frequency.reindex(list(terms), fill_value=0)
+
+    def keyword_frequency(self, keywords: Iterable[str]) -> pd.DataFrame:
+        """
+        Keyword document frequencies in the `analyze_keyword_frequency` layout.
+
+        Returns:
+        --------
+        pd.DataFrame
+            DataFrame with 'Keyword' and 'Frequency' columns, most frequent first
+        """
+        keywords = list(dict.fromkeys(keywords))
+        frequency = self.document_frequency(keywords)
+        keyword_df = pd.DataFrame({'Keyword': keywords, 'Frequency': frequency.to_numpy()})
+        return keyword_df.sort_values('Frequency', ascending=False)
+
+    def top_terms(self, k: int = 50, by: str = 'count') -> pd.Series:
+        """
+        The k most frequent terms.
+
+        Parameters:
+        -----------
+        k : int
+            Number of terms to return
+        by : str
+            'count' for total occurrences, 'documents' for document frequency
+
+        Returns:
+        --------
+        pd.Series
+            Frequency indexed by term, in `Counter.most_common` order
+        """
+        if by == 'count':
+            frequency = self.term_counts()
+        elif by == 'documents':
+            frequency = self.document_frequency()
+        else:
+            raise ValueError(f"by must be 'count' or 'documents', got '{by}'")
+        return frequency.sort_values(ascending=False, kind='stable').head(k)
+
+    def ngrams(self, n: int = 2) -> 'TermDocumentIndex':
+        """
+        Index of the n-grams within each document, as space-joined terms.
+
+        Parameters:
+        -----------
+        n : int
+            N-gram length (1 returns this index)
+
+        Returns:
+        --------
+        TermDocumentIndex
+            Index whose vocabulary is the n-grams, numbered by first occurrence
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        if n == 1:
+            return self
+
+        lengths = np.diff(self._doc_offsets)
+        ngram_lengths = np.maximum(lengths - n + 1, 0)
+        doc_offsets = np.concatenate([[0], np.cumsum(ngram_lengths)])
+
+        # Start position of every n-gram that fits inside its document
+        doc_starts = np.repeat(self._doc_offsets[:-1], ngram_lengths)
+        starts = doc_starts + np.arange(doc_offsets[-1]) - np.repeat(doc_offsets[:-1], ngram_lengths)
+
+        # Combine the term codes one position at a time, refactorizing so the
+        # keys stay small and keep first-occurrence order
+        n_terms = max(len(self.vocabulary), 1)
+        keys = self._token_codes[starts]
+        for offset in range(1, n):
+            keys, _ = pd.factorize(keys * n_terms + self._token_codes[starts + offset])
+        keys = keys.astype(np.int64)
+
+        n_ngrams = int(keys.max()) + 1 if len(keys) else 0
+        first = np.full(n_ngrams, len(keys), dtype=np.int64)
+        np.minimum.at(first, keys, np.arange(len(keys)))
+
+        words = self.vocabulary.to_numpy()
+        joined = pd.Series(words[self._token_codes[starts[first]]], dtype=object)
+        for offset in range(1, n):
+            joined = joined + ' ' + words[self._token_codes[starts[first] + offset]]
+
+        return TermDocumentIndex(keys, doc_offsets, pd.Index(joined, dtype=object))
+
+    def ngram_counts(self, n: int = 2, k: Optional[int] = None) -> pd.Series:
+        """Total occurrences of each n-gram, most frequent first (top k if given)."""
+        counts = self.ngrams(n).term_counts().sort_values(ascending=False, kind='stable')
+        return counts if k is None else counts.head(k)
+
+    def group_counts(self,
+                     groups: Sequence,
+                     terms: Optional[Iterable[str]] = None,
+                     binary: bool = False):
+        """
+        Term counts summed over documents of each group (e.g. stock or publisher).
+
+        Parameters:
+        -----------
+        groups : Sequence
+            Group label of every document, in index order
+        terms : Iterable[str], optional
+            Terms to report as dense columns. If None, the full sparse
+            (groups x terms) matrix is returned with its group labels.
+        binary : bool
+            Count documents containing the term instead of occurrences
+
+        Returns:
+        --------
+        pd.DataFrame or (scipy.sparse.csr_matrix, pd.Index)
+            Groups x terms counts
+        """
+        group_codes, group_labels = pd.factorize(np.asarray(groups, dtype=object))
+        valid = group_codes >= 0
+        membership = sparse.csr_matrix(
+            (np.ones(valid.sum(), dtype=np.int64), (group_codes[valid], np.flatnonzero(valid))),
+            shape=(len(group_labels), self.n_documents)
+        )
+
+        matrix = self.matrix
+        if binary:
+            matrix = matrix.copy()
+            matrix.data = np.ones_like(matrix.data)
+        counts = (membership @ matrix).tocsr()
+
+        if terms is None:
+            return counts, pd.Index(group_labels)
+
+        terms = list(terms)
+        columns = self.vocabulary.get_indexer(terms)
+        known = columns >= 0
+        dense = np.zeros((len(group_labels), len(terms)), dtype=np.int64)
+        dense[:, known] = counts[:, columns[known]].toarray()
+        return pd.DataFrame(dense, index=pd.Index(group_labels), columns=terms)
+
+    def top_terms_by_group(self, groups: Sequence, k: int = 10, binary: bool = False) -> pd.DataFrame:
+        """
+        The k most frequent terms of every group.
+
+        Returns:
+        --------
+        pd.DataFrame
+            Long DataFrame with 'group', 'term' and 'count' columns
+        """
+        counts, group_labels = self.group_counts(groups, binary=binary)
+        counts = counts.tocoo()
+
+        order = np.lexsort((counts.col, -counts.data, counts.row))
+        rows, cols, values = counts.row[order], counts.col[order], counts.data[order]
+        group_starts = np.searchsorted(rows, rows, side='left')
+        keep = np.arange(len(rows)) - group_starts < k
+
+        return pd.DataFrame({
+            'group': group_labels[rows[keep]],
+            'term': self.vocabulary[cols[keep]],
+            'count': values[keep],
+        })
@@ -0,0 +1,160 @@
+"""
+Text Preprocessing Utility Functions
+
+This module provides a batch engine for the headline cleaning done by
+`eda_utils.preprocess_text`. The regex and stopword set are built once per
+process, tokens are split on whitespace after the character filter (which
+is what NLTK's word tokenizer reduces to on letter-and-space text), and the
+stopword filter and lemma lookup are memoized per word in a bounded cache.
+Large corpora can be split across a process pool.
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+
+from .eda_utils import download_nltk_data
+
+
+# Same character filter as `preprocess_text`
+NON_ALPHA_PATTERN = r'[^a-z\s]'
+
+# Words NLTK's Treebank tokenizer splits even without punctuation
+_TREEBANK_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+
+class TextPreprocessor:
+    """
+    Reusable headline preprocessor producing the same tokens as
+    `eda_utils.preprocess_text`.
+
+    Parameters:
+    -----------
+    stop_words : set, optional
+        Stopwords to remove (default: NLTK English stopwords)
+    lemmatizer : object, optional
+        Object with a `lemmatize(word)` method (default: WordNetLemmatizer)
+    min_length : int
+        Shortest token kept (default: 3, as in `preprocess_text`)
+    cache_size : int
+        Maximum number of distinct words whose processed form is memoized
+    """
+
+    def __init__(self,
+                 stop_words: Optional[Iterable[str]] = None,
+                 lemmatizer=None,
+                 min_length: int = 3,
+                 cache_size: int = 200000):
+        if stop_words is None or lemmatizer is None:
+            download_nltk_data()
+        if stop_words is None:
+            stop_words = stopwords.words('english')
+        if lemmatizer is None:
+            lemmatizer = WordNetLemmatizer()
+
+        self.stop_words = frozenset(stop_words)
+        self.lemmatizer = lemmatizer
+        self.min_length = min_length
+        self.cache_size = cache_size
+        self._build()
+
+    def _build(self) -> None:
+        self._non_alpha = re.compile(NON_ALPHA_PATTERN)
+        self._word_tokens = lru_cache(maxsize=self.cache_size)(self._process_word)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_non_alpha'], state['_word_tokens']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build()
+
+    def _process_word(self, word: str) -> Tuple[str, ...]:
+        parts = _TREEBANK_SPLITS.get(word, (word,))
+        return tuple(self.lemmatizer.lemmatize(part) for part in parts
+                     if part not in self.stop_words and len(part) >= self.min_length)
+
+    def __call__(self, text) -> List[str]:
+        """Preprocess one text into a list of tokens."""
+        if not isinstance(text, str):
+            if pd.isna(text):
+                return []
+            text = str(text)
+
+        word_tokens = self._word_tokens
+        tokens = []
+        for word in self._non_alpha.sub(' ', text.lower()).split():
+            tokens.extend(word_tokens(word))
+        return tokens
+
+    def process_many(self, texts: Iterable) -> List[List[str]]:
+        """Preprocess a sequence of texts."""
+        return [self(text) for text in texts]
+
+    def cache_info(self):
+        """Hit/miss statistics of the per-word cache."""
+        return self._word_tokens.cache_info()
+
+
+# Preprocessor of the current worker process, set by `_init_worker`
+_WORKER_PREPROCESSOR: Optional[TextPreprocessor] = None
+
+
+def _init_worker(preprocessor: TextPreprocessor) -> None:
+    global _WORKER_PREPROCESSOR
+    _WORKER_PREPROCESSOR = preprocessor
+
+
+def _preprocess_chunk(texts: List) -> List[List[str]]:
+    return _WORKER_PREPROCESSOR.process_many(texts)
+
+
+def preprocess_texts(texts: Iterable,
+                     n_workers: int = 1,
+                     chunk_size: int = 50000,
+                     preprocessor: Optional[TextPreprocessor] = None) -> List[List[str]]:
+    """
+    Preprocess a column of texts in batch.
+
+    Parameters:
+    -----------
+    texts : Iterable
+        Texts to preprocess (e.g. a headline column)
+    n_workers : int
+        Number of worker processes (default: 1, no pool)
+    chunk_size : int
+        Number of texts sent to a worker per task
+    preprocessor : TextPreprocessor, optional
+        Configured preprocessor (default: NLTK English stopwords and WordNet lemmas)
+
+    Returns:
+    --------
+    List[List[str]]
+        Token lists in input order, as `preprocess_text` would return them
+    """
+    texts = list(texts)
+    if preprocessor is None:
+        preprocessor = TextPreprocessor()
+
+    if n_workers <= 1 or len(texts) <= chunk_size:
+        return preprocessor.process_many(texts)
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(preprocessor,)) as executor:
+        results = executor.map(_preprocess_chunk, chunks)
+        return [tokens for chunk in results for tokens in chunk]
@@ -0,0 +1,198 @@
+"""
+Trading Calendar Utility Functions
+
+This module maps article timestamps to the trading session they can first
+affect. Timestamps are converted to the exchange's local time. Articles
+published at or after the cutoff (the close) roll to the next day, and
+every effective day is then moved forward to the next trading session
+with one sorted search over the session array. The alignment reports how
+many articles kept their calendar day, moved, or were dropped.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+_NS_PER_DAY = 86400 * 10 ** 9
+_NO_SESSION = np.iinfo(np.int64).min
+
+
+class TradingCalendar:
+    """
+    Sorted trading sessions of one exchange plus its local time zone and cutoff.
+
+    Parameters:
+    -----------
+    sessions : Iterable, optional
+        Trading dates (e.g. the dates of downloaded prices). If None, a
+        business-day calendar is built from `weekmask` and `holidays`.
+    tz : str
+        Exchange time zone (default: 'America/New_York')
+    cutoff : str, optional
+        Local time of the close as 'HH:MM'; later articles count for the
+        next session. None keeps every article on its local calendar day.
+    holidays : Iterable, optional
+        Non-trading dates, used when `sessions` is None
+    weekmask : str
+        Trading weekdays, used when `sessions` is None
+    start, end : date-like
+        Range of the generated calendar, used when `sessions` is None
+    """
+
+    def __init__(self,
+                 sessions: Optional[Iterable] = None,
+                 tz: str = 'America/New_York',
+                 cutoff: Optional[str] = '16:00',
+                 holidays: Optional[Iterable] = None,
+                 weekmask: str = 'Mon Tue Wed Thu Fri',
+                 start='2000-01-01',
+                 end='2030-12-31'):
+        if sessions is None:
+            sessions = pd.bdate_range(start, end, freq='C', weekmask=weekmask,
+                                      holidays=list(holidays) if holidays is not None else None)
+
+        dates = pd.to_datetime(pd.Series(sessions)).dropna()
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        self.sessions = np.unique(dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]'))
+        self.tz = tz
+        self.cutoff = cutoff
+        self._cutoff_ns = pd.Timedelta(f"{cutoff}:00").value if cutoff is not None else None
+        self._session_days = self.sessions.view(np.int64)
+
+    @classmethod
+    def from_prices(cls, prices: pd.DataFrame, date_col: str = 'date', **kwargs) -> 'TradingCalendar':
+        """Calendar whose sessions are the distinct dates of a price DataFrame."""
+        return cls(sessions=prices[date_col], **kwargs)
+
+    def _local_ns(self, timestamps) -> np.ndarray:
+        """Local wall-clock time of each timestamp as int64 nanoseconds (NaT as min int)."""
+        timestamps = pd.Series(timestamps)
+        if pd.api.types.is_datetime64_any_dtype(timestamps):
+            values = pd.DatetimeIndex(timestamps)
+        else:
+            # Each string is parsed on its own, so values with and without a
+            # UTC offset can be mixed; naive ones are taken as UTC
+            values = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True, errors='coerce', format='mixed'))
+        if values.tz is None:
+            values = values.tz_localize('UTC')
+        local = values.tz_convert(self.tz).tz_localize(None)
+        return local.asi8
+
+    def _effective_days(self, timestamps) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(local calendar day, published after the close, valid) of each timestamp."""
+        local_ns = self._local_ns(timestamps)
+        valid = local_ns != np.iinfo(np.int64).min
+
+        calendar_day = np.floor_divide(local_ns, _NS_PER_DAY)
+        after_close = np.zeros(len(local_ns), dtype=bool)
+        if self._cutoff_ns is not None:
+            after_close = valid & ((local_ns - calendar_day * _NS_PER_DAY) >= self._cutoff_ns)
+        return calendar_day, after_close, valid
+
+    def effective_dates(self, timestamps) -> pd.Series:
+        """
+        Local calendar day on which each article can first affect prices.
+
+        Articles published at or after the cutoff count for the following
+        day. The days are not moved to trading sessions; see `align`.
+
+        Returns:
+        --------
+        pd.Series
+            Tz-naive dates (midnight, NaT for unparseable timestamps)
+        """
+        calendar_day, after_close, valid = self._effective_days(timestamps)
+        days = np.where(valid, calendar_day + after_close, _NO_SESSION)
+        index = timestamps.index if isinstance(timestamps, pd.Series) else None
+        return pd.Series(days.astype('datetime64[D]').astype('datetime64[ns]'), index=index)
+
+    def session_days(self, timestamps) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Effective session of each timestamp as days since the epoch.
+
+        Returns:
+        --------
+        Tuple[np.ndarray, Dict[str, int]]
+            Session day numbers (`np.iinfo(np.int64).min` where dropped) and
+            the alignment report
+        """
+        calendar_day, after_close, valid = self._effective_days(timestamps)
+        effective_day = calendar_day + after_close
+
+        # Next session on or after the effective day; days before the first
+        # session are outside the calendar rather than moved onto it
+        sessions = self._session_days
+        if len(sessions) == 0:
+            sessions = np.array([_NO_SESSION], dtype=np.int64)
+        position = np.searchsorted(sessions, effective_day, side='left')
+        in_calendar = valid & (position < len(self._session_days)) & (effective_day >= sessions[0])
+        session = np.where(in_calendar, sessions[np.minimum(position, len(sessions) - 1)], _NO_SESSION)
+
+        moved = in_calendar & (session != calendar_day)
+        report = {
+            'articles': len(valid),
+            'same_day': int((in_calendar & ~moved).sum()),
+            'moved_after_close': int((moved & after_close).sum()),
+            'moved_non_trading_day': int((moved & ~after_close).sum()),
+            'dropped_invalid_timestamp': int((~valid).sum()),
+            'dropped_outside_calendar': int((valid & ~in_calendar).sum()),
+        }
+        return session, report
+
+    def align(self, timestamps) -> Tuple[pd.Series, Dict[str, int]]:
+        """
+        Map timestamps to their effective trading sessions.
+
+        Parameters:
+        -----------
+        timestamps : array-like
+            Article timestamps (naive values are taken as UTC; unparseable
+            values are dropped)
+
+        Returns:
+        --------
+        Tuple[pd.Series, Dict[str, int]]
+            Session dates (tz-naive midnight, NaT where dropped) and counts of
+            articles kept on their local calendar day, moved after the
+            close or from a non-trading day, and dropped
+        """
+        days, report = self.session_days(timestamps)
+        sessions = days.astype('datetime64[D]').astype('datetime64[ns]')
+        index = timestamps.index if isinstance(timestamps, pd.Series) else None
+        return pd.Series(sessions, index=index), report
+
+
+def align_news_to_sessions(df: pd.DataFrame,
+                           calendar: TradingCalendar,
+                           date_col: str = 'date',
+                           session_col: str = 'session',
+                           drop: bool = True) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Add the effective trading session of every article.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        News articles
+    calendar : TradingCalendar
+        Exchange calendar, cutoff and time zone
+    date_col : str
+        Name of the timestamp column
+    session_col : str
+        Name of the added session column
+    drop : bool
+        Drop articles without a session (invalid timestamps or outside the calendar)
+
+    Returns:
+    --------
+    Tuple[pd.DataFrame, Dict[str, int]]
+        Articles with the session column, and the alignment report
+    """
+    sessions, report = calendar.align(df[date_col])
+    df = df.assign(**{session_col: sessions.to_numpy()})
+    if drop:
+        df = df[df[session_col].notna()]
+    return df, report
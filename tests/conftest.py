@@ -0,0 +1,140 @@
+"""
+Shared fixtures for the benchmark suite.
+
+The input scale is set with `--bench-rows` (default 10,000 rows). Run and
+store a baseline, then compare later runs against it so that a slowdown
+fails the run::
+
+    pytest tests/test_benchmarks.py --bench-rows 1000000 --benchmark-save=baseline
+    pytest tests/test_benchmarks.py --bench-rows 1000000 \\
+        --benchmark-compare --benchmark-compare-fail=median:20%
+
+Each benchmark also records rows/s and peak traced memory in its
+`extra_info`, which is stored with the saved runs. Peak memory does not
+depend on the machine, so it is checked against a committed baseline
+instead; a benchmark whose peak grows by more than the tolerance fails::
+
+    pytest tests/test_benchmarks.py --benchmark-only --memory-baseline tests/benchmark_memory.json
+    pytest tests/test_benchmarks.py --benchmark-only --memory-baseline-save tests/benchmark_memory.json
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from tests.synthetic_data import make_merged_panel, make_news_frame, make_ohlcv_panel, make_price_frame
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-rows', type=int, default=10000,
+                     help='Number of rows of the synthetic benchmark inputs (default: 10000)')
+    parser.addoption('--memory-baseline', default=None,
+                     help='JSON file of peak memory per benchmark; larger peaks fail the benchmark')
+    parser.addoption('--memory-tolerance', type=float, default=0.25,
+                     help='Allowed relative growth over the memory baseline (default: 0.25)')
+    parser.addoption('--memory-baseline-save', default=None,
+                     help='Write the peak memory of every benchmark of this run to a JSON file')
+
+
+class MemoryBaseline:
+    """Peak memory (MB) per benchmark name, recorded at one `--bench-rows` scale."""
+
+    # Absolute slack, so that tiny peaks do not fail on allocator noise
+    SLACK_MB = 1.0
+
+    def __init__(self, config):
+        self.rows = config.getoption('--bench-rows')
+        self.tolerance = config.getoption('--memory-tolerance')
+        self.save_path = config.getoption('--memory-baseline-save')
+        self.peaks = {}
+        self.baseline = {}
+
+        path = config.getoption('--memory-baseline')
+        if path is not None:
+            with open(path) as f:
+                stored = json.load(f)
+            if stored['rows'] != self.rows:
+                raise pytest.UsageError(
+                    f"{path} was recorded with --bench-rows {stored['rows']}, not {self.rows}")
+            self.baseline = stored['peak_memory_mb']
+
+    def check(self, name: str, peak_mb: float) -> None:
+        self.peaks[name] = peak_mb
+        if name not in self.baseline:
+            return
+        budget = self.baseline[name] * (1 + self.tolerance) + self.SLACK_MB
+        if peak_mb > budget:
+            pytest.fail(f"{name} peaked at {peak_mb:.1f} MB, over its budget of {budget:.1f} MB "
+                        f"(baseline {self.baseline[name]:.1f} MB)")
+
+    def save(self) -> None:
+        with open(self.save_path, 'w') as f:
+            json.dump({'rows': self.rows, 'peak_memory_mb': dict(sorted(self.peaks.items()))}, f, indent=2)
+            f.write('\n')
+
+
+def pytest_configure(config):
+    config.memory_baseline = MemoryBaseline(config)
+
+
+def pytest_sessionfinish(session):
+    baseline = session.config.memory_baseline
+    if baseline.save_path is not None and baseline.peaks:
+        baseline.save()
+
+
+@pytest.fixture(scope='session')
+def n_rows(request) -> int:
+    return request.config.getoption('--bench-rows')
+
+
+@pytest.fixture(scope='session')
+def news_frame(n_rows):
+    return make_news_frame(n_rows)
+
+
+@pytest.fixture(scope='session')
+def ohlcv_panel(n_rows):
+    return make_ohlcv_panel(n_rows)
+
+
+@pytest.fixture(scope='session')
+def price_frame(n_rows):
+    return make_price_frame(n_rows)
+
+
+@pytest.fixture(scope='session')
+def merged_panel(n_rows):
+    return make_merged_panel(n_rows)
+
+
+@pytest.fixture
+def measure(benchmark, request):
+    """
+    Benchmark a call and record its throughput and peak memory.
+
+    Usage: `measure(func, *args, rows=len(df), **kwargs)`. The function is
+    timed by pytest-benchmark, then run once more under `tracemalloc` to
+    record the peak memory it allocates and check it against the memory
+    baseline.
+    """
+    def run(func, *args, rows: int, rounds: int = 3, **kwargs):
+        result = benchmark.pedantic(func, args=args, kwargs=kwargs, rounds=rounds, iterations=1,
+                                    warmup_rounds=0)
+
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        benchmark.extra_info['rows'] = rows
+        benchmark.extra_info['peak_memory_mb'] = peak / 1e6
+        if benchmark.stats is not None:
+            benchmark.extra_info['rows_per_s'] = rows / benchmark.stats.stats.median
+        request.config.memory_baseline.check(benchmark.name, peak / 1e6)
+        return result
+
+    return run
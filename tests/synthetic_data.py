@@ -0,0 +1,128 @@
+"""
+Synthetic Data Generators
+
+This module provides deterministic generators for the frames used by the
+benchmark suite: raw news, long-format OHLCV panels and merged
+sentiment/return panels. Every generator is seeded and scales by row count,
+so the same inputs can be produced at 10k or 10M rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+HEADLINE_TEMPLATES = [
+    "{stock} shares surge after strong quarterly earnings beat expectations",
+    "{stock} stock falls on weak delivery numbers",
+    "Analyst upgrades {stock} to buy with higher price target",
+    "FDA approval sends {stock} shares sharply higher",
+    "{stock} reports disappointing revenue and cuts guidance",
+    "Stocks that hit 52-week lows on Friday including {stock}",
+    "Merger talks boost shares of {stock}",
+    "{stock} announces dividend increase and share buyback",
+]
+
+PUBLISHERS = [
+    'Benzinga Newsdesk', 'Lisa Levin', 'ETF Professor', 'Paul Quintaro',
+    'Charles Gross', 'vick@benzinga.com', 'juan@benzinga.com', 'Eddie Staley',
+]
+
+
+def stock_symbols(n_stocks: int) -> np.ndarray:
+    """Ticker-like symbols S0000, S0001, ..."""
+    return np.array([f"S{i:04d}" for i in range(n_stocks)], dtype=object)
+
+
+def make_news_frame(n_rows: int, n_stocks: int = 500, n_days: int = 1000, seed: int = 0) -> pd.DataFrame:
+    """
+    Raw news articles in the layout of the analyst ratings CSV.
+
+    Parameters:
+    -----------
+    n_rows : int
+        Number of articles
+    n_stocks : int
+        Number of distinct stocks
+    n_days : int
+        Number of calendar days the articles span
+    seed : int
+        Random seed
+
+    Returns:
+    --------
+    pd.DataFrame
+        Columns headline, url, publisher, date (ISO strings with -04:00 offset) and stock
+    """
+    rng = np.random.default_rng(seed)
+    stocks = stock_symbols(n_stocks)[rng.zipf(1.5, n_rows) % n_stocks]
+    templates = rng.integers(0, len(HEADLINE_TEMPLATES), n_rows)
+    headlines = [HEADLINE_TEMPLATES[t].format(stock=s) for t, s in zip(templates, stocks)]
+
+    seconds = rng.integers(0, n_days * 86400, n_rows)
+    dates = pd.Timestamp('2015-01-01', tz='Etc/GMT+4') + pd.to_timedelta(seconds, unit='s')
+
+    return pd.DataFrame({
+        'headline': headlines,
+        'url': [f"https://www.example.com/news/{i}" for i in range(n_rows)],
+        'publisher': np.array(PUBLISHERS, dtype=object)[rng.integers(0, len(PUBLISHERS), n_rows)],
+        'date': dates.strftime('%Y-%m-%d %H:%M:%S-04:00'),
+        'stock': stocks,
+    })
+
+
+def make_ohlcv_panel(n_rows: int, n_days: int = 1000, seed: int = 0) -> pd.DataFrame:
+    """
+    Long-format random-walk OHLCV panel with about `n_rows` rows.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Columns ticker, date, open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+    n_tickers = max(n_rows // n_days, 1)
+    dates = pd.bdate_range('2015-01-01', periods=n_days)
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_days, n_tickers)), axis=0))
+    spread = np.abs(rng.normal(0, 0.005, close.shape)) * close
+    return pd.DataFrame({
+        'ticker': np.repeat(stock_symbols(n_tickers), n_days),
+        'date': np.tile(dates, n_tickers),
+        'open': (close + rng.normal(0, 0.2, close.shape)).ravel(order='F'),
+        'high': (close + spread).ravel(order='F'),
+        'low': (close - spread).ravel(order='F'),
+        'close': close.ravel(order='F'),
+        'volume': rng.integers(100000, 1000000, close.shape).astype(float).ravel(order='F'),
+    })
+
+
+def make_price_frame(n_rows: int, n_days: int = 1000, seed: int = 0) -> pd.DataFrame:
+    """Long-format close prices with a 'stock' column, as used by the correlation functions."""
+    panel = make_ohlcv_panel(n_rows, n_days=n_days, seed=seed)
+    return panel[['ticker', 'date', 'close']].rename(columns={'ticker': 'stock'})
+
+
+def make_merged_panel(n_rows: int, n_stocks: int = 500, seed: int = 0) -> pd.DataFrame:
+    """
+    Merged daily sentiment and returns, as produced by `merge_sentiment_returns`.
+
+    Returns returns that are weakly correlated with sentiment.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Columns stock, date, avg_sentiment, article_count and daily_return
+    """
+    rng = np.random.default_rng(seed)
+    n_days = max(n_rows // n_stocks, 1)
+    dates = pd.bdate_range('2015-01-01', periods=n_days)
+
+    sentiment = rng.normal(0, 0.2, n_days * n_stocks)
+    return pd.DataFrame({
+        'stock': np.repeat(stock_symbols(n_stocks), n_days),
+        'date': np.tile(dates, n_stocks),
+        'avg_sentiment': sentiment,
+        'article_count': rng.integers(1, 20, n_days * n_stocks),
+        'daily_return': 0.5 * sentiment + rng.normal(0, 1.5, n_days * n_stocks),
+    })
+
@@ -0,0 +1,144 @@
+"""
+Benchmarks of the hot paths in sentiment_analysis, eda_utils,
+technical_analysis and correlation_analysis on synthetic inputs.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.correlation_analysis import (
+    analyze_correlation_by_stock,
+    analyze_lag_correlation,
+    calculate_daily_returns,
+    merge_sentiment_returns,
+)
+from src.eda_utils import analyze_keyword_frequency, calculate_headline_stats, prepare_date_features
+from src.sentiment_analysis import aggregate_daily_sentiment, apply_sentiment_analysis, score_sentiment_batch
+from src.technical_analysis import (
+    calculate_financial_metrics_panel,
+    calculate_technical_indicators,
+    calculate_technical_indicators_panel,
+)
+from src.term_index import TermDocumentIndex
+from src.text_preprocessing import TextPreprocessor, preprocess_texts
+
+# TextBlob scoring is benchmarked on at most this many headlines
+TEXTBLOB_MAX_ROWS = 50000
+
+STOP_WORDS = {'the', 'a', 'an', 'and', 'of', 'on', 'to', 'with', 'after', 'that', 'in', 'including'}
+
+
+class _IdentityLemmatizer:
+    """Stands in for WordNet so the benchmark does not need NLTK corpora."""
+
+    def lemmatize(self, word):
+        return word
+
+
+@pytest.fixture(scope='module')
+def scored_news(news_frame):
+    return apply_sentiment_analysis(news_frame, backend='lexicon')
+
+
+@pytest.fixture(scope='module')
+def processed_tokens(news_frame):
+    preprocessor = TextPreprocessor(stop_words=STOP_WORDS, lemmatizer=_IdentityLemmatizer())
+    return pd.Series(preprocess_texts(news_frame['headline'], preprocessor=preprocessor))
+
+
+# sentiment_analysis
+
+@pytest.mark.parametrize('backend', ['textblob', 'lexicon'])
+def test_score_sentiment_batch(measure, news_frame, backend):
+    headlines = news_frame['headline'].to_numpy()
+    if backend == 'textblob':
+        headlines = headlines[:TEXTBLOB_MAX_ROWS]
+    polarity, _, _ = measure(score_sentiment_batch, headlines, backend=backend, rows=len(headlines))
+    assert len(polarity) == len(headlines)
+
+
+def test_aggregate_daily_sentiment(measure, scored_news):
+    daily = measure(aggregate_daily_sentiment, scored_news, rows=len(scored_news))
+    assert daily['article_count'].sum() == len(scored_news)
+
+
+# eda_utils
+
+def test_prepare_date_features(measure, news_frame):
+    result = measure(prepare_date_features, news_frame[['date']], rows=len(news_frame))
+    assert result['year'].notna().all()
+
+
+def test_prepare_date_features_compact(measure, news_frame):
+    result = measure(prepare_date_features, news_frame[['date']], compact=True, rows=len(news_frame))
+    assert result['month'].dtype == np.int8
+
+
+def test_calculate_headline_stats(measure, news_frame):
+    result = measure(calculate_headline_stats, news_frame[['headline']], rows=len(news_frame))
+    assert (result['headline_word_count'] > 0).all()
+
+
+def test_preprocess_texts(measure, news_frame):
+    headlines = news_frame['headline'].tolist()
+    tokens = measure(
+        lambda: preprocess_texts(headlines, preprocessor=TextPreprocessor(STOP_WORDS, _IdentityLemmatizer())),
+        rows=len(headlines)
+    )
+    assert len(tokens) == len(headlines)
+
+
+def test_analyze_keyword_frequency(measure, processed_tokens):
+    df = pd.DataFrame({'processed_tokens': processed_tokens})
+    keywords = measure(analyze_keyword_frequency, df, rows=len(df))
+    assert keywords['Frequency'].max() > 0
+
+
+def test_term_index_ngrams(measure, processed_tokens):
+    index = TermDocumentIndex.from_tokens(processed_tokens)
+    bigrams = measure(index.ngram_counts, 2, 50, rows=len(processed_tokens))
+    assert len(bigrams) > 0
+
+
+# technical_analysis
+
+def test_calculate_technical_indicators(measure, ohlcv_panel):
+    one_ticker = ohlcv_panel[ohlcv_panel['ticker'] == ohlcv_panel['ticker'].iloc[0]].set_index('date')
+    result = measure(calculate_technical_indicators, one_ticker, rows=len(one_ticker))
+    assert 'RSI' in result.columns
+
+
+def test_calculate_technical_indicators_panel(measure, ohlcv_panel):
+    result = measure(calculate_technical_indicators_panel, ohlcv_panel, rows=len(ohlcv_panel))
+    assert len(result) == len(ohlcv_panel)
+
+
+def test_calculate_financial_metrics_panel(measure, ohlcv_panel):
+    prices = ohlcv_panel.pivot(index='date', columns='ticker', values='close')
+    metrics = measure(calculate_financial_metrics_panel, prices, rows=len(ohlcv_panel))
+    assert len(metrics) == prices.shape[1]
+
+
+# correlation_analysis
+
+def test_calculate_daily_returns(measure, price_frame):
+    returns = measure(calculate_daily_returns, price_frame, rows=len(price_frame))
+    assert 'daily_return' in returns.columns
+
+
+def test_merge_sentiment_returns(measure, merged_panel):
+    sentiment = merged_panel[['stock', 'date', 'avg_sentiment', 'article_count']]
+    returns = merged_panel[['stock', 'date', 'daily_return']]
+    merged = measure(merge_sentiment_returns, sentiment, returns, rows=len(merged_panel))
+    assert len(merged) == len(merged_panel)
+
+
+def test_analyze_correlation_by_stock(measure, merged_panel):
+    result = measure(analyze_correlation_by_stock, merged_panel, rows=len(merged_panel))
+    assert (result['Pearson_Correlation'] > 0).mean() > 0.5
+
+
+def test_analyze_lag_correlation(measure, merged_panel):
+    result = measure(analyze_lag_correlation, merged_panel, rows=len(merged_panel))
+    assert len(result) == 5
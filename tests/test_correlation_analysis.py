@@ -0,0 +1,118 @@
+"""
+Parity tests of the grouped, lagged and merged correlation paths against
+straightforward pandas/scipy implementations.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.correlation_analysis import (
+    analyze_correlation_by_stock,
+    analyze_lag_correlation,
+    calculate_correlation,
+    merge_sentiment_returns,
+)
+
+
+def make_merged(n_stocks=40, n_days=150, seed=4):
+    """Daily sentiment and returns per stock, weakly correlated."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=n_days)
+    sentiment = rng.normal(0, 0.2, n_stocks * n_days)
+    return pd.DataFrame({
+        'stock': np.repeat([f"S{i:02d}" for i in range(n_stocks)], n_days),
+        'date': np.tile(dates, n_stocks),
+        'avg_sentiment': sentiment,
+        'article_count': rng.integers(1, 20, n_stocks * n_days),
+        'daily_return': 0.5 * sentiment + rng.normal(0, 1.5, n_stocks * n_days),
+    })
+
+
+@pytest.fixture(scope='module')
+def merged():
+    """Shuffled panel with missing values, rounded (tied) sentiment and short stocks."""
+    df = make_merged()
+    rng = np.random.default_rng(4)
+    df['avg_sentiment'] = df['avg_sentiment'].round(1)
+    df.loc[rng.random(len(df)) < 0.05, 'avg_sentiment'] = np.nan
+    df.loc[rng.random(len(df)) < 0.05, 'daily_return'] = np.nan
+    short = df['stock'].isin(df['stock'].unique()[:3]) & (df['date'] > df['date'].min() + pd.Timedelta(days=10))
+    return df[~short].sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def reference_lag_correlation(df, lags, by_stock=False):
+    """Per-lag groupby shift, as in the original row-wise implementation."""
+    df = df.sort_values(['stock', 'date'])
+    rows = []
+    for lag in lags:
+        lagged = df.assign(returns_lag=df.groupby('stock')['daily_return'].shift(-lag))
+        lagged = lagged.dropna(subset=['avg_sentiment', 'returns_lag'])
+        groups = lagged.groupby('stock') if by_stock else [(None, lagged)]
+        for stock, group in groups:
+            if len(group) > 10:
+                corr, p_value = calculate_correlation(group['avg_sentiment'], group['returns_lag'])
+                rows.append({'Stock': stock, 'Lag': lag, 'Correlation': corr, 'P_Value': p_value,
+                             'Data_Points': len(group)})
+    return pd.DataFrame(rows)
+
+
+def test_correlation_by_stock_matches_scipy(merged):
+    result = analyze_correlation_by_stock(merged, min_data_points=10).set_index('Stock')
+
+    expected_stocks = [stock for stock, group in merged.groupby('stock') if len(group) >= 10]
+    assert sorted(result.index) == sorted(expected_stocks)
+    for stock in expected_stocks:
+        group = merged[merged['stock'] == stock]
+        for method in ('pearson', 'spearman'):
+            corr, p_value = calculate_correlation(group['avg_sentiment'], group['daily_return'], method)
+            name = method.capitalize()
+            assert result.loc[stock, f"{name}_Correlation"] == pytest.approx(corr, abs=1e-12)
+            assert result.loc[stock, f"{name}_P_Value"] == pytest.approx(p_value, rel=1e-9, abs=1e-15)
+
+
+@pytest.mark.parametrize('by_stock', [False, True])
+def test_lag_correlation_matches_groupby_shift(merged, by_stock):
+    lags = range(-3, 4)
+    result = analyze_lag_correlation(merged, lags=lags, by_stock=by_stock).reset_index(drop=True)
+    expected = reference_lag_correlation(merged, lags, by_stock)
+    if by_stock:
+        expected = expected.sort_values(['Stock', 'Lag']).reset_index(drop=True)
+    else:
+        expected = expected.drop(columns='Stock')
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, atol=1e-12, rtol=1e-9)
+
+
+def test_merge_matches_pandas_merge(merged):
+    sentiment = merged[['stock', 'date', 'avg_sentiment']].iloc[::2]
+    returns = merged[['stock', 'date', 'daily_return']].iloc[1::3].assign(
+        date=lambda df: df['date'].dt.strftime('%Y-%m-%d'))
+
+    result = merge_sentiment_returns(sentiment, returns).reset_index(drop=True)
+    expected = pd.merge(sentiment, returns.assign(date=pd.to_datetime(returns['date'])),
+                        on=['stock', 'date']).sort_values(['stock', 'date']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+
+def test_merge_matches_intraday_timestamps_by_day():
+    sentiment = pd.DataFrame({
+        'stock': ['AAPL', 'AAPL', 'MSFT', 'MSFT'],
+        'date': ['2024-01-03 13:00', '2024-01-02 09:30', '2024-01-02 23:59', '2024-01-05 13:00'],
+        'avg_sentiment': [0.1, 0.2, 0.3, 0.4],
+    }, index=[10, 11, 12, 13])
+    returns = pd.DataFrame({
+        'stock': ['AAPL', 'AAPL', 'MSFT', 'MSFT'],
+        'date': pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-03', '2024-01-05']),
+        'daily_return': [1.0, 2.0, 3.0, 4.0],
+    })
+
+    result = merge_sentiment_returns(sentiment, returns)
+
+    expected = pd.DataFrame({
+        'stock': ['AAPL', 'AAPL', 'MSFT'],
+        'date': pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-05']),
+        'avg_sentiment': [0.2, 0.1, 0.4],
+        'daily_return': [1.0, 2.0, 4.0],
+    })
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,56 @@
+"""
+Tests of the compact news loader and date features against the default ones.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.eda_utils import compact_news_frame, extract_domain, load_news_data, prepare_date_features
+
+
+PUBLISHERS = ['Benzinga Newsdesk', 'Lisa Levin', 'vick@benzinga.com', 'juan@benzinga.com', 'ETF Professor']
+
+
+@pytest.fixture(scope='module')
+def news():
+    rng = np.random.default_rng(5)
+    n_rows = 2000
+    seconds = rng.integers(0, 200 * 86400, n_rows)
+    dates = pd.Timestamp('2020-01-01', tz='Etc/GMT+4') + pd.to_timedelta(seconds, unit='s')
+    return pd.DataFrame({
+        'headline': [f"Headline number {i}" for i in range(n_rows)],
+        'url': [f"https://www.example.com/news/{i}" for i in range(n_rows)],
+        'publisher': np.array(PUBLISHERS, dtype=object)[rng.integers(0, len(PUBLISHERS), n_rows)],
+        'date': dates.strftime('%Y-%m-%d %H:%M:%S-04:00'),
+        'stock': np.array(['AAPL', 'MSFT', 'TSLA'], dtype=object)[rng.integers(0, 3, n_rows)],
+    })
+
+
+def test_compact_date_features_hold_the_same_values(news):
+    dates = news[['date']].copy()
+    dates.loc[dates.index[-5:], 'date'] = 'not a date'
+
+    regular = prepare_date_features(dates)
+    compact = prepare_date_features(dates, compact=True)
+
+    for column in ['year', 'month', 'day', 'hour']:
+        pd.testing.assert_series_equal(compact[column].astype('Float64'),
+                                       regular[column].astype('Float64'), check_names=False)
+    pd.testing.assert_series_equal(compact['day_of_week'].astype(object),
+                                   regular['day_of_week'].astype(object))
+
+
+@pytest.mark.parametrize('arrow_strings', [False, True])
+def test_load_news_data_preserves_values(tmp_path, news, arrow_strings):
+    path = tmp_path / 'news.csv'
+    news.to_csv(path, index=False)
+
+    loaded = load_news_data(path, arrow_strings=arrow_strings)
+
+    for column in ['headline', 'url', 'stock', 'publisher']:
+        assert loaded[column].astype(object).tolist() == news[column].tolist(), column
+    assert loaded['publisher_domain'].astype(object).tolist() == [
+        extract_domain(p) for p in news['publisher']]
+    pd.testing.assert_series_equal(loaded['date'], pd.to_datetime(news['date'], utc=True))
+    pd.testing.assert_frame_equal(loaded, compact_news_frame(news, arrow_strings=arrow_strings))
@@ -0,0 +1,69 @@
+"""
+Tests of the incremental indicator calculators against the batch functions.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.incremental_indicators import (
+    IncrementalIndicatorSet,
+    RollingWindow,
+    load_indicator_states,
+    save_indicator_states,
+)
+from src.technical_analysis import calculate_financial_metrics, calculate_technical_indicators
+
+from .test_technical_analysis import make_bars
+
+
+@pytest.fixture(scope='module')
+def bars():
+    return make_bars(600, seed=3)
+
+
+def test_rolling_window_sums_are_rebuilt_once_per_window():
+    rng = np.random.default_rng(0)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 100_000)))
+    window = RollingWindow(50)
+    for value in values:
+        window.push(value)
+
+    # A push that completes a window leaves exact sums behind
+    assert window.pushes == 0
+    assert window.total == math.fsum(values[-50:])
+    assert window.total_sq == math.fsum(v * v for v in values[-50:])
+    assert window.std() == pytest.approx(np.std(values[-50:]), rel=1e-9)
+
+
+def test_rolling_window_recovers_from_nan():
+    window = RollingWindow(5)
+    for value in [1.0, np.nan, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0]:
+        window.push(value)
+    assert window.mean() == 7.0
+
+
+def test_incremental_matches_batch(bars):
+    incremental = IncrementalIndicatorSet().update_frame(bars)
+
+    indicators = calculate_technical_indicators(bars)
+    metrics = calculate_financial_metrics(bars)['data']
+    for column in incremental.columns:
+        expected = indicators[column] if column in indicators else metrics[column]
+        np.testing.assert_allclose(incremental[column], expected, rtol=1e-7, atol=1e-9,
+                                   equal_nan=True, err_msg=column)
+
+
+def test_state_round_trip_continues_identically(bars, tmp_path):
+    head, tail = bars.iloc[:300], bars.iloc[300:]
+    uninterrupted = IncrementalIndicatorSet()
+    uninterrupted.update_frame(head)
+    expected = uninterrupted.update_frame(tail)
+
+    interrupted = IncrementalIndicatorSet()
+    interrupted.update_frame(head)
+    save_indicator_states({'T0': interrupted}, tmp_path / 'states.json')
+    restored = load_indicator_states(tmp_path / 'states.json')['T0']
+    pd.testing.assert_frame_equal(restored.update_frame(tail), expected)
@@ -0,0 +1,64 @@
+"""
+Tests of the indicator registry and the lazy indicator frame.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from src.indicators import (
+    INDICATOR_REGISTRY,
+    IndicatorCache,
+    IndicatorSpec,
+    LazyIndicatorFrame,
+    register_indicator,
+)
+from src.technical_analysis import calculate_technical_indicators
+
+from .test_technical_analysis import make_bars
+
+
+@pytest.fixture(scope='module')
+def bars():
+    return make_bars(400, seed=9)
+
+
+def test_lazy_columns_are_identical_to_the_full_frame(bars):
+    full = calculate_technical_indicators(bars)
+    columns = ['BB_lower', 'RSI', 'Stoch_D', 'SMA_200']
+    pd.testing.assert_frame_equal(LazyIndicatorFrame(bars).compute(columns), full[columns], check_exact=True)
+    pd.testing.assert_frame_equal(calculate_technical_indicators(bars, columns=columns),
+                                  full[list(bars.columns) + columns], check_exact=True)
+
+
+def test_shared_bollinger_parts_are_identical_to_talib(bars):
+    upper, middle, lower = talib.BBANDS(bars['close'].to_numpy(), timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
+    result = LazyIndicatorFrame(bars).compute(['BB_upper', 'BB_middle', 'BB_lower'])
+    np.testing.assert_array_equal(result.to_numpy(), np.column_stack([upper, middle, lower]))
+
+
+def test_only_requested_specs_are_computed(bars):
+    cache = IndicatorCache()
+    frame = LazyIndicatorFrame(bars, ticker='T0', cache=cache)
+    frame.compute(['BB_upper'])
+    # BBANDS plus its SMA_20 and STDDEV_20 inputs
+    assert cache.computations == 3
+
+    frame.compute(['BB_lower', 'SMA_20'])
+    LazyIndicatorFrame(bars, ticker='T0', cache=cache).compute(['BB_middle'])
+    assert cache.computations == 3
+
+    LazyIndicatorFrame(bars * 1.01, ticker='T0', cache=cache).compute(['BB_middle'])
+    assert cache.computations == 6
+
+
+def test_custom_spec_without_params(bars):
+    registry = dict(INDICATOR_REGISTRY)
+    spec = register_indicator(IndicatorSpec('RANGE', ('RANGE',), np.subtract, inputs=('high', 'low')), registry)
+    assert spec.params is None
+
+    result = LazyIndicatorFrame(bars, registry=registry)['RANGE']
+    np.testing.assert_array_equal(result, bars['high'] - bars['low'])
+    with pytest.raises(ValueError):
+        register_indicator(IndicatorSpec('RANGE_2', ('RANGE',), np.subtract), registry)
@@ -0,0 +1,70 @@
+"""
+Tests of the pipeline instrumentation.
+"""
+
+import threading
+
+import pandas as pd
+
+from src.instrumentation import PipelineProfiler, stage
+
+
+FRAME = pd.DataFrame({'a': range(10)})
+
+
+def copy_frames(n):
+    for _ in range(n):
+        FRAME.copy()
+
+
+def test_copies_are_counted_per_stage():
+    with PipelineProfiler(track_memory=False) as profiler:
+        with stage('outer'):
+            copy_frames(2)
+            with stage('inner'):
+                copy_frames(3)
+
+    copies = profiler.report().set_index('stage')['dataframe_copies']
+    assert copies['inner'] == 3
+    assert copies['outer'] == 5
+
+
+def test_copy_is_restored_after_exit():
+    original = pd.DataFrame.copy
+    try:
+        with PipelineProfiler(track_memory=False):
+            assert pd.DataFrame.copy is not original
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert pd.DataFrame.copy is original
+
+
+def test_concurrent_profilers_record_only_their_own_thread():
+    original = pd.DataFrame.copy
+    counts = {}
+    barrier = threading.Barrier(4)
+
+    def profiled(n):
+        with PipelineProfiler(track_memory=False) as profiler:
+            # Every profiler is entered before any thread starts its stage
+            barrier.wait()
+            with stage('copies'):
+                copy_frames(n)
+            barrier.wait()
+        counts[n] = profiler.report()['dataframe_copies'].tolist()
+
+    def unprofiled():
+        barrier.wait()
+        copy_frames(50)
+        barrier.wait()
+
+    threads = [threading.Thread(target=profiled, args=(n,)) for n in (1, 2, 3)]
+    threads.append(threading.Thread(target=unprofiled))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counts == {1: [1], 2: [2], 3: [3]}
+    assert pd.DataFrame.copy is original
@@ -0,0 +1,68 @@
+"""
+Parity tests of the lexicon sentiment backend against TextBlob.
+"""
+
+import numpy as np
+import pytest
+from textblob import en
+
+from scripts.benchmark_lexicon_sentiment import make_varied_headlines
+from src.lexicon_sentiment import get_lexicon_scorer, pattern_tokens
+from src.sentiment_analysis import analyze_sentiment_textblob, score_sentiment_batch
+
+
+RULE_CASES = [
+    'not very good',
+    'not a great quarter',
+    'really not good',
+    'very no good',
+    "isn't good",
+    'Great!!',
+    'good :) but :d',
+    'very :) good',
+    'Shares (!) surge',
+    'not, good',
+    'extremely   bad... U.S. stocks',
+    'good\n\nnot bad',
+    '',
+]
+
+
+def _textblob_scores(texts):
+    return np.array([analyze_sentiment_textblob(text) for text in texts]).reshape(-1, 2)
+
+
+@pytest.mark.parametrize('text', RULE_CASES)
+def test_rules_match_textblob(text):
+    polarity, subjectivity = get_lexicon_scorer().score([text])
+    expected = _textblob_scores([text])
+    np.testing.assert_allclose([polarity[0], subjectivity[0]], expected[0], atol=1e-12)
+
+
+def test_tokens_match_pattern_tokenizer():
+    tokenizer = en.sentiment.tokenizer
+    for text in make_varied_headlines(2000, seed=1):
+        expected = [w.lower() for w in ' '.join(tokenizer(text)).split()]
+        assert pattern_tokens(text) == expected, text
+
+
+def test_varied_corpus_matches_textblob():
+    texts = make_varied_headlines(5000, seed=2)
+    polarity, subjectivity = get_lexicon_scorer().score(texts)
+    expected = _textblob_scores(texts)
+    np.testing.assert_allclose(polarity, expected[:, 0], atol=1e-12)
+    np.testing.assert_allclose(subjectivity, expected[:, 1], atol=1e-12)
+
+
+def test_missing_texts_score_zero():
+    polarity, subjectivity = get_lexicon_scorer().score([None, np.nan, 'good'])
+    np.testing.assert_array_equal(polarity[:2], 0.0)
+    np.testing.assert_array_equal(subjectivity[:2], 0.0)
+
+
+def test_batch_scores_do_not_depend_on_chunks():
+    texts = make_varied_headlines(1500, seed=3)
+    whole = score_sentiment_batch(texts, backend='lexicon')
+    chunked = score_sentiment_batch(texts, backend='lexicon', n_workers=2, chunk_size=100)
+    for got, want in zip(chunked, whole):
+        np.testing.assert_array_equal(got, want)
@@ -0,0 +1,51 @@
+"""
+Tests of the stock-partitioned correlation paths against the in-memory functions.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.correlation_analysis import analyze_correlation_by_stock, analyze_lag_correlation
+from src.partitioned_correlation import PartitionedPanel
+
+from .synthetic_data import make_merged_panel
+
+
+@pytest.fixture(scope='module')
+def merged():
+    df = make_merged_panel(6000, n_stocks=40, seed=4)
+    rng = np.random.default_rng(4)
+    df.loc[rng.random(len(df)) < 0.05, 'avg_sentiment'] = np.nan
+    df.loc[rng.random(len(df)) < 0.05, 'daily_return'] = np.nan
+    return df.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def ordered(df, columns):
+    return df.sort_values(columns).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_partitioned_panel_matches_in_memory(merged, tmp_path, n_workers):
+    chunks = (merged.iloc[start:start + 1500] for start in range(0, len(merged), 1500))
+    panel = PartitionedPanel.write(chunks, tmp_path / 'panel', n_partitions=5, n_workers=n_workers)
+
+    pd.testing.assert_frame_equal(ordered(panel.correlation_by_stock(), ['Stock']),
+                                  ordered(analyze_correlation_by_stock(merged), ['Stock']),
+                                  check_dtype=False, atol=1e-12)
+    pd.testing.assert_frame_equal(panel.lag_correlation().reset_index(drop=True),
+                                  analyze_lag_correlation(merged).reset_index(drop=True),
+                                  check_dtype=False, atol=1e-12)
+    pd.testing.assert_frame_equal(ordered(panel.lag_correlation(by_stock=True), ['Stock', 'Lag']),
+                                  ordered(analyze_lag_correlation(merged, by_stock=True), ['Stock', 'Lag']),
+                                  check_dtype=False, atol=1e-12)
+
+
+def test_partitions_can_be_written_from_a_csv(merged, tmp_path):
+    path = tmp_path / 'merged.csv'
+    merged.to_csv(path, index=False)
+    panel = PartitionedPanel.write(path, tmp_path / 'panel', n_partitions=3, chunksize=2000)
+
+    pd.testing.assert_frame_equal(ordered(panel.correlation_by_stock(), ['Stock']),
+                                  ordered(analyze_correlation_by_stock(merged), ['Stock']),
+                                  check_dtype=False, atol=1e-12)
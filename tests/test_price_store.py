@@ -0,0 +1,95 @@
+"""
+Tests of the Parquet price store, with a local stand-in for the downloader.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.price_store import PriceStore, missing_intervals
+
+
+class StandInFetcher:
+    """Returns deterministic business-day OHLCV rows and records every request."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        dates = pd.bdate_range(start, end - pd.Timedelta(days=1))
+        close = 100 + np.arange(len(dates)) + dates.day / 100
+        return pd.DataFrame({'date': dates, 'Open': close - 1, 'High': close + 1,
+                             'Low': close - 2, 'Close': close, 'Volume': 1000})
+
+
+@pytest.fixture
+def fetcher():
+    return StandInFetcher()
+
+
+@pytest.fixture
+def store(tmp_path, fetcher):
+    return PriceStore(tmp_path / 'prices', fetcher)
+
+
+def ts(value):
+    return pd.Timestamp(value)
+
+
+def test_missing_intervals():
+    covered = [(ts('2024-01-10'), ts('2024-01-20'))]
+    assert missing_intervals(ts('2024-01-01'), ts('2024-01-31'), covered) == [
+        (ts('2024-01-01'), ts('2024-01-10')), (ts('2024-01-20'), ts('2024-01-31'))]
+    assert missing_intervals(ts('2024-01-12'), ts('2024-01-15'), covered) == []
+
+
+def test_only_missing_ranges_are_fetched(store, fetcher):
+    store.ensure('AAPL', '2024-02-01', '2024-03-01')
+    fetcher.calls.clear()
+
+    store.ensure('AAPL', '2024-01-01', '2024-04-01')
+    assert fetcher.calls == [
+        ('AAPL', ts('2024-01-01'), ts('2024-02-01')),
+        ('AAPL', ts('2024-03-01'), ts('2024-04-01')),
+    ]
+
+
+def test_second_identical_call_does_not_fetch(store, fetcher):
+    first = store.get('AAPL', '2024-01-01', '2024-03-01')
+    second = store.get('AAPL', '2024-01-01', '2024-03-01')
+
+    assert len(fetcher.calls) == 1
+    assert store.ensure('AAPL', '2024-01-01', '2024-03-01') == 0
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_coverage_is_persisted_and_reloaded(tmp_path, fetcher):
+    root = tmp_path / 'prices'
+    PriceStore(root, fetcher).ensure('MSFT', '2024-01-01', '2024-02-01')
+    PriceStore(root, fetcher).ensure('MSFT', '2024-02-01', '2024-03-01')
+
+    with open(root / 'ticker=MSFT' / 'coverage.json') as f:
+        assert json.load(f) == [['2024-01-01T00:00:00', '2024-03-01T00:00:00']]
+
+    reopened = PriceStore(root, fetcher)
+    assert reopened.coverage('MSFT') == [(ts('2024-01-01'), ts('2024-03-01'))]
+    fetcher.calls.clear()
+    reopened.get('MSFT', '2024-01-15', '2024-02-15')
+    assert fetcher.calls == []
+
+
+def test_load_filters_start_and_end(store, fetcher):
+    store.ensure('AAPL', '2024-01-01', '2024-04-01')
+    df = store.load('AAPL', '2024-02-05', '2024-02-10')
+
+    expected = fetcher('AAPL', ts('2024-01-01'), ts('2024-04-01'))
+    expected = expected[(expected['date'] >= '2024-02-05') & (expected['date'] < '2024-02-10')]
+    pd.testing.assert_frame_equal(df, expected.reset_index(drop=True), check_dtype=False)
+    assert list(df['date']) == list(pd.bdate_range('2024-02-05', '2024-02-09'))
+
+
+def test_unknown_ticker_loads_empty(store):
+    assert store.load('NONE', '2024-01-01', '2024-02-01').empty
@@ -0,0 +1,77 @@
+"""
+Tests of rolling, expanding and streaming sentiment/return correlations.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rolling_correlation import StreamingCorrelation, rolling_correlation
+
+
+@pytest.fixture(scope='module')
+def merged():
+    """12 stocks over 150 days, with missing pairs and stocks listed late."""
+    rng = np.random.default_rng(2)
+    dates = pd.bdate_range('2023-01-02', periods=150)
+    stocks = [f"S{i:02d}" for i in range(12)]
+    index = pd.MultiIndex.from_product([stocks, dates], names=['stock', 'date'])
+    df = index.to_frame(index=False)
+    df['avg_sentiment'] = rng.normal(0, 0.3, len(df))
+    df['daily_return'] = 0.01 * df['avg_sentiment'] + rng.normal(0, 0.02, len(df))
+
+    df.loc[rng.random(len(df)) < 0.1, 'avg_sentiment'] = np.nan
+    df.loc[rng.random(len(df)) < 0.1, 'daily_return'] = np.nan
+    late = (df['stock'] == 'S11') & (df['date'] < dates[40])
+    return df[~late & (rng.random(len(df)) > 0.05)].sample(frac=1, random_state=0)
+
+
+def pandas_rolling(df, window, min_periods):
+    x = df.pivot(index='date', columns='stock', values='avg_sentiment')
+    y = df.pivot(index='date', columns='stock', values='daily_return')
+    if window is None:
+        return x.expanding(min_periods=min_periods).corr(y)
+    return x.rolling(window, min_periods=min_periods).corr(y)
+
+
+@pytest.mark.parametrize('window', [20, 60, None])
+def test_matches_pandas_rolling_corr(merged, window):
+    result = rolling_correlation(merged, window=window, min_periods=10)
+    expected = pandas_rolling(merged, window, min_periods=10)
+
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-10, equal_nan=True)
+    assert result.notna().to_numpy().sum() > 0.8 * result.size
+
+
+@pytest.mark.parametrize('window', [20, None])
+def test_pooled_matches_window_corrcoef(merged, window):
+    result = rolling_correlation(merged, window=window, min_periods=10, pooled=True)
+
+    df = merged.dropna(subset=['avg_sentiment', 'daily_return'])
+    dates = result.index
+    for i in range(0, len(dates), 7):
+        first = dates[0] if window is None else dates[max(i - window + 1, 0)]
+        rows = df[(df['date'] >= first) & (df['date'] <= dates[i])]
+        if len(rows) < 10:
+            assert np.isnan(result.iloc[i])
+            continue
+        expected = np.corrcoef(rows['avg_sentiment'], rows['daily_return'])[0, 1]
+        assert result.iloc[i] == pytest.approx(expected, abs=1e-10)
+
+
+@pytest.mark.parametrize('window', [20, None])
+def test_streaming_matches_batch(merged, window):
+    batch = rolling_correlation(merged, window=window, min_periods=10)
+    stream = StreamingCorrelation(batch.columns, window=window, min_periods=10)
+
+    for date, day in merged.sort_values('date').groupby('date'):
+        day = day.set_index('stock')
+        streamed = stream.update(day['avg_sentiment'], day['daily_return'])
+        np.testing.assert_allclose(streamed.to_numpy(), batch.loc[date].to_numpy(),
+                                   atol=1e-9, equal_nan=True)
+
+
+def test_duplicate_pairs_raise(merged):
+    duplicated = pd.concat([merged, merged.iloc[:1]])
+    with pytest.raises(ValueError, match='1 \\(date, stock\\) pairs have several rows'):
+        rolling_correlation(duplicated)
@@ -0,0 +1,75 @@
+"""
+Parity tests of the batched and streamed sentiment paths against per-row
+scoring and the in-memory aggregation.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.benchmark_lexicon_sentiment import make_varied_headlines
+from scripts.benchmark_sentiment import make_headlines
+from src.sentiment_analysis import (
+    aggregate_daily_sentiment,
+    analyze_sentiment_textblob,
+    apply_sentiment_analysis,
+    classify_sentiment,
+    score_sentiment_batch,
+    stream_daily_sentiment,
+)
+
+
+STOCKS = ['AAPL', 'AMZN', 'GOOG', 'MSFT', 'NVDA', 'TSLA']
+
+
+def make_news(n_rows, seed=0):
+    """Articles over 60 days with varied headlines, some of them missing."""
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(0, 60 * 86400, n_rows)
+    dates = pd.Timestamp('2020-01-01', tz='Etc/GMT+4') + pd.to_timedelta(seconds, unit='s')
+    news = pd.DataFrame({
+        'headline': make_varied_headlines(n_rows, seed=seed),
+        'url': [f"https://www.example.com/news/{i}" for i in range(n_rows)],
+        'date': dates.strftime('%Y-%m-%d %H:%M:%S-04:00'),
+        'stock': np.array(STOCKS, dtype=object)[rng.integers(0, len(STOCKS), n_rows)],
+    })
+    news.loc[news.index[::97], 'headline'] = None
+    return news
+
+
+def assert_daily_equal(result, expected):
+    def ordered(df):
+        return df.sort_values(['stock', 'date']).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(ordered(result), ordered(expected), check_dtype=False, atol=1e-12)
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_batch_scores_match_per_row_scoring(n_workers):
+    texts = pd.Series(make_headlines(400, seed=1))
+    texts.iloc[::37] = None
+    polarity, subjectivity, labels = score_sentiment_batch(texts, n_workers=n_workers, chunk_size=64)
+
+    expected = [analyze_sentiment_textblob(text) for text in texts]
+    np.testing.assert_array_equal(polarity, [p for p, _ in expected])
+    np.testing.assert_array_equal(subjectivity, [s for _, s in expected])
+    assert list(labels) == [classify_sentiment(p) for p, _ in expected]
+
+
+def test_apply_keeps_rows_and_index():
+    news = pd.DataFrame({'headline': make_headlines(300, seed=2)}, index=pd.RangeIndex(1000, 1300))
+    result = apply_sentiment_analysis(news, n_workers=2, chunk_size=50)
+
+    pd.testing.assert_index_equal(result.index, news.index)
+    expected = [analyze_sentiment_textblob(text)[0] for text in news['headline']]
+    np.testing.assert_array_equal(result['sentiment_polarity'], expected)
+
+
+def test_stream_matches_in_memory_aggregation(tmp_path):
+    news = make_news(1500, seed=6)
+    path = tmp_path / 'news.csv'
+    news.to_csv(path, index=False)
+
+    streamed = stream_daily_sentiment(path, chunksize=250, backend='lexicon')
+    expected = aggregate_daily_sentiment(apply_sentiment_analysis(news, backend='lexicon'))
+    assert_daily_equal(streamed, expected)
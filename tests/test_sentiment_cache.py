@@ -0,0 +1,90 @@
+"""
+Tests of the content-addressed sentiment cache.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.lexicon_sentiment import SCORER_VERSION as LEXICON_SCORER_VERSION
+from src.sentiment_analysis import score_sentiment_batch, score_sentiment_cached
+from src.sentiment_cache import DEFAULT_SCORER_VERSION, SentimentCache, normalize_text, text_key
+
+
+HEADLINES = pd.Series([
+    'Stocks surge after strong earnings :D',
+    'stocks surge after strong earnings :d',
+    'Stocks   surge after  strong earnings :D',
+    'Shares fall on weak guidance',
+    None,
+])
+
+
+def test_normalize_text_keeps_case_and_collapses_whitespace():
+    assert normalize_text('  Great \t results :D ') == 'Great results :D'
+    assert normalize_text(None) == ''
+    assert text_key(':D') != text_key(':d')
+
+
+def test_keys_depend_on_backend():
+    assert text_key('good news', 'textblob') != text_key('good news', 'lexicon')
+
+
+def test_scorer_version_covers_both_backends():
+    assert DEFAULT_SCORER_VERSION.startswith('textblob')
+    assert DEFAULT_SCORER_VERSION.endswith(f"+lexicon-{LEXICON_SCORER_VERSION}")
+
+
+def test_cached_scores_match_uncached():
+    cache = SentimentCache()
+    for backend in ('textblob', 'lexicon'):
+        expected = score_sentiment_batch(HEADLINES, backend=backend)
+        cached = score_sentiment_cached(HEADLINES, cache, backend=backend)
+        for got, want in zip(cached, expected):
+            np.testing.assert_array_equal(got, want)
+
+
+def test_backends_do_not_share_entries():
+    cache = SentimentCache()
+    score_sentiment_cached(HEADLINES, cache, backend='textblob')
+    misses = cache.misses
+
+    score_sentiment_cached(HEADLINES, cache, backend='lexicon')
+    assert cache.misses == 2 * misses
+
+    score_sentiment_cached(HEADLINES, cache, backend='lexicon')
+    assert cache.misses == 2 * misses
+
+
+def test_whitespace_variants_share_one_entry():
+    cache = SentimentCache()
+    score_sentiment_cached(HEADLINES, cache)
+    # Rows 0 and 2 differ only in whitespace; rows 0 and 1 differ in case
+    assert cache.stats()['memory_items'] == 4
+
+
+def test_sqlite_store_is_reloaded(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    with SentimentCache(path) as cache:
+        polarity, _, _ = score_sentiment_cached(HEADLINES, cache)
+
+    with SentimentCache(path) as cache:
+        reloaded, _, _ = score_sentiment_cached(HEADLINES, cache)
+        assert cache.misses == 0
+    np.testing.assert_array_equal(reloaded, polarity)
+
+    with SentimentCache(path, scorer_version='other') as cache:
+        score_sentiment_cached(HEADLINES, cache)
+        assert cache.hits == 0
+
+
+def test_invalidate_drops_entries_of_other_versions(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    with SentimentCache(path, scorer_version='old') as cache:
+        score_sentiment_cached(HEADLINES, cache)
+
+    with SentimentCache(path, scorer_version='new', max_memory_items=2) as cache:
+        # Rows 0-2 replace two of the four entries; the other two are stale
+        score_sentiment_cached(HEADLINES.iloc[:3], cache)
+        assert cache.stats()['memory_items'] == 2
+        assert cache.invalidate() == 2
+        assert len(cache) == 2
@@ -0,0 +1,45 @@
+"""
+Tests of the incremental daily sentiment store against a full recompute.
+"""
+
+import pandas as pd
+
+from src.sentiment_analysis import aggregate_daily_sentiment, apply_sentiment_analysis
+from src.sentiment_store import DailySentimentStore
+
+from .test_sentiment_analysis import assert_daily_equal, make_news
+
+
+def recompute(news):
+    return aggregate_daily_sentiment(apply_sentiment_analysis(news, backend='lexicon'))
+
+
+def test_store_matches_full_recompute(tmp_path):
+    news = make_news(1500, seed=6)
+    first, second = news.iloc[:1000], news.iloc[800:].copy()
+    # Overlapping articles, one of them edited after the first ingest
+    second.loc[second.index[0], 'headline'] = 'Shares are really not good :('
+
+    with DailySentimentStore(tmp_path / 'daily.sqlite') as store:
+        store.update(first, backend='lexicon')
+        stats = store.update(second, lookback=None, backend='lexicon')
+        result = store.to_frame()
+
+    assert stats['changed'] == 1
+    assert stats['unchanged'] == 199
+    final = pd.concat([first, second]).drop_duplicates(['url', 'stock'], keep='last')
+    assert_daily_equal(result, recompute(final))
+
+
+def test_store_is_reopened_with_its_state(tmp_path):
+    news = make_news(600, seed=7)
+    path = tmp_path / 'daily.sqlite'
+    with DailySentimentStore(path) as store:
+        store.update(news.iloc[:300], backend='lexicon')
+
+    with DailySentimentStore(path) as store:
+        stats = store.update(news, lookback=None, backend='lexicon')
+        result = store.to_frame()
+
+    assert stats['unchanged'] == 300
+    assert_daily_equal(result, recompute(news))
@@ -0,0 +1,44 @@
+"""
+Parity tests of the vectorized signal classifiers against the scalar rules.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.sentiment_analysis import classify_sentiment
+from src.signals import macd_signals, rsi_signals, sentiment_categories, trend_signals
+from src.technical_analysis import get_macd_signal, get_rsi_signal, get_trend_signal
+
+
+def test_signals_match_scalar_rules():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 100, (4, 500))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    rsi, close, sma_50, sma_200 = values
+    polarity = (values[0] - 50) / 250
+
+    assert list(rsi_signals(rsi, nan_label='Neutral')) == [get_rsi_signal(v) for v in rsi]
+    assert list(macd_signals(close, sma_50, nan_label='Bearish')) == [
+        get_macd_signal(m, s) for m, s in zip(close, sma_50)]
+    assert list(trend_signals(close, sma_50, sma_200, nan_label='Sideways')) == [
+        get_trend_signal(c, f, s) for c, f, s in zip(close, sma_50, sma_200)]
+    assert list(sentiment_categories(polarity, nan_label='Neutral')) == [classify_sentiment(p) for p in polarity]
+
+
+def test_missing_inputs_get_a_missing_label():
+    rsi = pd.Series([25.0, np.nan, 75.0], index=[5, 6, 7])
+    labels = rsi_signals(rsi)
+
+    assert list(labels.index) == [5, 6, 7]
+    assert labels.isna().tolist() == [False, True, False]
+    assert labels.cat.codes.dtype == np.int8
+
+
+def test_matrices_keep_their_labels():
+    closes = pd.DataFrame({'A': [1.0, 3.0], 'B': [2.0, np.nan]}, index=['d1', 'd2'])
+    averages = pd.DataFrame({'A': [2.0, 2.0], 'B': [1.0, 1.0]}, index=['d1', 'd2'])
+    labels = macd_signals(closes, averages)
+
+    assert labels.loc['d1', 'A'] == get_macd_signal(1.0, 2.0)
+    assert labels.loc['d2', 'A'] == get_macd_signal(3.0, 2.0)
+    assert pd.isna(labels.loc['d2', 'B'])
@@ -0,0 +1,83 @@
+"""
+Tests of the bootstrap/permutation significance tests and FDR control.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.correlation_analysis import benjamini_hochberg
+from src.significance import correlation_significance
+
+
+RESAMPLE_COLUMNS = ['Stock', 'Pearson_Correlation', 'CI_Lower', 'CI_Upper', 'Permutation_P_Value']
+
+
+@pytest.fixture(scope='module')
+def panel():
+    """40 stocks with 60 days each; the first 10 have a strong correlation."""
+    rng = np.random.default_rng(11)
+    n_stocks, n_days = 40, 60
+    sentiment = rng.normal(0, 1, (n_stocks, n_days))
+    effect = np.where(np.arange(n_stocks) < 10, 1.0, 0.0)[:, None]
+    returns = effect * sentiment + rng.normal(0, 1, (n_stocks, n_days))
+    return pd.DataFrame({
+        'stock': np.repeat([f"S{i:02d}" for i in range(n_stocks)], n_days),
+        'avg_sentiment': sentiment.ravel(),
+        'daily_return': returns.ravel(),
+    })
+
+
+def significance(df, **kwargs):
+    kwargs = {'n_resamples': 999, 'seed': 7, **kwargs}
+    return correlation_significance(df, **kwargs).sort_values('Stock').reset_index(drop=True)
+
+
+def test_equal_seeds_give_equal_results(panel):
+    pd.testing.assert_frame_equal(significance(panel), significance(panel))
+    assert not significance(panel, seed=8)['CI_Lower'].equals(significance(panel)['CI_Lower'])
+
+
+def test_results_do_not_depend_on_workers(panel):
+    serial = significance(panel, n_workers=1, stocks_per_task=40)
+    parallel = significance(panel, n_workers=2, stocks_per_task=3)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_stock_results_do_not_depend_on_other_stocks(panel):
+    full = significance(panel).set_index('Stock')
+    subset = panel[panel['stock'].isin(['S03', 'S17', 'S29'])]
+    # Reversing the stock order changes the codes, not the per-stock streams
+    subset = pd.concat([group for _, group in subset.groupby('stock')][::-1])
+    partial = significance(subset).set_index('Stock')
+
+    pd.testing.assert_frame_equal(partial[RESAMPLE_COLUMNS[1:]], full.loc[partial.index, RESAMPLE_COLUMNS[1:]])
+
+
+def test_fdr_flags_the_correlated_stocks(panel):
+    result = significance(panel).set_index('Stock')
+    truly_correlated = [f"S{i:02d}" for i in range(10)]
+
+    assert (result.loc[truly_correlated, 'Significant'] == 'Yes').all()
+    false_discoveries = (result.drop(truly_correlated)['Significant'] == 'Yes').sum()
+    assert false_discoveries <= 2
+    assert (result['CI_Lower'] <= result['Pearson_Correlation']).all()
+    assert (result['Pearson_Correlation'] <= result['CI_Upper']).all()
+
+
+def test_benjamini_hochberg_matches_scipy():
+    p_values = np.random.default_rng(0).uniform(0, 0.2, 200) ** 2
+    np.testing.assert_allclose(benjamini_hochberg(p_values), stats.false_discovery_control(p_values))
+
+    with_nan = np.array([0.01, np.nan, 0.04, 0.03])
+    expected = stats.false_discovery_control(with_nan[~np.isnan(with_nan)])
+    np.testing.assert_allclose(benjamini_hochberg(with_nan)[~np.isnan(with_nan)], expected)
+    assert np.isnan(benjamini_hochberg(with_nan)[1])
+
+
+def test_pearson_matches_scipy(panel):
+    result = significance(panel).set_index('Stock')
+    for stock, group in panel.groupby('stock'):
+        expected = stats.pearsonr(group['avg_sentiment'], group['daily_return'])[0]
+        assert result.loc[stock, 'Pearson_Correlation'] == pytest.approx(expected, abs=1e-12)
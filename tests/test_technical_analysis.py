@@ -0,0 +1,241 @@
+"""
+Tests of the concurrent downloader, and parity tests of the indicator and
+financial metric fast paths against direct TA-Lib calls and the per-ticker
+functions.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+import src.technical_analysis as technical_analysis
+from src.technical_analysis import (
+    INDICATOR_COLUMNS,
+    TokenBucket,
+    calculate_financial_metrics,
+    calculate_financial_metrics_panel,
+    calculate_technical_indicators,
+    calculate_technical_indicators_panel,
+    download_stock_data,
+    download_stock_data_report,
+)
+
+
+SUMMARY_METRICS = ['total_return', 'volatility', 'sharpe_ratio', 'max_drawdown', 'avg_daily_return']
+
+START, END = datetime(2024, 1, 1), datetime(2024, 2, 1)
+
+
+def make_bars(n_days, seed=0):
+    """Random-walk daily OHLCV bars indexed by date."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_days)))
+    spread = np.abs(rng.normal(0, 0.005, n_days)) * close
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.2, n_days),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(100000, 1000000, n_days).astype(float),
+    }, index=pd.bdate_range('2015-01-01', periods=n_days, name='date'))
+
+
+# Downloads
+
+class FakeClock:
+    """Stands in for the `time` module: `sleep` advances `monotonic` instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FlakyFetcher:
+    """Fails the first `failures[ticker]` calls for each ticker, then returns bars."""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.calls = Counter()
+
+    def __call__(self, ticker, start, end):
+        self.calls[ticker] += 1
+        if self.calls[ticker] <= self.failures.get(ticker, 0):
+            raise ConnectionError('connection reset')
+        return make_bars(5).reset_index()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(technical_analysis, 'time', clock)
+    return clock
+
+
+def test_failed_attempts_are_retried_with_exponential_backoff(clock):
+    fetcher = FlakyFetcher({'AAPL': 2})
+    data, failures = download_stock_data_report(['AAPL'], START, END, fetcher=fetcher,
+                                                max_retries=3, backoff=0.5)
+
+    assert list(data) == ['AAPL']
+    assert failures.empty
+    assert fetcher.calls['AAPL'] == 3
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_permanent_failures_are_reported(clock, caplog):
+    fetcher = FlakyFetcher({'BAD': 100})
+    data, failures = download_stock_data_report(['AAPL', 'BAD', 'MSFT'], START, END, fetcher=fetcher,
+                                                max_workers=1, max_retries=2, backoff=1.0)
+
+    assert sorted(data) == ['AAPL', 'MSFT']
+    assert failures.to_dict('records') == [
+        {'ticker': 'BAD', 'attempts': 3, 'error': 'ConnectionError: connection reset'}]
+    assert clock.sleeps == [1.0, 2.0]
+
+    with caplog.at_level(logging.WARNING, logger='src.technical_analysis'):
+        assert sorted(download_stock_data(['AAPL', 'BAD'], START, END, fetcher=fetcher)) == ['AAPL']
+    assert 'Error downloading BAD after 1 attempts' in caplog.text
+
+
+def test_empty_results_are_not_retried(clock):
+    def fetcher(ticker, start, end):
+        return pd.DataFrame()
+
+    _, failures = download_stock_data_report(['AAPL'], START, END, fetcher=fetcher, max_retries=3)
+    assert failures.to_dict('records') == [{'ticker': 'AAPL', 'attempts': 1, 'error': 'No data returned'}]
+    assert clock.sleeps == []
+
+
+def test_concurrent_downloads_keep_ticker_order():
+    tickers = [f"T{i}" for i in range(12)]
+    fetcher = FlakyFetcher({'T3': 1, 'T7': 100})
+    data, failures = download_stock_data_report(tickers, START, END, fetcher=fetcher, max_workers=4,
+                                                max_retries=1, backoff=0.0)
+
+    assert list(data) == [ticker for ticker in tickers if ticker != 'T7']
+    assert list(failures['ticker']) == ['T7']
+    assert fetcher.calls['T3'] == 2
+
+
+def test_token_bucket_allows_bursts_then_waits(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [0.5]
+
+    # Idle time refills the bucket up to its capacity only
+    clock.now += 10
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_rate_limit_spaces_download_attempts(clock):
+    download_stock_data_report(['A', 'B', 'C', 'D'], START, END, fetcher=FlakyFetcher(),
+                               max_workers=1, requests_per_second=2.0)
+    # Two attempts fit in the initial burst, the others wait half a second each
+    assert clock.sleeps == [0.5, 0.5]
+    assert clock.now == 1.0
+
+
+def test_token_bucket_rejects_non_positive_rates():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+# Indicators
+
+@pytest.fixture(scope='module')
+def panel():
+    """Long OHLCV panel of 5 tickers; later tickers start later and rows are shuffled."""
+    frames = [make_bars(400, seed=i).iloc[40 * i:].reset_index().assign(ticker=f"T{i}") for i in range(5)]
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=3)
+
+
+@pytest.fixture(scope='module')
+def bars():
+    return make_bars(400, seed=9)
+
+
+def talib_indicators(df):
+    """Indicator columns from direct TA-Lib calls, as the original implementation made them."""
+    high, low, close, volume = (df[col].to_numpy(dtype=float) for col in ('high', 'low', 'close', 'volume'))
+    macd = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+    bbands = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
+    stoch = talib.STOCH(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3)
+    columns = [
+        talib.SMA(close, timeperiod=20), talib.SMA(close, timeperiod=50), talib.SMA(close, timeperiod=200),
+        talib.EMA(close, timeperiod=12), talib.EMA(close, timeperiod=26), talib.RSI(close, timeperiod=14),
+        *macd, *bbands, *stoch, talib.ATR(high, low, close, timeperiod=14), talib.OBV(close, volume),
+        talib.ADX(high, low, close, timeperiod=14),
+    ]
+    return pd.DataFrame(dict(zip(INDICATOR_COLUMNS, columns)), index=df.index)
+
+
+def test_indicators_are_identical_to_talib(bars):
+    result = calculate_technical_indicators(bars)
+    pd.testing.assert_frame_equal(result[INDICATOR_COLUMNS], talib_indicators(bars), check_exact=True)
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_indicator_panel_matches_per_ticker(panel, n_workers):
+    result = calculate_technical_indicators_panel(panel, n_workers=n_workers, tickers_per_task=2)
+
+    for ticker, frame in panel.groupby('ticker'):
+        expected = calculate_technical_indicators(frame.drop(columns='ticker').sort_values('date').set_index('date'))
+        pd.testing.assert_frame_equal(result.loc[ticker], expected[result.columns], check_names=False,
+                                      check_exact=True)
+
+
+# Financial metrics
+
+def test_summary_metrics_match_full_metrics(bars):
+    full = calculate_financial_metrics(bars)
+    summary = calculate_financial_metrics(bars, summary_only=True)
+    assert set(summary) == set(SUMMARY_METRICS)
+    for name in SUMMARY_METRICS:
+        assert summary[name] == pytest.approx(full[name], rel=1e-9, abs=1e-12), name
+
+
+@pytest.mark.filterwarnings('ignore:The default fill_method:FutureWarning')
+def test_metrics_panel_matches_per_ticker(panel):
+    closes = panel.pivot(index='date', columns='ticker', values='close')
+    # An interior gap is forward-filled like pct_change does
+    closes.iloc[300, 0] = np.nan
+    result = calculate_financial_metrics_panel(closes)
+
+    for ticker in closes.columns:
+        prices = closes[ticker].loc[closes[ticker].first_valid_index():]
+        expected = calculate_financial_metrics(prices.to_frame('close'))
+        for name in SUMMARY_METRICS:
+            assert result.loc[ticker, name] == pytest.approx(expected[name], rel=1e-9, abs=1e-12, nan_ok=True), (ticker, name)
+
+
+@pytest.mark.filterwarnings('ignore:The default fill_method:FutureWarning')
+def test_leading_gap_followed_by_a_first_day_loss():
+    # The drawdown peak starts at the first valid return, not at 1.0 on the gap
+    closes = pd.DataFrame({'early': [100, 101, 99, 98, 103, 104.0],
+                           'late': [np.nan, 100, 90, 95, 99, 97]})
+    panel = calculate_financial_metrics_panel(closes)
+
+    for ticker in closes.columns:
+        frame = closes[[ticker]].rename(columns={ticker: 'close'})
+        full = calculate_financial_metrics(frame)
+        summary = calculate_financial_metrics(frame, summary_only=True)
+        for name in SUMMARY_METRICS:
+            assert summary[name] == pytest.approx(full[name], rel=1e-9, abs=1e-12, nan_ok=True), (ticker, name)
+            assert panel.loc[ticker, name] == pytest.approx(full[name], rel=1e-9, abs=1e-12, nan_ok=True), (ticker, name)
+
+    assert panel.loc['late', 'max_drawdown'] == pytest.approx(97 / 99 - 1)
@@ -0,0 +1,118 @@
+"""
+Tests of the sparse term-document index against `collections.Counter` and
+pandas groupby on a small corpus.
+"""
+
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.eda_utils import analyze_keyword_frequency, get_financial_keywords
+from src.term_index import TermDocumentIndex
+
+
+WORDS = ['stock', 'price', 'earnings', 'target', 'upgrade', 'fda', 'merger', 'buy', 'sell', 'market']
+
+
+@pytest.fixture(scope='module')
+def documents():
+    """Token lists with repeated terms, empty documents and a missing one."""
+    rng = np.random.default_rng(7)
+    docs = [list(rng.choice(WORDS, size=n, p=np.linspace(2, 0.2, len(WORDS)) / 11))
+            for n in rng.integers(0, 9, 300)]
+    docs[5] = None
+    return docs
+
+
+@pytest.fixture(scope='module')
+def index(documents):
+    return TermDocumentIndex.from_tokens(documents)
+
+
+@pytest.fixture(scope='module')
+def groups(documents):
+    rng = np.random.default_rng(8)
+    labels = rng.choice(['AAPL', 'MSFT', 'TSLA', None], size=len(documents), p=[0.4, 0.3, 0.2, 0.1])
+    return np.asarray(labels, dtype=object)
+
+
+def token_lists(documents):
+    return [doc if doc is not None else [] for doc in documents]
+
+
+def ngrams(doc, n):
+    return [' '.join(doc[i:i + n]) for i in range(len(doc) - n + 1)]
+
+
+def test_keyword_frequency_matches_per_keyword_scan(documents):
+    df = pd.DataFrame({'processed_tokens': documents})
+    keywords = get_financial_keywords() + WORDS + ['not-a-keyword']
+
+    result = analyze_keyword_frequency(df, keywords=keywords)
+
+    docs = token_lists(documents)
+    expected = {keyword: sum(1 for doc in docs if keyword in doc) for keyword in keywords}
+    assert dict(zip(result['Keyword'], result['Frequency'])) == expected
+    assert result['Frequency'].is_monotonic_decreasing
+
+
+@pytest.mark.parametrize('by', ['count', 'documents'])
+def test_top_terms_match_counter(documents, index, by):
+    docs = token_lists(documents)
+    if by == 'count':
+        counter = Counter(chain.from_iterable(docs))
+    else:
+        counter = Counter(chain.from_iterable(dict.fromkeys(doc) for doc in docs))
+
+    assert list(index.top_terms(5, by=by).items()) == counter.most_common(5)
+    assert list(index.top_terms(100, by=by).items()) == counter.most_common()
+
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_ngram_counts_match_counter(documents, index, n):
+    counter = Counter(chain.from_iterable(ngrams(doc, n) for doc in token_lists(documents)))
+
+    assert list(index.ngram_counts(n).items()) == counter.most_common()
+    assert list(index.ngram_counts(n, k=4).items()) == counter.most_common(4)
+
+
+def test_ngram_index_counts_documents(documents, index):
+    bigrams = index.ngrams(2)
+    counter = Counter(chain.from_iterable(dict.fromkeys(ngrams(doc, 2)) for doc in token_lists(documents)))
+    assert bigrams.n_documents == len(documents)
+    assert bigrams.document_frequency().to_dict() == dict(counter)
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_group_counts_match_groupby(documents, index, groups, binary):
+    exploded = pd.DataFrame({'group': groups, 'term': token_lists(documents), 'doc': range(len(documents))})
+    exploded = exploded.explode('term').dropna()
+    if binary:
+        exploded = exploded.drop_duplicates(['doc', 'term'])
+    expected = exploded.groupby(['group', 'term']).size().unstack(fill_value=0)
+
+    terms = WORDS + ['missing']
+    result = index.group_counts(groups, terms=terms, binary=binary)
+    expected = expected.reindex(index=result.index, columns=terms, fill_value=0)
+    pd.testing.assert_frame_equal(result, expected, check_names=False, check_dtype=False)
+
+    matrix, labels = index.group_counts(groups, binary=binary)
+    assert list(labels) == list(pd.unique(groups[pd.notna(groups)]))
+    assert matrix.sum() == len(exploded)
+
+
+def test_top_terms_by_group_match_counter(documents, index, groups):
+    docs = token_lists(documents)
+    first_seen = {term: i for i, term in enumerate(dict.fromkeys(chain.from_iterable(docs)))}
+
+    result = index.top_terms_by_group(groups, k=3)
+
+    for label in pd.unique(groups[pd.notna(groups)]):
+        counter = Counter(chain.from_iterable(doc for doc, group in zip(docs, groups) if group == label))
+        # Ties are broken by the term's first occurrence in the whole corpus
+        expected = sorted(counter.items(), key=lambda item: (-item[1], first_seen[item[0]]))[:3]
+        rows = result[result['group'] == label]
+        assert list(zip(rows['term'], rows['count'])) == expected
@@ -0,0 +1,64 @@
+"""
+Tests of the batch text preprocessing engine against `eda_utils.preprocess_text`.
+"""
+
+import numpy as np
+import pytest
+from nltk.tokenize import word_tokenize
+
+from scripts.benchmark_lexicon_sentiment import make_varied_headlines
+from scripts.benchmark_sentiment import make_headlines
+from src.eda_utils import preprocess_text
+from src.text_preprocessing import TextPreprocessor, preprocess_texts
+
+
+STOP_WORDS = {'the', 'a', 'an', 'and', 'of', 'on', 'to', 'with', 'after', 'that', 'is', 'not'}
+
+
+class SuffixLemmatizer:
+    """Deterministic stand-in for WordNet, so the tests do not need NLTK corpora."""
+
+    def lemmatize(self, word):
+        return word[:-1] if word.endswith('s') and len(word) > 3 else word
+
+
+def _has_punkt():
+    try:
+        word_tokenize('probe')
+    except LookupError:
+        return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def headlines():
+    texts = list(make_varied_headlines(3000, seed=4)) + list(make_headlines(1000, seed=4))
+    texts += ['Cannot stop, gonna rally', 'WANNA buy? gimme 5 shares', None, np.nan, '']
+    return texts
+
+
+def preprocessor():
+    return TextPreprocessor(STOP_WORDS, SuffixLemmatizer())
+
+
+def test_treebank_splits_and_filters():
+    tokens = preprocessor()("Cannot BEAT 52-week highs; gonna rally!")
+    assert tokens == ['can', 'beat', 'week', 'high', 'gon', 'rally']
+
+
+@pytest.mark.skipif(not _has_punkt(), reason='needs the NLTK punkt tokenizer data')
+def test_tokens_match_preprocess_text(headlines):
+    expected = [preprocess_text(text, STOP_WORDS, SuffixLemmatizer()) for text in headlines]
+    assert preprocessor().process_many(headlines) == expected
+
+
+def test_worker_pool_matches_serial(headlines):
+    serial = preprocess_texts(headlines, preprocessor=preprocessor())
+    pooled = preprocess_texts(headlines, n_workers=2, chunk_size=500, preprocessor=preprocessor())
+    assert pooled == serial
+
+
+def test_word_cache_is_bounded(headlines):
+    small = TextPreprocessor(STOP_WORDS, SuffixLemmatizer(), cache_size=16)
+    assert small.process_many(headlines) == preprocessor().process_many(headlines)
+    assert small.cache_info().currsize == 16
@@ -0,0 +1,82 @@
+"""
+Tests of news-to-session alignment with a trading calendar.
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from src.panel import effective_dates
+from src.sentiment_analysis import aggregate_daily_sentiment
+from src.trading_calendar import TradingCalendar, align_news_to_sessions
+
+
+@pytest.fixture
+def calendar():
+    # 2024-07-04 (Thursday) is a holiday
+    return TradingCalendar(holidays=['2024-07-04'], start='2024-07-01', end='2024-07-31')
+
+
+def test_mixed_offset_and_naive_timestamps(calendar):
+    timestamps = pd.Series([
+        '2024-07-01 10:30:00-04:00',  # same day
+        '2024-07-01 20:30:00',        # naive UTC, 16:30 New York: after the close
+        '2024-07-02T19:59:00Z',       # 15:59 New York
+        '2024-07-03 16:00:00-04:00',  # at the close, next day is a holiday
+        '2024-07-06 09:00:00-04:00',  # Saturday
+        'not a date',
+        None,
+        '2024-08-15 12:00:00-04:00',  # after the last session
+    ])
+    sessions, report = calendar.align(timestamps)
+
+    expected = pd.to_datetime(['2024-07-01', '2024-07-02', '2024-07-02', '2024-07-05',
+                               '2024-07-08', None, None, None])
+    pd.testing.assert_series_equal(sessions, pd.Series(expected))
+    assert report == {
+        'articles': 8,
+        'same_day': 2,
+        'moved_after_close': 2,
+        'moved_non_trading_day': 1,
+        'dropped_invalid_timestamp': 2,
+        'dropped_outside_calendar': 1,
+    }
+
+
+def test_align_news_to_sessions_drops_unaligned(calendar):
+    news = pd.DataFrame({'date': ['2024-07-01 10:00:00-04:00', 'garbage'], 'stock': ['A', 'B']})
+    aligned, report = align_news_to_sessions(news, calendar)
+    assert aligned['stock'].tolist() == ['A']
+    assert report['dropped_invalid_timestamp'] == 1
+
+
+def test_aggregate_daily_sentiment_reports_alignment(calendar, caplog):
+    news = pd.DataFrame({
+        'stock': ['A', 'A', 'A', 'A'],
+        'date': ['2024-07-01 10:00:00-04:00', '2024-07-01 17:00:00-04:00',
+                 '2024-07-02 09:00:00-04:00', 'garbage'],
+        'sentiment_polarity': [0.1, 0.3, 0.5, 1.0],
+        'sentiment_subjectivity': [0.5, 0.5, 0.5, 0.5],
+    })
+    with caplog.at_level(logging.WARNING, logger='src.sentiment_analysis'):
+        daily, report = aggregate_daily_sentiment(news, calendar=calendar, return_report=True)
+
+    assert daily['date'].tolist() == list(pd.to_datetime(['2024-07-01', '2024-07-02']))
+    assert daily['article_count'].tolist() == [1, 2]
+    assert daily['avg_sentiment'].tolist() == pytest.approx([0.1, 0.4])
+    assert report['moved_after_close'] == 1
+    assert 'Dropped 1 of 4 articles' in caplog.text
+
+    assert aggregate_daily_sentiment(news.iloc[:3], return_report=True)[1] is None
+
+
+def test_panel_effective_dates_use_the_calendar_rules():
+    timestamps = pd.Series(['2024-07-05 15:59:00-04:00', '2024-07-05 16:00:00-04:00',
+                            '2024-07-06 03:00:00', 'garbage'])  # 23:00 New York
+    expected = pd.Series(pd.to_datetime(['2024-07-05', '2024-07-06', '2024-07-06', None]))
+    pd.testing.assert_series_equal(effective_dates(timestamps), expected)
+    pd.testing.assert_series_equal(TradingCalendar().effective_dates(timestamps), expected)
+
+    utc = effective_dates(timestamps, cutoff=None, tz=None)
+    assert utc.tolist()[:3] == list(pd.to_datetime(['2024-07-05', '2024-07-05', '2024-07-06']))